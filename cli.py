@@ -0,0 +1,570 @@
+import sys
+import json
+import time
+import logging
+import argparse
+
+from engine.settings import SETTINGS_FILE, read_settings, write_settings, read_profiles, store_profiles
+from engine.config import SCRIPT_KEYBINDS, load_config
+from engine.accounting import format_rates
+from engine.arbiter import format_conflicts
+from engine.control import default_socket_path
+from engine.watchdog import check_window, format_watchdog
+from engine.limiter import format_limited
+from engine.backends import BACKENDS
+from engine.log import setup_logging, stop_logging
+from engine.timelines import TIMELINES, merge_timings
+from engine.simulator import merge_model
+from engine.tuning import tune_all, timing_overrides
+from engine.trace import SCRIPTS, replay_trace
+
+
+def cmd_tune(args):
+    args.scripts = args.scripts or list(TIMELINES)
+    for script_id in args.scripts:
+        if script_id not in TIMELINES:
+            print(f"Error: unknown script '{script_id}' (choose from {', '.join(TIMELINES)})")
+            return 2
+    
+    settings = read_settings(args.settings)
+    profiles, active = read_profiles(settings)
+    timings = merge_timings(profiles[active]['timings'])
+    
+    model_overrides = {}
+    if args.model:
+        with open(args.model, 'r', encoding='utf-8') as f:
+            model_overrides = json.load(f)
+    if args.tick_rate:
+        model_overrides['tick_rate'] = args.tick_rate
+    model = merge_model(model_overrides)
+    
+    print(f"Tuning {', '.join(args.scripts)} for {args.target:.1%} success "
+          f"at {model['tick_rate']:g} Hz ({args.trials} trials per point)")
+    
+    tuned, rates = tune_all(args.scripts, timings, model, target=args.target, step=args.step,
+                            trials=args.trials, max_delay=args.max_delay, margin=args.margin, seed=args.seed)
+    
+    for script_id in args.scripts:
+        print(f"\n{script_id}  (success {rates[script_id]:.1%})")
+        for name, value in tuned[script_id].items():
+            before = timings[script_id][name]
+            print(f"  {name:20} {before * 1000:8.1f} ms -> {value * 1000:8.1f} ms")
+    
+    if args.dry_run:
+        print("\nDry run, settings not written")
+        return 0
+    
+    profiles[active]['timings'] = timing_overrides(tuned, args.scripts, profiles[active]['timings'])
+    write_settings(store_profiles(settings, profiles, active), args.settings)
+    print(f"\nTimings written to profile '{active}' in {args.settings}")
+    return 0
+
+
+def start_engine(args, backend=None, clock=None):
+    """Create a ScriptBot and start the scripts enabled in the active profile"""
+    from PySide6.QtCore import Qt
+    from engine.bot import ScriptBot
+    
+    try:
+        config = load_config(read_settings(args.settings))
+    except ValueError as e:
+        raise SystemExit(f"Error: invalid settings file: {e}")
+    
+    names = [profile.name for profile in config.profiles]
+    active = getattr(args, 'use', None) or config.active
+    if active not in names:
+        raise SystemExit(f"Error: unknown profile '{active}' (choose from {', '.join(names)})")
+    
+    if backend is None:
+        from engine.backends import make_backend
+        backend = make_backend(getattr(args, 'backend', None) or config.backend)
+    
+    bot = ScriptBot(backend, clock)
+    budget = getattr(args, 'cpu_budget', None)
+    bot.accounting.cpu_budget = config.cpu_budget if budget is None else budget
+    bot.arbiter.set_priorities(dict(config.priorities))
+    bot.set_output_limits(config.output_limits)
+    focus = getattr(args, 'focus', None)
+    bot.set_focus_window(config.focus_window if focus is None else focus)
+    window = getattr(args, 'watchdog', None)
+    bot.start_watchdog(config.watchdog_window if window is None else window)
+    # Without a Qt event loop, signals from the hook and focus threads must be handled where they are emitted
+    bot.focus_changed.connect(lambda focused: print("Target window focused" if focused else "Target window lost focus"),
+                              Qt.DirectConnection)
+    bot.profile_changed.connect(lambda name: print(f"Switched to profile '{name}' "
+                                                   f"in {bot.last_switch_ns / 1000:.1f} us"), Qt.DirectConnection)
+    bot.load_profiles(config.profiles)
+    bot.switch_to(active)
+    print(f"{len(bot.profile.scripts)} script(s) active")
+    return bot
+
+
+def wait_for_interrupt(bot=None, stats_interval=None):
+    try:
+        while True:
+            # Sleep as long as possible, so an idle engine doesn't wake up for nothing
+            time.sleep(stats_interval or 3600)
+            if stats_interval:
+                print_stats(bot)
+    except KeyboardInterrupt:
+        print("\nExiting...")
+
+
+def print_stats(bot):
+    """Print each script's CPU use, wakeups and threads since the last call"""
+    accounting = bot.accounting
+    rates = accounting.sample()
+    print(format_rates(rates, accounting.cpu_budget))
+    for script_id in accounting.over_budget(rates):
+        print(f"Warning: {script_id} used {rates[script_id][0]:.2f}% CPU, "
+              f"over the {accounting.cpu_budget:g}% budget")
+    conflicts = bot.arbiter.conflicts()
+    if conflicts:
+        print("Key conflicts since start:")
+        print(format_conflicts(conflicts))
+    limited = bot.limiter.counts() if bot.limiter else None
+    if limited:
+        print("Presses held back by output limits since start:")
+        print(format_limited(limited))
+    stalls = bot.watchdog.snapshot() if bot.watchdog else None
+    if stalls:
+        print("Stalled components restarted since start:")
+        print(format_watchdog(stalls))
+
+
+def dump_profile(bot, path):
+    profiler = bot.stop_profiling()
+    count = profiler.dump(path, SCRIPTS)
+    print(f"{count} profile spans written to {path}")
+    for name, (spans, mean_us, max_us) in profiler.summary().items():
+        print(f"  {name:10} {spans:8} spans  mean {mean_us:8.1f} us  max {max_us:8.1f} us")
+
+
+def start_control(args, bot):
+    """Serve control commands for a running bot on a Unix domain socket"""
+    from engine.control import Controller, ControlServer
+    
+    profiles, _ = read_profiles(read_settings(args.settings))
+    controller = Controller(bot, profiles, bot.profile.name)
+    server = ControlServer(args.control, controller.execute)
+    try:
+        print(f"Control socket: {server.start()}")
+    except (OSError, RuntimeError) as e:
+        raise SystemExit(f"Error: can't listen on {args.control}: {e}")
+    return controller, server
+
+
+def watch_settings(args, bot, controller=None):
+    """Apply external edits of the settings file to a running bot"""
+    from contextlib import nullcontext
+    from engine.watcher import SettingsWatcher
+    
+    _, file_active = read_profiles(read_settings(args.settings))
+    
+    def reload(settings):
+        nonlocal file_active
+        config = load_config(settings)
+        active = config.active
+        # Follow the file's active profile only when it changed, so --use sticks otherwise
+        if active == file_active and any(profile.name == bot.profile.name for profile in config.profiles):
+            target = bot.profile.name
+        else:
+            target = active
+        file_active = active
+        
+        if args.focus is None:
+            bot.set_focus_window(config.focus_window)
+        bot.arbiter.set_priorities(dict(config.priorities))
+        bot.set_output_limits(config.output_limits)
+        if args.watchdog is None and (bot.watchdog.window if bot.watchdog else 0.0) != config.watchdog_window:
+            bot.start_watchdog(config.watchdog_window)
+        with controller.lock if controller else nullcontext():
+            changes, elapsed = bot.apply_profiles(config.profiles, target)
+            if controller:
+                controller.profiles, controller.active = read_profiles(settings)[0], target
+        changed = ", ".join(f"{script_id} {change}" for script_id, change in sorted(changes.items()))
+        print(f"Settings reloaded in {elapsed * 1000:.1f} ms: {changed or 'no script changes'}")
+    
+    watcher = SettingsWatcher(args.settings, reload)
+    print(f"Watching {args.settings} ({watcher.start()})")
+    return watcher
+
+
+def cmd_run(args):
+    bot = start_engine(args)
+    if args.profile:
+        bot.start_profiling(args.profile_capacity)
+    controller, server = start_control(args, bot) if args.control else (None, None)
+    watcher = None if args.no_watch else watch_settings(args, bot, controller)
+    print("Running, press Ctrl+C to stop")
+    
+    wait_for_interrupt(bot, args.stats)
+    if watcher:
+        watcher.stop()
+    if server:
+        server.stop()
+    bot.set_focus_window(None)
+    bot.stop_watchdog()
+    bot.stop_all_scripts()
+    if args.profile:
+        dump_profile(bot, args.profile)
+    return 0
+
+
+def cmd_record(args):
+    bot = start_engine(args)
+    bot.start_recording(args.trace)
+    print(f"Recording to {args.trace}, press Ctrl+C to stop")
+    
+    wait_for_interrupt()
+    bot.stop_all_scripts()
+    recorder = bot.stop_recording()
+    print(f"{recorder.records_written} events recorded")
+    return 0
+
+
+def cmd_replay(args):
+    backend = clock = None
+    if args.dry_run or args.virtual:
+        from engine.backends import NullBackend
+        backend = NullBackend()
+    if args.virtual:
+        from engine.clock import VirtualClock
+        clock = VirtualClock()
+    
+    bot = start_engine(args, backend, clock)
+    if args.record:
+        bot.start_recording(args.record)
+    if args.profile:
+        bot.start_profiling(args.profile_capacity)
+    
+    count = replay_trace(args.trace, bot, realtime=not args.fast, speed=args.speed)
+    bot.clock.sleep(args.settle)
+    bot.stop_all_scripts()
+    
+    print(f"Replayed {count} input events from {args.trace}")
+    print_stats(bot)
+    if args.record:
+        print(f"{bot.stop_recording().records_written} events recorded to {args.record}")
+    if args.profile:
+        dump_profile(bot, args.profile)
+    if backend is not None:
+        for op, key in backend.events:
+            print(f"  {op:8} {key}")
+    return 0
+
+
+def cmd_profiles(args):
+    settings = read_settings(args.settings)
+    profiles, active = read_profiles(settings)
+    
+    if args.name:
+        if args.name not in profiles:
+            print(f"Error: unknown profile '{args.name}' (choose from {', '.join(profiles)})")
+            return 2
+        write_settings(store_profiles(settings, profiles, args.name), args.settings)
+        print(f"Active profile set to '{args.name}'")
+        active = args.name
+    
+    for name, profile in profiles.items():
+        scripts = [script_id for script_id, enabled in profile['script_states'].items() if enabled]
+        hotkey = f"  (hotkey {profile['hotkey']})" if profile['hotkey'] else ""
+        print(f"{'*' if name == active else ' '} {name}: {', '.join(scripts) or 'no scripts'}{hotkey}")
+    
+    if args.bench:
+        from engine.bot import ScriptBot
+        from engine.backends import NullBackend
+        
+        bot = ScriptBot(NullBackend())
+        start = time.perf_counter()
+        bot.load_profiles(profiles)
+        print(f"\nCompiled {len(profiles)} profile(s) in {(time.perf_counter() - start) * 1000:.2f} ms")
+        
+        switches = []
+        names = list(profiles)
+        for i in range(args.bench):
+            bot.switch_profile(bot.profiles[names[i % len(names)]])
+            switches.append(bot.last_switch_ns)
+        switches.sort()
+        print(f"{args.bench} switches: median {switches[len(switches) // 2] / 1000:.1f} us, "
+              f"max {switches[-1] / 1000:.1f} us")
+    return 0
+
+
+def cmd_analyze(args):
+    try:
+        from engine import analyze
+    except ImportError:
+        print("Error: trace analysis needs NumPy. Make sure to install it: pip install numpy")
+        return 1
+    
+    header, records = analyze.open_trace(args.trace)
+    info = analyze.overview(records)
+    print(f"{args.trace}: {info['records']} records over {info['duration_s']} s, "
+          f"{info['raw_events']} raw input events, {info['injected_per_s']} injected events/s\n")
+    
+    rows = analyze.summarize(records, args.tick_rate)
+    if rows:
+        print(analyze.format_table(rows))
+    else:
+        print("No script activity recorded")
+    
+    if args.csv:
+        analyze.write_csv(rows, args.csv)
+        print(f"\nSummary written to {args.csv}")
+    
+    if args.chrome:
+        count = analyze.write_chrome_trace(records, header, args.chrome, args.start, args.end)
+        print(f"{count} trace events written to {args.chrome}")
+    return 0
+
+
+def cmd_e2e(args):
+    from engine import e2e
+    
+    profiles, active = read_profiles(read_settings(args.settings))
+    active = args.use or active
+    if active not in profiles:
+        print(f"Error: unknown profile '{active}' (choose from {', '.join(profiles)})")
+        return 2
+    for script_id in args.scripts:
+        if script_id not in SCRIPT_KEYBINDS:
+            print(f"Error: unknown script '{script_id}' (choose from {', '.join(SCRIPT_KEYBINDS)})")
+            return 2
+    
+    try:
+        results = e2e.run_e2e(profiles[active], args.scripts, args.iterations, args.backend, args.display,
+                              args.xvfb, args.timeout)
+    except Exception as e:
+        print(f"Error: end-to-end run failed: {e}")
+        return 1
+    
+    print("\nTrigger to first injected event through the X server, in ms (Delay is the macro's own wait)")
+    print(e2e.format_latencies(results))
+    lost = sum(timeouts for _, timeouts, _ in results.values())
+    return 1 if lost or not results else 0
+
+
+def cmd_soak(args):
+    from engine.soak import run_soak
+    
+    failures = run_soak(args.cycles, args.events, args.thread_slack, int(args.max_rss_growth * 1024 * 1024))
+    if failures:
+        print(f"\n{len(failures)} check(s) failed:")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        return 1
+    print("\nThreads, listeners and RSS stayed bounded")
+    return 0
+
+
+def cmd_stress(args):
+    from engine import stress
+    
+    names = args.scenarios or list(stress.SCENARIOS)
+    for name in names:
+        if name not in stress.SCENARIOS:
+            print(f"Error: unknown scenario '{name}' (choose from {', '.join(stress.SCENARIOS)})")
+            return 2
+    
+    results = []
+    for rate in args.rate or [10000, 100000]:
+        for name in names:
+            print(f"Running {name} at {rate} events/s for {args.duration:g} s")
+            results.append((rate, stress.run_scenario(name, rate, args.duration, args.probe_interval / 1000)))
+    
+    print()
+    print(stress.format_results(results))
+    return 1 if any(result['lost'] for _, result in results) else 0
+
+
+def cmd_control(args):
+    from engine.control import ControlClient, round_trips
+    from engine.e2e import percentile
+    
+    if not args.command and not args.bench:
+        print("Error: give a command (ping, enable, disable, bind, profile or stats) or --bench")
+        return 2
+    try:
+        client = ControlClient(args.socket)
+    except OSError as e:
+        print(f"Error: can't connect to {args.socket}: {e} (is the engine running with --control?)")
+        return 1
+    
+    with client:
+        if args.bench:
+            for line in ('ping', 'stats'):
+                times = round_trips(client, line, args.bench)
+                print(f"{line:6} {args.bench} round trips: p50 {percentile(times, 50) / 1000:.1f} us, "
+                      f"p99 {percentile(times, 99) / 1000:.1f} us, max {times[-1] / 1000:.1f} us")
+            return 0
+        ok, reply = client.send(' '.join(args.command))
+    print(reply or ('ok' if ok else 'error'))
+    return 0 if ok else 1
+
+
+def cmd_bench(args):
+    from engine.bench import BENCHMARKS
+    
+    names = args.benchmarks or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Error: unknown benchmark '{name}' (choose from {', '.join(BENCHMARKS)})")
+            return 2
+    
+    for name in names:
+        print(name if args.iterations is None else f"{name} ({args.iterations} iterations)")
+        try:
+            rows = BENCHMARKS[name](args.iterations) if args.iterations else BENCHMARKS[name]()
+        except Exception as e:
+            print(f"  {name} benchmark error: {e}")
+            continue
+        for label, value, unit in rows:
+            # A row without a value is a note about how the benchmark ran
+            print(f"  {label:40} {unit}" if value is None else f"  {label:40} {value:10.1f} {unit}")
+    return 0
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', help="record hot path spans and write them on exit "
+                                          "(.json for Chrome trace, .pftrace for Perfetto)")
+    parser.add_argument('--profile-capacity', type=int, default=65536, help="spans kept in the profiling ring")
+
+
+def watchdog_window(text):
+    window = float(text)
+    try:
+        check_window(window)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return window
+
+
+def add_engine_arguments(parser):
+    parser.add_argument('--use', metavar='PROFILE', help="profile to start with (default: the active profile)")
+    parser.add_argument('--focus', metavar='WINDOW',
+                        help="only fire while a window whose class or title contains this is focused "
+                             "(X11, default: from settings, '' for any window)")
+    parser.add_argument('--cpu-budget', type=float, metavar='PERCENT',
+                        help="warn when a script uses more of one core than this (default: from settings)")
+    parser.add_argument('--backend', choices=BACKENDS,
+                        help="how to inject input: pynput, or xtest to inject through XTest directly on X11 "
+                             "(default: from settings)")
+    parser.add_argument('--watchdog', type=watchdog_window, metavar='SECONDS',
+                        help="restart a hook or script stuck for longer than this, 0 to turn off (default: from settings)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Professional Keybind Manager command line tools")
+    parser.add_argument('--settings', default=str(SETTINGS_FILE), help="settings file to use")
+    parser.add_argument('--debug', action='store_true', help="log every hooked and injected event")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    tune = commands.add_parser('tune', help="find the shortest reliable delays for each macro")
+    tune.add_argument('scripts', nargs='*', help="scripts to tune (default: all)")
+    tune.add_argument('--target', type=float, default=0.99, help="required success rate (default 0.99)")
+    tune.add_argument('--trials', type=int, default=400, help="simulated runs per sweep point")
+    tune.add_argument('--step', type=float, default=0.001, help="sweep resolution in seconds")
+    tune.add_argument('--max-delay', type=float, default=0.5, help="longest delay to consider in seconds")
+    tune.add_argument('--margin', type=float, default=0.0, help="safety margin added to tuned delays (0.1 = 10%%)")
+    tune.add_argument('--tick-rate', type=float, help="game input sampling rate in Hz")
+    tune.add_argument('--model', help="JSON file overriding the game response model")
+    tune.add_argument('--seed', type=int, default=0)
+    tune.add_argument('--dry-run', action='store_true', help="print the result without saving it")
+    tune.set_defaults(func=cmd_tune)
+    
+    run = commands.add_parser('run', help="run the enabled scripts without the GUI")
+    add_engine_arguments(run)
+    run.add_argument('--no-watch', action='store_true', help="don't reload the settings file when it changes")
+    run.add_argument('--stats', type=float, metavar='SECONDS', help="print per-script CPU, wakeups and threads this often")
+    run.add_argument('--control', nargs='?', const=default_socket_path(), metavar='SOCKET',
+                     help=f"accept commands on a Unix domain socket (default path: {default_socket_path()})")
+    add_profile_arguments(run)
+    run.set_defaults(func=cmd_run)
+    
+    record = commands.add_parser('record', help="run the enabled scripts and record every input event")
+    record.add_argument('trace', help="trace file to append to")
+    add_engine_arguments(record)
+    record.set_defaults(func=cmd_record)
+    
+    replay = commands.add_parser('replay', help="feed a recorded trace back through the engine")
+    replay.add_argument('trace', help="trace file to replay")
+    replay.add_argument('--fast', action='store_true', help="dispatch events back to back instead of in real time")
+    replay.add_argument('--speed', type=float, default=1.0, help="real time playback speed factor")
+    replay.add_argument('--settle', type=float, default=0.5, help="seconds to let macros finish after the last event")
+    replay.add_argument('--dry-run', action='store_true', help="print injected events instead of sending them")
+    replay.add_argument('--virtual', action='store_true',
+                        help="replay on a virtual clock as fast as possible (implies --dry-run)")
+    replay.add_argument('--record', help="record the replayed session to another trace file")
+    add_engine_arguments(replay)
+    add_profile_arguments(replay)
+    # Replayed input isn't typed into any window, so it is never focus gated
+    replay.set_defaults(func=cmd_replay, focus='')
+    
+    profiles = commands.add_parser('profiles', help="list profiles or choose the active one")
+    profiles.add_argument('name', nargs='?', help="profile to make active")
+    profiles.add_argument('--bench', type=int, metavar='N', help="compile every profile and time N switches")
+    profiles.set_defaults(func=cmd_profiles)
+    
+    analyze = commands.add_parser('analyze', help="summarize latencies and gaps in a recorded trace")
+    analyze.add_argument('trace', help="trace file to analyze")
+    analyze.add_argument('--tick-rate', type=float, default=60.0, help="game tick rate for registered-action estimates")
+    analyze.add_argument('--csv', help="write the per-script summary table to a CSV file")
+    analyze.add_argument('--chrome', help="write a Chrome trace JSON of the selected time window")
+    analyze.add_argument('--start', type=float, default=0.0, help="window start in seconds from the trace start")
+    analyze.add_argument('--end', type=float, help="window end in seconds from the trace start")
+    analyze.set_defaults(func=cmd_analyze)
+    
+    e2e = commands.add_parser('e2e', help="measure trigger to output latency of each macro under Xvfb")
+    e2e.add_argument('scripts', nargs='*', help="scripts to measure (default: all)")
+    e2e.add_argument('--iterations', type=int, default=100, help="triggers per script (default 100)")
+    e2e.add_argument('--use', metavar='PROFILE', help="profile whose keybinds and timings to use (default: the active one)")
+    e2e.add_argument('--backend', choices=BACKENDS, default='pynput', help="injection backend under test")
+    e2e.add_argument('--display', help="measure on this running X display instead of a private Xvfb")
+    e2e.add_argument('--xvfb', default='Xvfb', help="Xvfb executable to start")
+    e2e.add_argument('--timeout', type=float, default=1.0, help="seconds to wait for each event before counting it lost")
+    e2e.set_defaults(func=cmd_e2e)
+    
+    soak = commands.add_parser('soak', help="check that repeated applies and long sessions don't leak")
+    soak.add_argument('--cycles', type=int, default=10000, help="apply/stop cycles (default 10000)")
+    soak.add_argument('--events', type=int, default=2000000, help="synthetic trigger events (default 2000000)")
+    soak.add_argument('--thread-slack', type=int, default=32, help="threads allowed over the baseline (default 32)")
+    soak.add_argument('--max-rss-growth', type=float, default=32.0, metavar='MB',
+                      help="RSS growth allowed over the baseline (default 32 MB)")
+    soak.set_defaults(func=cmd_soak)
+    
+    stress = commands.add_parser('stress', help="push synthetic input through the hook callbacks at high rates")
+    stress.add_argument('scenarios', nargs='*', help="typing, repeat and/or mouse (default: all)")
+    stress.add_argument('--rate', type=int, action='append',
+                        help="events per second, may be given more than once (default: 10000 and 100000)")
+    stress.add_argument('--duration', type=float, default=2.0, help="seconds per scenario and rate (default 2)")
+    stress.add_argument('--probe-interval', type=float, default=20.0, metavar='MS',
+                        help="time between macro triggers measured for latency (default 20 ms)")
+    stress.set_defaults(func=cmd_stress)
+    
+    control = commands.add_parser('control', help="send a command to an engine started with run --control")
+    control.add_argument('command', nargs='*',
+                         help="ping, enable SCRIPT, disable SCRIPT, bind KEYBIND KEY, profile NAME or stats")
+    control.add_argument('--socket', default=default_socket_path(), help="control socket of the engine")
+    control.add_argument('--bench', type=int, metavar='N', help="time N ping and N stats round trips")
+    control.set_defaults(func=cmd_control)
+    
+    bench = commands.add_parser('bench', help="measure hot path overheads")
+    bench.add_argument('benchmarks', nargs='*', help="benchmarks to run (default: all)")
+    bench.add_argument('--iterations', type=int, help="iterations per measurement (default: per benchmark)")
+    bench.set_defaults(func=cmd_bench)
+    
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(logging.DEBUG if args.debug else logging.INFO)
+    try:
+        return args.func(args)
+    finally:
+        stop_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
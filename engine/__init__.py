@@ -0,0 +1 @@
+"""Macro engine shared by the GUI and the command line tools"""
\ No newline at end of file
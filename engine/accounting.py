@@ -0,0 +1,102 @@
+import time
+import threading
+
+from engine.trace import SCRIPTS
+
+
+# Share of one core a script may use before it is reported, in percent
+DEFAULT_CPU_BUDGET = 5.0
+
+
+class ThreadCounter:
+    """Counters owned by one worker thread, so it can update them without a lock"""
+    
+    __slots__ = ('number', 'started', 'cpu', 'wakeups', 'busy', 'stalled')
+    
+    def __init__(self, number):
+        self.number = number
+        self.started = time.thread_time()
+        self.cpu = 0.0
+        self.wakeups = 0
+        # perf_counter() when the worker entered a call that should return promptly, else 0
+        self.busy = 0.0
+        self.stalled = False
+
+
+class Accounting:
+    """CPU time, wakeups and live threads per script.
+    
+    Every worker runs through run(), which gives it a ThreadCounter; the
+    worker adds its own wakeups and CPU time (from time.thread_time) and the
+    counter is folded into the script's totals when the thread ends.
+    """
+    
+    def __init__(self, cpu_budget=DEFAULT_CPU_BUDGET):
+        self.cpu_budget = cpu_budget
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._live = set()
+        self._cpu = [0.0] * len(SCRIPTS)
+        self._wakeups = [0] * len(SCRIPTS)
+        self._last_time = time.perf_counter()
+        self._last_totals = self.totals()
+    
+    def run(self, number, target):
+        counter = ThreadCounter(number)
+        self._local.counter = counter
+        with self._lock:
+            self._live.add(counter)
+        try:
+            target()
+        finally:
+            counter.cpu = time.thread_time() - counter.started
+            with self._lock:
+                self._live.discard(counter)
+                self._cpu[number] += counter.cpu
+                self._wakeups[number] += counter.wakeups
+    
+    def live(self):
+        """Counters of the workers running now"""
+        with self._lock:
+            return list(self._live)
+    
+    def current(self):
+        """The calling worker's counter, or None outside of run()"""
+        return getattr(self._local, 'counter', None)
+    
+    def totals(self):
+        """{script: (cpu seconds, wakeups, live threads)} since accounting started"""
+        with self._lock:
+            cpu = list(self._cpu)
+            wakeups = list(self._wakeups)
+            threads = [0] * len(SCRIPTS)
+            for counter in self._live:
+                cpu[counter.number] += counter.cpu
+                wakeups[counter.number] += counter.wakeups
+                threads[counter.number] += 1
+        return {script_id: (cpu[n], wakeups[n], threads[n]) for n, script_id in enumerate(SCRIPTS) if script_id}
+    
+    def sample(self):
+        """{script: (cpu percent, wakeups per second, live threads)} since the previous sample"""
+        now = time.perf_counter()
+        totals = self.totals()
+        elapsed = max(now - self._last_time, 1e-9)
+        rates = {}
+        for script_id, (cpu, wakeups, threads) in totals.items():
+            last_cpu, last_wakeups, _ = self._last_totals[script_id]
+            rates[script_id] = ((cpu - last_cpu) / elapsed * 100, (wakeups - last_wakeups) / elapsed, threads)
+        self._last_time = now
+        self._last_totals = totals
+        return rates
+    
+    def over_budget(self, rates):
+        """Scripts in a sample that used more CPU than the budget allows"""
+        return [script_id for script_id, (cpu, _, _) in rates.items() if cpu > self.cpu_budget]
+
+
+def format_rates(rates, budget=None):
+    lines = [f"{'Script':14} {'CPU %':>8} {'Wakeups/s':>10} {'Threads':>8}"]
+    for script_id, (cpu, wakeups, threads) in rates.items():
+        flag = "  over budget" if budget is not None and cpu > budget else ""
+        lines.append(f"{script_id:14} {cpu:8.2f} {wakeups:10.1f} {threads:8}{flag}")
+    return "\n".join(lines)
\ No newline at end of file
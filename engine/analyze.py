@@ -0,0 +1,176 @@
+import os
+import csv
+import json
+
+import numpy as np
+
+from engine import trace
+
+
+RECORD_DTYPE = np.dtype([
+    ('t_ns', '<i8'),
+    ('kind', 'u1'),
+    ('script', 'u1'),
+    ('flags', '<u2'),
+    ('key', 'S20')
+])
+
+SUMMARY_FIELDS = (
+    'script', 'triggers', 'dropped', 'injected', 'latency_p50_ms', 'latency_p99_ms', 'latency_max_ms',
+    'gap_p50_ms', 'gap_p99_ms', 'gap_min_ms', 'registered_est', 'registered_pct'
+)
+
+
+def open_trace(path):
+    """Memory-map a trace file as a structured array without reading it.
+    
+    A partial record at the end, left by a crash during a flush, is not mapped.
+    """
+    header = trace.read_header(path)
+    count = (os.path.getsize(path) - trace.HEADER.size) // RECORD_DTYPE.itemsize
+    if not count:
+        return header, np.empty(0, dtype=RECORD_DTYPE)
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=trace.HEADER.size, shape=(count,))
+    return header, records
+
+
+def _ms(values, q):
+    return round(float(np.percentile(values, q)) / 1e6, 3) if len(values) else None
+
+
+def _pair_holds(downs, ups):
+    """Hold durations of alternating press/release timestamps for one key"""
+    if not len(downs) or not len(ups):
+        return np.empty(0, dtype=np.int64)
+    
+    # Match every press with the first release that follows it
+    idx = np.searchsorted(ups, downs, side='left')
+    valid = idx < len(ups)
+    return ups[idx[valid]] - downs[valid]
+
+
+def script_summary(records, script_number, tick_rate=60.0):
+    kind = records['kind']
+    in_script = records['script'] == script_number
+    t_ns = records['t_ns']
+    
+    triggers = np.sort(t_ns[in_script & (kind == trace.TRIGGER)])
+    inject_mask = in_script & (kind == trace.INJECT_DOWN)
+    injects = np.sort(t_ns[inject_mask])
+    
+    # Latency from each trigger to the first injection after it; a trigger with
+    # no injection before the next trigger was dropped
+    latencies = np.empty(0, dtype=np.int64)
+    dropped = 0
+    if len(triggers):
+        idx = np.searchsorted(injects, triggers, side='left')
+        next_trigger = np.append(triggers[1:], np.iinfo(np.int64).max)
+        served = idx < len(injects)
+        first_inject = np.zeros_like(triggers)
+        first_inject[served] = injects[idx[served]]
+        served &= first_inject < next_trigger
+        latencies = (first_inject - triggers)[served]
+        dropped = int(len(triggers) - served.sum())
+    
+    gaps = np.diff(injects)
+    
+    # A press registers when a game tick lands inside the hold, so a hold of
+    # h seconds registers with probability min(1, h * tick_rate)
+    keys = records['key']
+    up_mask = in_script & (kind == trace.INJECT_UP)
+    registered = 0.0
+    for key in np.unique(keys[inject_mask]):
+        downs = np.sort(t_ns[inject_mask & (keys == key)])
+        ups = np.sort(t_ns[up_mask & (keys == key)])
+        holds = _pair_holds(downs, ups)
+        registered += float(np.minimum(holds / 1e9 * tick_rate, 1.0).sum())
+    
+    return {
+        'script': trace.SCRIPTS[script_number],
+        'triggers': int(len(triggers)),
+        'dropped': dropped,
+        'injected': int(len(injects)),
+        'latency_p50_ms': _ms(latencies, 50),
+        'latency_p99_ms': _ms(latencies, 99),
+        'latency_max_ms': _ms(latencies, 100),
+        'gap_p50_ms': _ms(gaps, 50),
+        'gap_p99_ms': _ms(gaps, 99),
+        'gap_min_ms': _ms(gaps, 0),
+        'registered_est': round(registered, 1),
+        'registered_pct': round(100.0 * registered / len(injects), 1) if len(injects) else None
+    }
+
+
+def summarize(records, tick_rate=60.0):
+    """Per-script summaries for every script that appears in the trace"""
+    present = np.unique(records['script'])
+    return [script_summary(records, int(number), tick_rate) for number in present if number]
+
+
+def overview(records):
+    kind = records['kind']
+    raw = np.isin(kind, (trace.KEY_DOWN, trace.KEY_UP, trace.BUTTON_DOWN, trace.BUTTON_UP))
+    injected = np.isin(kind, (trace.INJECT_DOWN, trace.INJECT_UP))
+    duration = (int(records['t_ns'].max()) - int(records['t_ns'].min())) / 1e9 if len(records) else 0.0
+    
+    return {
+        'records': int(len(records)),
+        'duration_s': round(duration, 3),
+        'raw_events': int(raw.sum()),
+        'injected_events': int(injected.sum()),
+        'injected_per_s': round(int(injected.sum()) / duration, 1) if duration else 0.0
+    }
+
+
+def format_table(rows, fields=SUMMARY_FIELDS):
+    widths = {f: max(len(f), *(len('-' if r[f] is None else str(r[f])) for r in rows)) for f in fields}
+    lines = ['  '.join(f.ljust(widths[f]) for f in fields).rstrip()]
+    for row in rows:
+        lines.append('  '.join(('-' if row[f] is None else str(row[f])).ljust(widths[f]) for f in fields).rstrip())
+    return '\n'.join(lines)
+
+
+def write_csv(rows, path, fields=SUMMARY_FIELDS):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def chrome_trace(records, header, start_s=0.0, end_s=None):
+    """Chrome trace-event JSON for the records between start_s and end_s (seconds from trace start)"""
+    t_ns = records['t_ns']
+    origin = header['origin_ns']
+    mask = t_ns >= origin + int(start_s * 1e9)
+    if end_s is not None:
+        mask &= t_ns < origin + int(end_s * 1e9)
+    window = np.asarray(records[mask])
+    window = window[np.argsort(window['t_ns'], kind='stable')]
+    
+    events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': 'ScriptBot'}}]
+    for number, name in enumerate(trace.SCRIPTS):
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': number,
+                       'args': {'name': name or 'input'}})
+    
+    pressed = {}
+    for t, kind, script, _, key in window.tolist():
+        key = key.rstrip(b'\0').decode('utf-8', 'replace')
+        ts = (t - origin) / 1000.0
+        if kind == trace.INJECT_DOWN:
+            pressed[(script, key)] = ts
+        elif kind == trace.INJECT_UP and (script, key) in pressed:
+            begin = pressed.pop((script, key))
+            events.append({'name': key, 'cat': 'inject', 'ph': 'X', 'ts': begin, 'dur': ts - begin,
+                           'pid': 1, 'tid': script})
+        elif kind != trace.INJECT_UP:
+            events.append({'name': f"{trace.KIND_NAMES.get(kind, kind)} {key}", 'cat': 'input', 'ph': 'i',
+                           's': 't', 'ts': ts, 'pid': 1, 'tid': script})
+    
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(records, header, path, start_s=0.0, end_s=None):
+    data = chrome_trace(records, header, start_s, end_s)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return len(data['traceEvents'])
\ No newline at end of file
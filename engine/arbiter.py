@@ -0,0 +1,143 @@
+import threading
+
+from engine.trace import SCRIPTS
+
+
+# Higher wins a contended key. One-shot sequences outrank loops, so a wall
+# take or pullout is never cut up by a spam loop pressing the same key.
+DEFAULT_PRIORITIES = {
+    'spam_macro': 1,
+    'auto_pickup': 1,
+    'auto_pullout': 2,
+    'wall_take': 3,
+    'wall_pullout': 3
+}
+
+# How long a deferred press waits for the key before it is dropped, and how often it looks
+DEFER_TIMEOUT = 0.5
+DEFER_POLL = 0.001
+
+OUTCOMES = ('preempt', 'defer', 'merge', 'dropped')
+
+
+class KeyArbiter:
+    """Decides what reaches the backend when scripts press the same key.
+    
+    Each injected key is owned by the scripts holding it down. A press on a
+    key another script holds is a conflict, resolved by priority: a higher
+    priority script preempts the owner (the key is released and pressed
+    again for the new owner), a lower one defers until the key is free, and
+    equal priorities merge, sharing the press until the last of them
+    releases it. Releases of a key a script no longer owns are dropped, so
+    raw presses of different scripts never interleave.
+    
+    Script number 0 is input no script produced and passes straight through.
+    """
+    
+    def __init__(self, clock, priorities=None, defer_timeout=DEFER_TIMEOUT):
+        self.clock = clock
+        self.defer_timeout = defer_timeout
+        self._lock = threading.Lock()
+        # key -> script numbers holding it down, first owner first
+        self._owners = {}
+        self._priorities = []
+        # [outcome][number of the script that pressed]
+        self._counts = {outcome: [0] * len(SCRIPTS) for outcome in OUTCOMES}
+        self.set_priorities(priorities)
+    
+    def set_priorities(self, priorities=None):
+        priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self._priorities = [priorities.get(script_id, 0) for script_id in SCRIPTS]
+    
+    def clear(self):
+        """Forget every owner, once no worker is left to release what it holds"""
+        with self._lock:
+            self._owners = {}
+    
+    def press(self, key, number):
+        """Events to inject for script number pressing key"""
+        if not number:
+            return (('press', key),)
+        
+        deadline = None
+        while True:
+            with self._lock:
+                owners = self._owners.get(key)
+                if not owners:
+                    self._owners[key] = [number]
+                    return (('press', key),)
+                if number in owners:
+                    return ()
+                
+                mine = self._priorities[number]
+                theirs = max(self._priorities[owner] for owner in owners)
+                if mine > theirs:
+                    self._owners[key] = [number]
+                    self._counts['preempt'][number] += 1
+                    return (('release', key), ('press', key))
+                if mine == theirs:
+                    owners.append(number)
+                    self._counts['merge'][number] += 1
+                    return ()
+                
+                now = self.clock.now()
+                if deadline is None:
+                    deadline = now + self.defer_timeout
+                    self._counts['defer'][number] += 1
+                elif now >= deadline:
+                    self._counts['dropped'][number] += 1
+                    return ()
+            self.clock.sleep(DEFER_POLL)
+    
+    def release(self, key, number):
+        """Events to inject for script number releasing key"""
+        if not number:
+            return (('release', key),)
+        
+        with self._lock:
+            owners = self._owners.get(key)
+            if not owners or number not in owners:
+                return ()
+            owners.remove(number)
+            if owners:
+                return ()
+            del self._owners[key]
+            return (('release', key),)
+    
+    def forget(self, number):
+        """Drop script number from every key it holds, without releasing any, when its worker is abandoned"""
+        with self._lock:
+            for key, owners in list(self._owners.items()):
+                if number in owners:
+                    owners.remove(number)
+                    if not owners:
+                        del self._owners[key]
+    
+    def resolve(self, events, number):
+        """Events to inject for a group of (op, key) events of one script"""
+        if not number:
+            return events
+        resolved = []
+        for op, key in events:
+            resolved.extend(self.press(key, number) if op == 'press' else self.release(key, number))
+        return tuple(resolved)
+    
+    def held(self):
+        """{key: [scripts holding it]}"""
+        with self._lock:
+            return {key: [SCRIPTS[number] for number in owners] for key, owners in self._owners.items()}
+    
+    def conflicts(self):
+        """{script: {outcome: count}} for every script that ran into a held key"""
+        with self._lock:
+            counts = {outcome: list(values) for outcome, values in self._counts.items()}
+        return {script_id: {outcome: counts[outcome][number] for outcome in OUTCOMES}
+                for number, script_id in enumerate(SCRIPTS)
+                if script_id and any(counts[outcome][number] for outcome in OUTCOMES)}
+
+
+def format_conflicts(conflicts):
+    lines = [f"{'Script':14} " + ' '.join(f"{outcome.capitalize():>8}" for outcome in OUTCOMES)]
+    for script_id, counts in conflicts.items():
+        lines.append(f"{script_id:14} " + ' '.join(f"{counts[outcome]:8}" for outcome in OUTCOMES))
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,238 @@
+import re
+import sys
+import threading
+import logging
+
+from engine.timelines import MOUSE_LEFT
+
+
+log = logging.getLogger(__name__)
+
+
+WM_MOUSEMOVE = 0x0200
+
+# pynput key names whose X keysym is spelled differently
+X_KEYSYMS = {
+    'shift': 'Shift_L', 'shift_r': 'Shift_R',
+    'ctrl': 'Control_L', 'ctrl_l': 'Control_L', 'ctrl_r': 'Control_R',
+    'alt': 'Alt_L', 'alt_l': 'Alt_L', 'alt_r': 'Alt_R', 'alt_gr': 'ISO_Level3_Shift',
+    'cmd': 'Super_L', 'cmd_l': 'Super_L', 'cmd_r': 'Super_R',
+    'enter': 'Return', 'esc': 'Escape', 'backspace': 'BackSpace', 'caps_lock': 'Caps_Lock',
+    'page_up': 'Prior', 'page_down': 'Next', 'num_lock': 'Num_Lock', 'scroll_lock': 'Scroll_Lock',
+    'print_screen': 'Print', 'menu': 'Menu'
+}
+
+# X pointer button numbers of the mouse buttons keybinds can name
+X_BUTTONS = {MOUSE_LEFT: 1, 'mouse_middle': 2, 'mouse_right': 3, 'mouse_x1': 8, 'mouse_x2': 9}
+
+BACKENDS = ('pynput', 'xtest')
+
+
+def key_name(key):
+    """Name of a pynput key as used in keybinds: the character, or the Key name"""
+    return getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
+
+
+def button_name(button):
+    return str(button).lower().replace('button.', '')
+
+
+def button_listener_class(mouse):
+    """pynput's mouse Listener narrowed to button events where the platform allows it.
+    
+    XRecord takes a range of event types and pynput asks for one that includes
+    pointer motion, and macOS taps take an event mask, so both are narrowed
+    before any event reaches Python. Windows' low-level hook sees every event,
+    so motion is dropped by the event filter before pynput dispatches it.
+    """
+    listener = mouse.Listener
+    module = sys.modules.get(listener.__module__)
+    if listener.__module__.endswith('._xorg'):
+        X = module.Xlib.X
+        return type('ButtonListener', (listener,), {'_EVENTS': (X.ButtonPress, X.ButtonRelease)})
+    
+    if listener.__module__.endswith('._darwin'):
+        Quartz = module.Quartz
+        mask = 0
+        for event in (Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp,
+                      Quartz.kCGEventRightMouseDown, Quartz.kCGEventRightMouseUp,
+                      Quartz.kCGEventOtherMouseDown, Quartz.kCGEventOtherMouseUp):
+            mask |= Quartz.CGEventMaskBit(event)
+        return type('ButtonListener', (listener,), {'_EVENTS': mask})
+    return listener
+
+
+class PynputBackend:
+    """Hooks and injects input through pynput"""
+    
+    def __init__(self):
+        from pynput import keyboard, mouse
+        
+        self.keyboard = keyboard
+        self.mouse = mouse
+        self.keyboard_controller = keyboard.Controller()
+        self.mouse_controller = mouse.Controller()
+    
+    def _output_key(self, key):
+        if len(key) == 1:
+            return key
+        return getattr(self.keyboard.Key, key, key)
+    
+    def press(self, key):
+        if key == MOUSE_LEFT:
+            self.mouse_controller.press(self.mouse.Button.left)
+        else:
+            self.keyboard_controller.press(self._output_key(key))
+    
+    def release(self, key):
+        if key == MOUSE_LEFT:
+            self.mouse_controller.release(self.mouse.Button.left)
+        else:
+            self.keyboard_controller.release(self._output_key(key))
+    
+    def keyboard_listener(self, on_key):
+        listener = self.keyboard.Listener(
+            on_press=lambda key: on_key(key_name(key), True),
+            on_release=lambda key: on_key(key_name(key), False)
+        )
+        listener.start()
+        return listener
+    
+    def mouse_listener(self, on_button, buttons_only=True):
+        on_click = lambda x, y, button, pressed: on_button(button_name(button), pressed)
+        if buttons_only:
+            listener = button_listener_class(self.mouse)(
+                on_click=on_click,
+                win32_event_filter=lambda msg, data: msg != WM_MOUSEMOVE
+            )
+        else:
+            listener = self.mouse.Listener(on_click=on_click)
+        listener.start()
+        return listener
+
+
+class XTestBackend:
+    """Injects through the X11 XTest extension on a connection of its own.
+    
+    Keycodes are looked up once per key, and send() writes a whole group of
+    events with a single flush. Input hooks still come from pynput.
+    """
+    
+    def __init__(self, display_name=None):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+        
+        self.display = display.Display(display_name)
+        if not self.display.has_extension('XTEST'):
+            raise RuntimeError("the X server has no XTEST extension")
+        
+        XK.load_keysym_group('xkb')
+        self._XK = XK
+        self._fake_input = xtest.fake_input
+        self._press_types = (X.KeyPress, X.ButtonPress)
+        self._release_types = (X.KeyRelease, X.ButtonRelease)
+        self._events = {}
+        self._lock = threading.Lock()
+        self._hooks = None
+    
+    def _event(self, key):
+        """(is a button, X keycode or button number) for a key name, cached"""
+        event = self._events.get(key)
+        if event is None:
+            if key in X_BUTTONS:
+                event = (1, X_BUTTONS[key])
+            else:
+                event = (0, self._keycode(key))
+            self._events[key] = event
+        return event
+    
+    def _keycode(self, key):
+        XK = self._XK
+        name = X_KEYSYMS.get(key.lower(), key)
+        if re.fullmatch(r'f\d+', name):
+            name = name.upper()
+        keysym = XK.string_to_keysym(name) or XK.string_to_keysym(name.capitalize())
+        if not keysym and len(key) == 1 and ord(key) < 256:
+            # Latin-1 keysyms are the character codes
+            keysym = ord(key)
+        
+        keycode = self.display.keysym_to_keycode(keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"No X keycode for key '{key}'")
+        return keycode
+    
+    def x_event(self, op, key):
+        """(X event type, keycode or button number) that injecting op on key produces"""
+        button, detail = self._event(key)
+        return (self._press_types if op == 'press' else self._release_types)[button], detail
+    
+    def prepare(self, keys):
+        """Look up keycodes ahead of time, so the first injection doesn't pay for it"""
+        for key in keys:
+            self._event(key)
+    
+    def press(self, key):
+        button, detail = self._event(key)
+        with self._lock:
+            self._fake_input(self.display, self._press_types[button], detail)
+            self.display.flush()
+    
+    def release(self, key):
+        button, detail = self._event(key)
+        with self._lock:
+            self._fake_input(self.display, self._release_types[button], detail)
+            self.display.flush()
+    
+    def send(self, events):
+        """Inject a group of ('press' | 'release', key) events with one flush"""
+        resolved = [self.x_event(op, key) for op, key in events]
+        with self._lock:
+            for event_type, detail in resolved:
+                self._fake_input(self.display, event_type, detail)
+            self.display.flush()
+    
+    def _hook_backend(self):
+        if self._hooks is None:
+            self._hooks = PynputBackend()
+        return self._hooks
+    
+    def keyboard_listener(self, on_key):
+        return self._hook_backend().keyboard_listener(on_key)
+    
+    def mouse_listener(self, on_button, buttons_only=True):
+        return self._hook_backend().mouse_listener(on_button, buttons_only)
+
+
+def make_backend(name='pynput'):
+    """A backend by name, falling back to pynput where XTest can't be used"""
+    if name == 'xtest':
+        try:
+            return XTestBackend()
+        except Exception as e:
+            log.warning("XTest backend unavailable (%s), using pynput", e)
+    return PynputBackend()
+
+
+class NullBackend:
+    """Backend without OS hooks that keeps injected events in memory"""
+    
+    def __init__(self, keep=10000):
+        self.keep = keep
+        self.events = []
+    
+    def _log(self, op, key):
+        if len(self.events) >= self.keep:
+            del self.events[:len(self.events) // 2]
+        self.events.append((op, key))
+    
+    def press(self, key):
+        self._log('press', key)
+    
+    def release(self, key):
+        self._log('release', key)
+    
+    def keyboard_listener(self, on_key):
+        return None
+    
+    def mouse_listener(self, on_button, buttons_only=True):
+        return None
\ No newline at end of file
@@ -0,0 +1,405 @@
+import os
+import json
+import time
+import tempfile
+import threading
+
+from engine.backends import WM_MOUSEMOVE, button_listener_class
+from engine.settings import make_profile
+from engine.timelines import DEFAULT_TIMINGS
+from engine.trace import SCRIPT_NUMBERS
+
+
+def _timed(loop, iterations):
+    start = time.perf_counter_ns()
+    loop(iterations)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def bench_worker(iterations=200000, rounds=10):
+    """Per-iteration cost of the spam macro's worker loop, and what the slotted run state saves.
+    
+    Runs the compiled timeline through ScriptBot._run_timeline under the
+    script's accounting counter, as its worker does, on a VirtualClock with
+    a NullBackend and zero delays, so a wait costs only its clock check and
+    thread handoffs don't swamp the difference. The loop is guarded
+    once by the ScriptRun and local trace number workers use, and once by
+    the dict lookups they used to make (script state, stop event and trace
+    number), taking the best of rounds alternating runs of each.
+    Returns [(label, value, unit)].
+    """
+    from engine.bot import ScriptBot
+    from engine.backends import NullBackend
+    from engine.clock import VirtualClock
+    
+    bot = ScriptBot(NullBackend(), VirtualClock())
+    timings = {'spam_macro': {name: 0.0 for name in DEFAULT_TIMINGS['spam_macro']}}
+    bot.apply_profiles({'bench': make_profile({'script_states': {'spam_macro': True}, 'timings': timings})}, 'bench')
+    script = bot.profile.configs['spam_macro']
+    events = sum(len(value) if op == 'send' else 1 for op, value in script.timeline if op != 'wait')
+    run = bot.runs['spam_macro']
+    run_timeline = bot._run_timeline
+    timeline = script.timeline
+    number = script.number
+    
+    active_scripts = {'spam_macro': True}
+    stop_events = {'spam_macro': threading.Event()}
+    
+    def dict_worker(n):
+        stop_event = stop_events.get('spam_macro')
+        for _ in range(n):
+            if not (active_scripts.get('spam_macro', False) and not stop_event.is_set()):
+                break
+            run_timeline(timeline, SCRIPT_NUMBERS.get('spam_macro', 0))
+    
+    def slot_worker(n):
+        for _ in range(n):
+            if not run.active:
+                break
+            run_timeline(timeline, number)
+    
+    def looped(worker):
+        def loop(n):
+            run.active = True
+            try:
+                bot.accounting.run(number, lambda: worker(n))
+            finally:
+                run.active = False
+        return loop
+    
+    per_round = max(1, iterations // rounds)
+    before = after = float('inf')
+    for _ in range(rounds):
+        before = min(before, _timed(looped(dict_worker), per_round))
+        after = min(after, _timed(looped(slot_worker), per_round))
+    bot.stop_all_scripts()
+    return [
+        (f"dict lookups, per iteration ({events} events)", before, 'ns'),
+        ("slotted run state, per iteration", after, 'ns'),
+        ("saved per iteration", before - after, 'ns'),
+        ("per injected event", after / events, 'ns')
+    ]
+
+
+def _thread_cpu(thread):
+    """CPU seconds used by a running thread, or None where that can't be read"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    except (AttributeError, OSError):
+        return None
+
+
+def _mouse_run(backend, buttons_only, moves, rate):
+    calls = 0
+    listener_class = button_listener_class(backend.mouse) if buttons_only else backend.mouse.Listener
+    
+    class CountingListener(listener_class):
+        def _handle(self, *args):
+            nonlocal calls
+            calls += 1
+            return super()._handle(*args)
+    
+    listener = CountingListener(on_click=lambda x, y, button, pressed: None,
+                                win32_event_filter=lambda msg, data: not buttons_only or msg != WM_MOUSEMOVE)
+    listener.start()
+    listener.wait()
+    cpu_start = _thread_cpu(listener)
+    
+    move = backend.mouse_controller.move
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(moves):
+        move(1 if i % 2 else -1, 0)
+        deadline = start + (i + 1) * interval
+        while time.perf_counter() < deadline:
+            pass
+    elapsed = time.perf_counter() - start
+    
+    # Let the hook drain what the server still has queued
+    time.sleep(0.2)
+    cpu_end = _thread_cpu(listener)
+    listener.stop()
+    listener.join()
+    
+    cpu = None if cpu_start is None else (cpu_end - cpu_start) / elapsed * 100
+    return calls / elapsed, cpu
+
+
+def bench_mouse(iterations=2000, rate=1000.0):
+    """Mouse hook callbacks and hook thread CPU while the pointer moves at rate Hz.
+    
+    Runs pynput's stock listener and the button-only one against the same
+    synthetic motion; iterations is the number of moves. Needs a display.
+    """
+    from engine.backends import PynputBackend
+    
+    backend = PynputBackend()
+    rows = []
+    for label, buttons_only in (("stock listener", False), ("button-only listener", True)):
+        calls, cpu = _mouse_run(backend, buttons_only, iterations, rate)
+        rows.append((f"{label} callbacks", calls, '/s'))
+        if cpu is not None:
+            rows.append((f"{label} hook thread CPU", cpu, '%'))
+    return rows
+
+
+def _inject_rate(inject, iterations):
+    """(events per second, microseconds per event) for iterations calls of inject, two events each"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        inject()
+    elapsed = time.perf_counter() - start
+    return 2 * iterations / elapsed, elapsed / (2 * iterations) * 1e6
+
+
+def bench_inject(iterations=2000, key='shift'):
+    """Injection throughput and per-event cost of pynput and the XTest backend.
+    
+    Each iteration injects a press/release pair of key, one event at a time
+    and, where the backend can, as one batch. The XTest rows with a round
+    trip also wait for the X server to process the pair. Needs an X display,
+    ideally a throwaway one such as Xvfb. A backend that can't be used gets
+    a note row, with None for its value and the reason in place of a unit.
+    """
+    from engine.backends import PynputBackend, XTestBackend
+    
+    rows = []
+    for label, make in (("pynput", PynputBackend), ("xtest", XTestBackend)):
+        try:
+            backend = make()
+        except Exception as e:
+            rows.append((label, None, f"unavailable: {e}"))
+            continue
+        
+        def single():
+            backend.press(key)
+            backend.release(key)
+        
+        runs = [("press/release", single)]
+        if hasattr(backend, 'send'):
+            events = (('press', key), ('release', key))
+            display = backend.display
+            runs.append(("batched", lambda: backend.send(events)))
+            runs.append(("batched with round trip", lambda: (backend.send(events), display.sync())))
+        
+        for run_label, inject in runs:
+            rate, latency = _inject_rate(inject, iterations)
+            rows.append((f"{label} {run_label}", rate, 'events/s'))
+            rows.append((f"{label} {run_label}", latency, 'us/event'))
+    return rows
+
+
+def _context_switches():
+    """{thread id: context switches so far} for every thread of this process; Linux only"""
+    counts = {}
+    for task in os.listdir('/proc/self/task'):
+        switches = 0
+        with open(f'/proc/self/task/{task}/status') as f:
+            for line in f:
+                if line.startswith(('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches')):
+                    switches += int(line.split()[1])
+        counts[int(task)] = switches
+    return counts
+
+
+def bench_idle(iterations=3):
+    """Wakeups of the engine's threads with a script armed and with none.
+    
+    Runs a ScriptBot and a settings watcher and counts the context switches
+    of every thread but this one over iterations seconds in each state.
+    Without OS hooks it measures on a NullBackend and says so in a note row.
+    """
+    from engine.bot import ScriptBot
+    from engine.watcher import SettingsWatcher
+    from engine.backends import PynputBackend, NullBackend
+    
+    rows = []
+    try:
+        backend = PynputBackend()
+    except Exception as e:
+        rows.append(("OS hooks", None, f"unavailable ({e.__class__.__name__}), measured without them"))
+        backend = NullBackend()
+    
+    bot = ScriptBot(backend)
+    this_thread = threading.get_native_id()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'settings.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({}, f)
+        watcher = SettingsWatcher(path, lambda settings: None)
+        watcher.start()
+        
+        for label, states in (("armed", {'spam_macro': True}), ("idle", {})):
+            bot.apply_profiles({'bench': make_profile({'script_states': states})}, 'bench')
+            time.sleep(0.2)
+            before = _context_switches()
+            time.sleep(iterations)
+            after = _context_switches()
+            wakeups = sum(count - before.get(thread, 0) for thread, count in after.items() if thread != this_thread)
+            rows.append((f"{label}: other threads", len(after) - 1, ''))
+            rows.append((f"{label}: their wakeups", wakeups / iterations, '/s'))
+        
+        watcher.stop()
+        bot.stop_all_scripts()
+    return rows
+
+
+def bench_tray(iterations=3, rate=20.0):
+    """GUI thread and process CPU, and GUI thread wakeups, with the window visible and in tray mode.
+    
+    A thread presses and releases the spam macro's trigger rate times a second,
+    so the engine reports a status change on every event; iterations is the
+    number of seconds measured in each mode. Runs in a scratch directory so
+    the real settings file is never read or written.
+    """
+    from PySide6.QtCore import QTimer, QEventLoop
+    from PySide6.QtWidgets import QApplication
+    from engine.backends import NullBackend
+    
+    app = QApplication.instance() or QApplication([])
+    gui_thread = threading.get_native_id()
+    cwd = os.getcwd()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            from main import FortniteScriptGUI
+            window = FortniteScriptGUI(NullBackend())
+            window.show()
+            bot = window.script_bot
+            bot.apply_profiles({'bench': make_profile({'script_states': {'spam_macro': True}})}, 'bench')
+            
+            stop = threading.Event()
+            
+            def trigger():
+                while not stop.is_set():
+                    bot.dispatch_key('t', True)
+                    stop.wait(0.5 / rate)
+                    bot.dispatch_key('t', False)
+                    stop.wait(0.5 / rate)
+            
+            thread = threading.Thread(target=trigger, daemon=True)
+            thread.start()
+            for label, enter in (("visible", window.leave_tray), ("tray", window.enter_tray)):
+                enter()
+                app.processEvents()
+                loop = QEventLoop()
+                QTimer.singleShot(int(iterations * 1000), loop.quit)
+                cpu, process_cpu, switches = time.thread_time(), time.process_time(), _context_switches()[gui_thread]
+                loop.exec()
+                rows.append((f"{label}: GUI thread CPU", (time.thread_time() - cpu) / iterations * 100, '%'))
+                rows.append((f"{label}: process CPU", (time.process_time() - process_cpu) / iterations * 100, '%'))
+                rows.append((f"{label}: GUI thread wakeups",
+                             (_context_switches()[gui_thread] - switches) / iterations, '/s'))
+            
+            stop.set()
+            thread.join()
+            window.leave_tray()
+            window.settings_watcher.stop()
+            bot.stop_all_scripts()
+            bot.apply_profiles({'bench': make_profile()}, 'bench')
+            window.hide()
+        finally:
+            os.chdir(cwd)
+    return rows
+
+
+def bench_gate(iterations=200000):
+    """Cost of dispatching a bound press with no focus gate and while the target window is unfocused"""
+    from engine.bot import ScriptBot
+    from engine.backends import NullBackend
+    from engine.bindings import key_code
+    from engine.focus import FocusGate
+    
+    bot = ScriptBot(NullBackend())
+    bot.apply_profiles({'bench': make_profile({'script_states': {'wall_take': True}})}, 'bench')
+    bot.runs['wall_take'].stopped = True
+    code = key_code(bot.profile.configs['wall_take'].trigger)
+    dispatch = bot._dispatch
+    
+    def loop(n):
+        for _ in range(n):
+            dispatch(code, True)
+            dispatch(code, False)
+    
+    ungated = _timed(loop, iterations) / 2
+    gate = FocusGate('bench')
+    gate.focused = False
+    bot.focus_gate = gate
+    gated = _timed(loop, iterations) / 2
+    bot.stop_all_scripts()
+    return [
+        ("no gate, per event", ungated, 'ns'),
+        ("unfocused gate, per event", gated, 'ns')
+    ]
+
+
+def bench_control(iterations=2000):
+    """Round trips of control socket commands against an engine with no OS hooks.
+    
+    ping is the protocol and socket alone; enable/disable also recompiles the
+    profile and starts or stops the script. Returns [(label, value, unit)].
+    """
+    from engine.bot import ScriptBot
+    from engine.backends import NullBackend
+    from engine.control import Controller, ControlServer, ControlClient, round_trips
+    from engine.e2e import percentile
+    
+    bot = ScriptBot(NullBackend())
+    profiles = {'bench': make_profile()}
+    bot.apply_profiles(profiles, 'bench')
+    controller = Controller(bot, profiles, 'bench')
+    path = os.path.join(tempfile.mkdtemp(), 'control.sock')
+    server = ControlServer(path, controller.execute)
+    server.start()
+    rows = []
+    try:
+        with ControlClient(path) as client:
+            for label, lines in (('ping', ['ping']), ('stats', ['stats']),
+                                 ('enable/disable', ['enable wall_take', 'disable wall_take'])):
+                times = sorted(t for line in lines for t in round_trips(client, line, iterations // len(lines)))
+                rows.append((f"{label} round trip p50", percentile(times, 50) / 1000, 'us'))
+                rows.append((f"{label} round trip p99", percentile(times, 99) / 1000, 'us'))
+    finally:
+        server.stop()
+        os.rmdir(os.path.dirname(path))
+        bot.stop_all_scripts()
+    return rows
+
+
+def bench_limiter(iterations=200000):
+    """Cost of injecting a key tap with no output limit and through a global and a per-script bucket"""
+    from engine.bot import ScriptBot
+    from engine.backends import NullBackend
+    from engine.config import RateLimit, OutputLimits
+    
+    bot = ScriptBot(NullBackend())
+    number = SCRIPT_NUMBERS['spam_macro']
+    
+    def loop(n):
+        for _ in range(n):
+            bot._press('e', number)
+            bot._release('e', number)
+    
+    unlimited = _timed(loop, iterations)
+    # Rates far above the loop's, so every press is admitted at once and only the bookkeeping is timed
+    bot.set_output_limits(OutputLimits(rate=1e9, burst=1000, policy='delay', max_delay=0.05,
+                                       scripts=(('spam_macro', RateLimit(rate=1e9, burst=1000)),)))
+    limited = _timed(loop, iterations)
+    bot.set_output_limits(None)
+    return [
+        ("no limit, per tap", unlimited, 'ns'),
+        ("global and script bucket, per tap", limited, 'ns')
+    ]
+
+
+BENCHMARKS = {
+    'worker': bench_worker,
+    'mouse': bench_mouse,
+    'idle': bench_idle,
+    'inject': bench_inject,
+    'tray': bench_tray,
+    'gate': bench_gate,
+    'control': bench_control,
+    'limiter': bench_limiter
+}
\ No newline at end of file
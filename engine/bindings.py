@@ -0,0 +1,232 @@
+import re
+import threading
+
+
+# Default time allowed between the steps of a sequence binding such as 'g > f'
+SEQUENCE_WINDOW = 0.35
+
+MOUSE_BUTTONS = ('left', 'right', 'middle', 'x1', 'x2')
+
+KEY_ALIASES = {
+    'escape': 'esc',
+    'return': 'enter',
+    'del': 'delete',
+    'spacebar': 'space',
+    'control': 'ctrl',
+    'shift_l': 'shift',
+    'shift_r': 'shift',
+    'ctrl_l': 'ctrl',
+    'ctrl_r': 'ctrl',
+    'alt_l': 'alt',
+    'alt_r': 'alt',
+    'alt_gr': 'alt',
+    'cmd_l': 'cmd',
+    'cmd_r': 'cmd',
+    'plus': '+'
+}
+
+_codes = {}
+_names = []
+_raw_codes = {}
+_intern_lock = threading.Lock()
+
+
+class BindingError(ValueError):
+    pass
+
+
+def canonical_key(name):
+    """Normalize a key or mouse button name as typed in settings or reported by a hook"""
+    if not name:
+        return ""
+    
+    key = str(name).lower().strip()
+    if key in ('+', '>'):
+        return key
+    
+    key = re.sub(r'\s+', ' ', key)
+    for prefix in ('mouse ', 'mouse_', 'button.'):
+        if key.startswith(prefix) and key[len(prefix):] in MOUSE_BUTTONS:
+            return 'mouse_' + key[len(prefix):]
+    if key in ('x1', 'x2'):
+        return 'mouse_' + key
+    
+    return KEY_ALIASES.get(key, key)
+
+
+def key_code(name):
+    """Small integer code for a key name; names seen before cost one dict lookup"""
+    code = _raw_codes.get(name)
+    if code is None:
+        key = canonical_key(name)
+        with _intern_lock:
+            code = _codes.get(key)
+            if code is None:
+                code = _codes[key] = len(_names)
+                _names.append(key)
+            _raw_codes[name] = code
+    return code
+
+
+def key_name(code):
+    return _names[code]
+
+
+def parse_binding(text):
+    """Parse 'f', 'shift+f', 'mouse x1 + e' or 'g > f @250ms' into (steps, window).
+    
+    Each step is (trigger code, frozenset of codes that must already be held).
+    """
+    text = str(text).strip().lower()
+    window = SEQUENCE_WINDOW
+    
+    match = re.search(r'@\s*(\d+(?:\.\d+)?)\s*ms$', text)
+    if match:
+        window = float(match.group(1)) / 1000.0
+        text = text[:match.start()].strip()
+    
+    steps = []
+    for part in (text.split('>') if text != '>' else [text]):
+        keys = [k.strip() for k in (part.split('+') if part.strip() != '+' else [part])]
+        if not part.strip() or not all(keys):
+            raise BindingError(f"Invalid binding: '{text}'")
+        codes = [key_code(k) for k in keys]
+        steps.append((codes[-1], frozenset(codes[:-1])))
+    
+    return tuple(steps), window
+
+
+def uses_mouse(text):
+    """Whether a binding needs the mouse hook"""
+    steps, _ = parse_binding(text)
+    return any(key_name(code).startswith('mouse_') for trigger, held in steps for code in held | {trigger})
+
+
+def format_steps(steps):
+    parts = []
+    for trigger, held in steps:
+        parts.append('+'.join([key_name(c) for c in sorted(held)] + [key_name(trigger)]))
+    return ' > '.join(parts)
+
+
+class _Node:
+    __slots__ = ('edges', 'window')
+    
+    def __init__(self):
+        # key code -> [(held codes, child node, binding id)], most specific first
+        self.edges = {}
+        self.window = SEQUENCE_WINDOW
+
+
+class BindingMatcher:
+    """All active bindings compiled into one trie keyed by key code.
+    
+    press() and release() are called for every edge event and advance the
+    automaton in constant time using the set of keys currently held.
+    """
+    
+    def __init__(self, bindings):
+        """bindings maps a binding id to its text; raises BindingError on conflicts"""
+        self.root = _Node()
+        self.pressed = set()
+        self._state = self.root
+        self._deadline = 0.0
+        self._held_bindings = {}
+        self._binding_ids = set(bindings)
+        self._compile(bindings)
+    
+    def adopt(self, previous):
+        """Take over the held keys of the matcher this one replaces.
+        
+        A binding that is down when the matchers are swapped still gets its
+        release, as long as this matcher has a binding with the same id.
+        """
+        self.pressed = previous.pressed
+        self._held_bindings = {code: binding_id for code, binding_id in previous._held_bindings.items()
+                               if binding_id in self._binding_ids}
+        self._state = self.root
+    
+    def forget(self, which):
+        """Drop the held keys which(code) is true for; returns the bindings they held down.
+        
+        For a hook that was restarted: releases it missed while down never
+        arrive, so its keys would otherwise stay held and swallow the next press.
+        The pressed set is shared with adopted matchers, so it is edited in place.
+        """
+        for code in [code for code in self.pressed if which(code)]:
+            self.pressed.discard(code)
+        released = [self._held_bindings.pop(code) for code in list(self._held_bindings) if which(code)]
+        self._state = self.root
+        return released
+    
+    def _compile(self, bindings):
+        compiled = {}
+        for binding_id, text in bindings.items():
+            steps, window = parse_binding(text)
+            for other_id, (other_steps, _) in compiled.items():
+                shorter, longer = sorted((steps, other_steps), key=len)
+                if longer[:len(shorter)] == shorter:
+                    raise BindingError(f"'{text}' ({_label(binding_id)}) conflicts with "
+                                       f"'{bindings[other_id]}' ({_label(other_id)})")
+            compiled[binding_id] = (steps, window)
+        
+        for binding_id, (steps, window) in compiled.items():
+            node = self.root
+            for i, (trigger, held) in enumerate(steps):
+                last = i == len(steps) - 1
+                edges = node.edges.setdefault(trigger, [])
+                edge = next((e for e in edges if e[0] == held), None)
+                if edge is None:
+                    for other_held, _, other_id in edges:
+                        if not (held <= other_held or other_held <= held):
+                            raise BindingError(f"'{bindings[binding_id]}' ({_label(binding_id)}) is ambiguous with "
+                                               f"'{format_steps(steps[:i] + ((trigger, other_held),))}' when both "
+                                               f"modifiers are held")
+                    edge = (held, None if last else _Node(), binding_id if last else None)
+                    edges.append(edge)
+                    edges.sort(key=lambda e: len(e[0]), reverse=True)
+                if not last:
+                    node = edge[1]
+                    node.window = max(node.window, window) if node.edges else window
+    
+    def _match(self, node, code):
+        for held, child, binding_id in node.edges.get(code, ()):
+            if held <= self.pressed:
+                return child, binding_id
+        return None
+    
+    def press(self, code, now):
+        """Register a key press; returns the id of the binding it completes, if any"""
+        if code in self.pressed:
+            return None
+        self.pressed.add(code)
+        
+        node = self._state
+        if node is not self.root and now > self._deadline:
+            node = self._state = self.root
+        
+        match = self._match(node, code)
+        if match is None and node is not self.root:
+            match = self._match(self.root, code)
+        if match is None:
+            self._state = self.root
+            return None
+        
+        child, binding_id = match
+        if binding_id is not None:
+            self._state = self.root
+            self._held_bindings[code] = binding_id
+            return binding_id
+        
+        self._state = child
+        self._deadline = now + child.window
+        return None
+    
+    def release(self, code):
+        """Register a key release; returns the id of the binding it releases, if any"""
+        self.pressed.discard(code)
+        return self._held_bindings.pop(code, None)
+
+
+def _label(binding_id):
+    return binding_id[0] if isinstance(binding_id, tuple) else str(binding_id)
\ No newline at end of file
@@ -0,0 +1,931 @@
+import time
+import threading
+import logging
+from PySide6.QtCore import QObject, Signal
+
+from engine.clock import RealClock
+from engine.bindings import BindingMatcher, BindingError, key_code, key_name, uses_mouse
+from engine.config import SCRIPT_KEYBINDS, SCRIPT_TRIGGERS, profile_config
+from engine.timelines import LOOPING, COMPOSITES, merge_timings
+from engine.profiler import Profiler, HOOK, DISPATCH, SCHEDULE, EMIT
+from engine.accounting import Accounting
+from engine.arbiter import KeyArbiter
+from engine.focus import FocusGate
+from engine import trace
+
+
+log = logging.getLogger(__name__)
+
+
+# Seconds a watchdog restart waits for an apply or switch in progress before trying again on its next check
+RESTART_LOCK_TIMEOUT = 0.5
+
+
+class ScriptRun:
+    """Run state of one started script, read by its worker as plain attributes"""
+    
+    __slots__ = ('active', 'stopped')
+    
+    def __init__(self, active):
+        self.active = active
+        self.stopped = False
+
+
+class CompiledProfile:
+    """A profile's bindings, handlers and timelines, built once and swapped in whole"""
+    
+    def __init__(self, name, bindings, scripts, errors, configs=None):
+        self.name = name
+        self.bindings = bindings
+        self.configs = configs or {}
+        self.matcher = BindingMatcher({binding_id: h[0] for binding_id, h in bindings.items()})
+        self.scripts = scripts
+        self.errors = errors
+        self.uses_mouse = any(uses_mouse(h[0]) for h in bindings.values())
+
+
+class ScriptBot(QObject):
+    status_changed = Signal(str, str)
+    profile_changed = Signal(str)
+    idle_changed = Signal(bool)
+    focus_changed = Signal(bool)
+    
+    def __init__(self, backend=None, clock=None):
+        super().__init__()
+        if backend is None:
+            from engine.backends import PynputBackend
+            backend = PynputBackend()
+        self.backend = backend
+        self.clock = clock or RealClock()
+        self.listeners = []
+        self.runs = {}
+        # Every worker thread spawned and not finished yet, whatever script started it
+        self.workers = set()
+        self._workers_lock = threading.Lock()
+        self.profile = CompiledProfile('', {}, [], {})
+        self.profiles = {}
+        self.last_switch_ns = 0
+        self._dispatch_lock = threading.Lock()
+        # Held while the profile, runs or hooks change: applies from the GUI or CLI,
+        # hotkey switches in the hook thread and restarts from the watchdog
+        self._state_lock = threading.RLock()
+        self.binding_errors = {}
+        self.statuses = {}
+        self._keyboard_listener = None
+        self._mouse_listener = None
+        self._capture = None
+        self.focus_gate = None
+        self.idle = True
+        self.recorder = None
+        self.profiler = None
+        self.accounting = Accounting()
+        self.arbiter = KeyArbiter(self.clock)
+        # OutputLimiter, or None when no output rate is limited
+        self.limiter = None
+        # perf_counter() when the keyboard and mouse hook callbacks now running started, else 0
+        self.hook_busy = [0.0, 0.0]
+        self.watchdog = None
+        self.timings = merge_timings(None)
+        # Checked once per event instead of asking the logger; refreshed when hooks change
+        self.debug = log.isEnabledFor(logging.DEBUG)
+    
+    @property
+    def active_scripts(self):
+        return {script_id: run.active for script_id, run in self.runs.items()}
+    
+    def _set_status(self, script_id, status):
+        self.statuses[script_id] = status
+        self.status_changed.emit(script_id, status)
+    
+    def snapshot(self):
+        """What a UI shows of the engine, for rebuilding it after it stopped following the signals"""
+        gate = self.focus_gate
+        return {
+            'profile': self.profile.name,
+            'scripts': list(self.profile.scripts),
+            'statuses': dict(self.statuses),
+            'running': [script_id for script_id, run in self.runs.items() if run.active],
+            'idle': self.idle,
+            'focused': gate is None or gate.focused
+        }
+    
+    def set_timings(self, timings):
+        self.timings = merge_timings(timings)
+    
+    def start_recording(self, path):
+        self.stop_recording()
+        self.recorder = trace.TraceWriter(path, clock_ns=self.clock.now_ns)
+    
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder:
+            recorder.close()
+        return recorder
+    
+    def start_profiling(self, capacity=65536):
+        if self.profiler is None:
+            self.profiler = Profiler(capacity)
+        return self.profiler
+    
+    def stop_profiling(self):
+        profiler, self.profiler = self.profiler, None
+        return profiler
+    
+    def _record(self, kind, key='', number=0):
+        recorder = self.recorder
+        if recorder:
+            recorder.record(kind, key, number)
+    
+    def _press(self, key, number=0):
+        if self.limiter is not None and number and not self._admit(number):
+            return
+        events = self.arbiter.press(key, number)
+        if len(events) != 1:
+            self._inject(events, number)
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        self.backend.press(key)
+        if self.debug:
+            log.debug("inject press %s (script %d)", key, number)
+        if self.recorder:
+            self._record(trace.INJECT_DOWN, key, number)
+        if profiler is not None:
+            profiler.span(EMIT, start_ns, number)
+    
+    def _release(self, key, number=0):
+        if not self.arbiter.release(key, number):
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        self.backend.release(key)
+        if self.debug:
+            log.debug("inject release %s (script %d)", key, number)
+        if self.recorder:
+            self._record(trace.INJECT_UP, key, number)
+        if profiler is not None:
+            profiler.span(EMIT, start_ns, number)
+    
+    def _admit(self, number, count=1):
+        """Whether script number may inject count presses, after waiting out the output limits"""
+        wait = self.limiter.admit(number, count)
+        if wait is None:
+            return False
+        if wait:
+            # Waiting on a limit is expected to take time, so the watchdog mustn't see it as a stall
+            counter = self.accounting.current()
+            busy = counter is not None and counter.busy
+            if busy:
+                counter.busy = 0.0
+            self.clock.sleep(wait)
+            if busy:
+                counter.busy = time.perf_counter()
+        return True
+    
+    def _send(self, events, number=0):
+        """Inject a group of events in one call where the backend supports it"""
+        if self.limiter is not None and number:
+            presses = sum(op == 'press' for op, _ in events)
+            if presses and not self._admit(number, presses):
+                events = tuple(event for event in events if event[0] != 'press')
+        self._inject(self.arbiter.resolve(events, number), number)
+    
+    def _inject(self, events, number=0):
+        if not events:
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        send = getattr(self.backend, 'send', None)
+        if send is not None:
+            send(events)
+        else:
+            backend = self.backend
+            for op, key in events:
+                backend.press(key) if op == 'press' else backend.release(key)
+        if self.debug:
+            log.debug("inject %s (script %d)", ', '.join(f"{op} {key}" for op, key in events), number)
+        if self.recorder:
+            for op, key in events:
+                self._record(trace.INJECT_DOWN if op == 'press' else trace.INJECT_UP, key, number)
+        if profiler is not None:
+            profiler.span(EMIT, start_ns, number)
+    
+    def _spawn(self, number, target):
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        accounting = self.accounting
+        workers = self.workers
+        workers_lock = self._workers_lock
+        
+        def run():
+            try:
+                accounting.run(number, target)
+            finally:
+                with workers_lock:
+                    workers.discard(threading.current_thread())
+        
+        # Held until the thread is in the set, so it can't finish and be removed first
+        with workers_lock:
+            thread = self.clock.spawn(run)
+            workers.add(thread)
+        if profiler is not None:
+            profiler.span(SCHEDULE, start_ns, number)
+        return thread
+    
+    def join_workers(self, timeout=1.0):
+        """Wait for every worker to finish; returns how many were still running after timeout"""
+        deadline = time.monotonic() + timeout
+        with self._workers_lock:
+            workers = list(self.workers)
+        for thread in workers:
+            if thread is not threading.current_thread():
+                self.clock.join(thread, max(0.0, deadline - time.monotonic()))
+        with self._workers_lock:
+            return len(self.workers)
+    
+    def resource_counts(self):
+        """Live counts of what the engine owns, to check that long sessions don't leak"""
+        with self._workers_lock:
+            workers = len(self.workers)
+        return {
+            'workers': workers,
+            'listeners': len(self.listeners),
+            'runs': len(self.runs),
+            'profiles': len(self.profiles),
+            'bindings': len(self.profile.bindings),
+            'statuses': len(self.statuses),
+            'focus_gate': int(self.focus_gate is not None),
+            'threads': threading.active_count()
+        }
+    
+    def _run_timeline(self, steps, number=0):
+        sleep = self.clock.sleep
+        press = self._press
+        release = self._release
+        send = self._send
+        counter = self.accounting.current()
+        watched = counter is not None
+        wakeups = 0
+        for op, value in steps:
+            if op == 'wait':
+                sleep(value)
+                wakeups += 1
+                continue
+            # Injections are marked for the watchdog; waits are expected to take time
+            if watched:
+                counter.busy = time.perf_counter()
+            if op == 'press':
+                press(value, number)
+            elif op == 'send':
+                send(value, number)
+            else:
+                release(value, number)
+            if watched:
+                counter.busy = 0.0
+                # Restarted by the watchdog while stuck: the script has a new worker now
+                if counter.stalled:
+                    return
+        
+        if watched:
+            counter.wakeups += wakeups
+            counter.cpu = time.thread_time() - counter.started
+    
+    def _on_raw_key(self, key_str, pressed):
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        if self.debug:
+            log.debug("hook key %s %s", key_str, 'down' if pressed else 'up')
+        if self.recorder:
+            self._record(trace.KEY_DOWN if pressed else trace.KEY_UP, key_str)
+        busy = self.hook_busy
+        busy[0] = time.perf_counter()
+        try:
+            self.dispatch_key(key_str, pressed)
+        finally:
+            busy[0] = 0.0
+        if profiler is not None:
+            profiler.span(HOOK, start_ns)
+    
+    def _on_raw_button(self, button_str, pressed):
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        if self.debug:
+            log.debug("hook button %s %s", button_str, 'down' if pressed else 'up')
+        if self.recorder:
+            self._record(trace.BUTTON_DOWN if pressed else trace.BUTTON_UP, button_str)
+        busy = self.hook_busy
+        busy[1] = time.perf_counter()
+        try:
+            self.dispatch_button(button_str, pressed)
+        finally:
+            busy[1] = 0.0
+        if profiler is not None:
+            profiler.span(HOOK, start_ns)
+    
+    def dispatch_key(self, key_str, pressed):
+        self._dispatch(key_code(key_str), pressed)
+    
+    def dispatch_button(self, button_str, pressed):
+        self._dispatch(key_code('mouse_' + button_str), pressed)
+    
+    def begin_capture(self, on_capture, buttons=True):
+        """Hand the next press to on_capture(code) instead of the bindings.
+        
+        Capture rides on the engine's own hooks, starting them if nothing else
+        needs them yet. Releases still reach the matcher, so keys held across
+        the capture aren't left stuck.
+        """
+        self._capture = on_capture
+        self._update_hooks(self.profile, buttons)
+    
+    def end_capture(self):
+        self._capture = None
+        self._update_hooks(self.profile)
+    
+    def set_focus_window(self, match):
+        """Arm the bindings only while a window whose class or title contains match is focused"""
+        match = (match or '').strip()
+        gate = self.focus_gate
+        if gate is not None and gate.match == match.lower():
+            return
+        
+        self.focus_gate = None
+        if gate is not None:
+            gate.stop()
+        
+        if match:
+            gate = FocusGate(match, self._on_focus_changed)
+            if gate.start():
+                self.focus_gate = gate
+                log.info("Macros armed only while '%s' is focused (now %s)", match, 'focused' if gate.focused else 'not focused')
+    
+    def _on_focus_changed(self, focused):
+        if not focused:
+            for script_id, run in self.runs.items():
+                if script_id in LOOPING and run.active:
+                    run.active = False
+                    self._set_status(script_id, 'Ready')
+        self.focus_changed.emit(focused)
+    
+    def _dispatch(self, code, pressed):
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.clock_ns()
+        capture = self._capture
+        if capture is not None and pressed:
+            self._capture = None
+            capture(code)
+            return
+        # Presses outside the target window pass through; releases still end held macros
+        gate = self.focus_gate
+        if pressed and gate is not None and not gate.focused:
+            return
+        with self._dispatch_lock:
+            profile = self.profile
+            if pressed:
+                binding_id = profile.matcher.press(code, self.clock.now())
+            else:
+                binding_id = profile.matcher.release(code)
+        if binding_id:
+            handlers = profile.bindings.get(binding_id)
+            if handlers:
+                handlers[1 if pressed else 2]()
+        if profiler is not None:
+            profiler.span(DISPATCH, start_ns)
+    
+    def compile_profile(self, config, hotkeys=None, previous=None):
+        """Build every enabled script of a ProfileConfig without touching the running one.
+        
+        hotkeys maps profile names to bindings that switch to them. Scripts whose
+        bindings conflict are left out and reported in the result's errors. Scripts
+        configured exactly as in previous reuse its handlers, so they keep their state.
+        """
+        bindings = {}
+        scripts = []
+        errors = {}
+        configs = {}
+        
+        candidates = []
+        for profile_name, hotkey in (hotkeys or {}).items():
+            if hotkey:
+                handlers = (hotkey, lambda n=profile_name: self.switch_to(n), lambda: None)
+                candidates.append((f"hotkey {profile_name}", {('profile', profile_name): handlers}))
+        
+        for script in config.scripts:
+            script_id = script.script_id
+            configs[script_id] = script
+            if previous is not None and previous.configs.get(script_id) == script:
+                candidates.append((script_id, {binding_id: h for binding_id, h in previous.bindings.items()
+                                               if binding_id[0] == script_id}))
+            else:
+                prepare = getattr(self.backend, 'prepare', None)
+                if prepare is not None:
+                    try:
+                        prepare({key for op, value in script.timeline if op != 'wait'
+                                 for key in ([k for _, k in value] if op == 'send' else [value])})
+                    except ValueError as e:
+                        errors[script_id] = str(e)
+                        continue
+                script_bindings = self._script_bindings(script)
+                candidates.append((script_id, {(script_id, role): h for role, h in script_bindings.items()}))
+        
+        for label, new_bindings in candidates:
+            merged = {**bindings, **new_bindings}
+            try:
+                BindingMatcher({binding_id: h[0] for binding_id, h in merged.items()})
+            except BindingError as e:
+                errors[label] = str(e)
+                continue
+            bindings = merged
+            if label in SCRIPT_KEYBINDS:
+                scripts.append(label)
+        
+        configs = {script_id: script for script_id, script in configs.items() if script_id in scripts}
+        return CompiledProfile(config.name, bindings, scripts, errors, configs)
+    
+    def _script_bindings(self, script):
+        """{role: (binding, on_press, on_release)} of a ScriptConfig, with fresh handler state"""
+        if script.script_id in COMPOSITES:
+            return self._composite_bindings(script)
+        return getattr(self, f'_{script.script_id}_bindings')(script)
+    
+    def load_profiles(self, profiles):
+        """Precompile profiles so switching between them is a swap.
+        
+        profiles is a sequence of ProfileConfig, or {name: profile settings}.
+        """
+        if isinstance(profiles, dict):
+            profiles = [profile_config(name, profile) for name, profile in profiles.items()]
+        
+        hotkeys = {config.name: config.hotkey for config in profiles}
+        compiled = {}
+        for config in profiles:
+            previous = self.profile if config.name == self.profile.name else self.profiles.get(config.name)
+            compiled[config.name] = self.compile_profile(config, hotkeys, previous)
+        self.profiles = compiled
+        return self.profiles
+    
+    def apply_profiles(self, profiles, active):
+        """Recompile profiles and switch to active, touching only the scripts that changed.
+        
+        Returns ({script: 'started' | 'updated' | 'stopped'}, seconds taken).
+        """
+        start = time.perf_counter()
+        with self._state_lock:
+            self.load_profiles(profiles)
+            changes = self.switch_profile(self.profiles[active])
+        return changes, time.perf_counter() - start
+    
+    def switch_to(self, name):
+        profile = self.profiles.get(name)
+        if profile is None:
+            log.warning("Unknown profile: %s", name)
+            return False
+        if profile is not self.profile:
+            self.switch_profile(profile)
+        return True
+    
+    def switch_profile(self, profile):
+        """Make a compiled profile the live dispatch table without restarting the hooks.
+        
+        Scripts configured the same way in both profiles keep running; the
+        others are stopped or reset. Returns {script: change} for those.
+        """
+        with self._state_lock:
+            return self._switch_profile(profile)
+    
+    def _switch_profile(self, profile):
+        previous = self.profile
+        start_ns = time.perf_counter_ns()
+        with self._dispatch_lock:
+            # Keys held across the switch stay held, so their releases still arrive
+            profile.matcher.adopt(previous.matcher)
+            self.profile = profile
+        self.last_switch_ns = time.perf_counter_ns() - start_ns
+        
+        changes = {}
+        for script_id in set(previous.scripts) | set(profile.scripts):
+            run = self.runs.get(script_id)
+            if previous.configs.get(script_id) == profile.configs.get(script_id) and run and not run.stopped:
+                continue
+            if script_id not in previous.scripts:
+                changes[script_id] = 'started'
+            elif script_id in profile.scripts:
+                changes[script_id] = 'updated'
+            else:
+                changes[script_id] = 'stopped'
+            
+            if run:
+                run.active = False
+                run.stopped = True
+            if script_id in profile.scripts:
+                self.runs[script_id] = ScriptRun(script_id not in LOOPING)
+            else:
+                self.runs.pop(script_id, None)
+        
+        self.binding_errors = dict(profile.errors)
+        for label, error in profile.errors.items():
+            log.error("Not starting %s: %s", label, error)
+        
+        self._update_hooks(profile)
+        
+        for script_id in SCRIPT_KEYBINDS:
+            if script_id in profile.errors:
+                self._set_status(script_id, 'Error: binding conflict')
+            elif changes.get(script_id) == 'stopped':
+                self._set_status(script_id, 'Stopped')
+            elif script_id in changes:
+                self._set_status(script_id, 'Ready')
+        
+        if profile.name:
+            self.profile_changed.emit(profile.name)
+        return changes
+    
+    def _update_hooks(self, profile, buttons=False):
+        """Install the OS hooks profile needs and remove the others.
+        
+        Hooks are only kept while a script is armed: a profile without scripts
+        keeps the keyboard hook just for hotkeys that lead to a profile with
+        some. With nothing armed every hook is removed and the engine is idle.
+        """
+        with self._state_lock:
+            self._install_hooks(profile, buttons)
+    
+    def _install_hooks(self, profile, buttons):
+        self.debug = log.isEnabledFor(logging.DEBUG)
+        armed = bool(profile.scripts) or (bool(profile.bindings) and any(p.scripts for p in self.profiles.values()))
+        keyboard = armed or self._capture is not None
+        mouse = (armed and profile.uses_mouse) or buttons
+        
+        try:
+            if keyboard and self._keyboard_listener is None:
+                self._keyboard_listener = self.backend.keyboard_listener(self._on_raw_key)
+                if self._keyboard_listener:
+                    self.listeners.append(self._keyboard_listener)
+            
+            if mouse and self._mouse_listener is None:
+                self._mouse_listener = self.backend.mouse_listener(self._on_raw_button)
+                if self._mouse_listener:
+                    self.listeners.append(self._mouse_listener)
+        except Exception as e:
+            log.error("Listener start error: %s", e)
+            for script_id in profile.scripts:
+                self._set_status(script_id, 'Error')
+        
+        if not keyboard and self._keyboard_listener is not None:
+            self._stop_listener(self._keyboard_listener)
+            self._keyboard_listener = None
+        if not mouse and self._mouse_listener is not None:
+            self._stop_listener(self._mouse_listener)
+            self._mouse_listener = None
+        
+        self._set_idle(not (keyboard or mouse))
+    
+    def _stop_listener(self, listener):
+        try:
+            if hasattr(listener, 'running') and listener.running:
+                listener.stop()
+            self.listeners.remove(listener)
+            # A hook callback can remove its own listener, e.g. when a hotkey switches profiles
+            if hasattr(listener, 'join') and listener is not threading.current_thread():
+                listener.join(timeout=1.0)
+        except:
+            pass
+    
+    def hook_listener(self, hook):
+        return self._keyboard_listener if hook == 'keyboard' else self._mouse_listener
+    
+    def _restart_locked(self, restart, *args):
+        # A stuck hook callback may itself be waiting on the lock, so a restart only waits so long
+        if not self._state_lock.acquire(timeout=RESTART_LOCK_TIMEOUT):
+            return False
+        try:
+            return restart(*args)
+        finally:
+            self._state_lock.release()
+    
+    def restart_hook(self, hook, observed=None):
+        """Replace a dead or stuck listener with a new one, leaving the other hook alone.
+        
+        A stuck callback can't be interrupted, so its thread is not waited for.
+        Keys the hook had reported down are forgotten and the macros they held
+        are released, since their releases were lost. With observed, only
+        that listener is restarted, not one an apply or switch has put in its
+        place since. Returns False if nothing was restarted, or an apply or
+        switch in progress didn't finish in time.
+        """
+        return self._restart_locked(self._restart_hook, hook, observed)
+    
+    def _restart_hook(self, hook, observed):
+        listener = self.hook_listener(hook)
+        if listener is None or (observed is not None and listener is not observed):
+            return False
+        if hook == 'keyboard':
+            self._keyboard_listener = None
+        else:
+            self._mouse_listener = None
+        self.hook_busy[0 if hook == 'keyboard' else 1] = 0.0
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        
+        mouse = hook == 'mouse'
+        profile = self.profile
+        with self._dispatch_lock:
+            released = profile.matcher.forget(lambda code: key_name(code).startswith('mouse_') == mouse)
+        for binding_id in released:
+            handlers = profile.bindings.get(binding_id)
+            if handlers:
+                handlers[2]()
+        self._update_hooks(profile, self._capture is not None)
+        return True
+    
+    def restart_script(self, script_id, stalled_for=0.0):
+        """Give a running script fresh handlers and run state.
+        
+        The stuck worker is told to stop and left behind; a trigger after
+        this starts a new one even if the old one never returns. Returns False
+        if an apply or switch in progress didn't finish in time.
+        """
+        return self._restart_locked(self._restart_script, script_id, stalled_for)
+    
+    def _restart_script(self, script_id, stalled_for):
+        profile = self.profile
+        script = profile.configs.get(script_id)
+        if script is None:
+            # Switched out while stuck: its run is already stopped, so the worker only has to be abandoned
+            return True
+        run = self.runs.get(script_id)
+        if run:
+            run.active = False
+            run.stopped = True
+        fresh = {(script_id, role): h for role, h in self._script_bindings(script).items()}
+        with self._dispatch_lock:
+            # Same bindings, so the matcher stays valid; only the handlers are replaced
+            profile.bindings.update(fresh)
+        # Injecting the stuck worker's releases could block on the same call, so they are only forgotten
+        self.arbiter.forget(script.number)
+        self.runs[script_id] = ScriptRun(script_id not in LOOPING)
+        self._set_status(script_id, f'Ready (restarted after a {stalled_for:.1f} s stall)')
+        return True
+    
+    def set_output_limits(self, limits):
+        """Put an OutputLimits in front of the output path, or take the limiter out for None"""
+        from engine.limiter import OutputLimiter
+        
+        self.limiter = OutputLimiter(self.clock, limits) if limits is not None and limits.enabled else None
+        return self.limiter
+    
+    def start_watchdog(self, window):
+        """Watch hooks and workers, restarting whatever is stuck for longer than window seconds"""
+        from engine.watchdog import Watchdog
+        
+        self.stop_watchdog()
+        if window > 0:
+            self.watchdog = Watchdog(self, window)
+            self.watchdog.start()
+        return self.watchdog
+    
+    def stop_watchdog(self):
+        watchdog, self.watchdog = self.watchdog, None
+        if watchdog is not None:
+            watchdog.stop()
+        return watchdog
+    
+    def _set_idle(self, idle):
+        watchdog = self.watchdog
+        if watchdog is not None:
+            watchdog.set_idle(idle)
+        if idle != self.idle:
+            self.idle = idle
+            log.info("Engine idle, input hooks removed" if idle else "Engine armed, input hooks installed")
+            self.idle_changed.emit(idle)
+    
+    def stop_all_scripts(self):
+        with self._state_lock:
+            self._stop_all_scripts()
+    
+    def _stop_all_scripts(self):
+        for script_name in list(self.runs.keys()):
+            self.stop_script(script_name)
+        self.runs.clear()
+        
+        with self._dispatch_lock:
+            self.profile = CompiledProfile('', {}, [], {})
+        self._keyboard_listener = None
+        self._mouse_listener = None
+        
+        for listener in self.listeners[:]:
+            self._stop_listener(listener)
+        
+        left = self.join_workers()
+        if left:
+            log.warning("%d worker thread(s) still running after stopping all scripts", left)
+        else:
+            self.arbiter.clear()
+        self._set_idle(True)
+    
+    def stop_script(self, script_name):
+        run = self.runs.get(script_name)
+        if run:
+            run.active = False
+            run.stopped = True
+        
+        self._set_status(script_name, "Stopped")
+    
+    def start_enabled(self, keybinds, script_states):
+        """Start every enabled script and return how many were started"""
+        name = self.profile.name
+        config = profile_config(name, {'keybinds': keybinds, 'script_states': script_states, 'timings': self.timings})
+        profile = self.compile_profile(config, previous=self.profile)
+        if name in self.profiles:
+            self.profiles[name] = profile
+        self.switch_profile(profile)
+        return len(profile.scripts)
+    
+    def _spam_macro_bindings(self, script):
+        timeline = script.timeline
+        number = script.number
+        toggle_key = script.trigger
+        run_timeline = self._run_timeline
+        
+        def sequence_loop(run):
+            while run.active:
+                try:
+                    run_timeline(timeline, number)
+                except Exception as e:
+                    log.error("Sequence execution error: %s", e)
+                    self.clock.sleep(0.001)
+        
+        def on_press():
+            try:
+                run = self.runs.get('spam_macro')
+                if run and not run.stopped and not run.active:
+                    run.active = True
+                    self._record(trace.TRIGGER, toggle_key, number)
+                    self._set_status('spam_macro', f'Running (Hold {toggle_key})')
+                    self._spawn(number, lambda: sequence_loop(run))
+            except Exception as e:
+                log.error("Key press error: %s", e)
+        
+        def on_release():
+            try:
+                run = self.runs.get('spam_macro')
+                if run and run.active:
+                    run.active = False
+                    self._record(trace.STOP, toggle_key, number)
+                    self._set_status('spam_macro', 'Ready')
+            except Exception as e:
+                log.error("Key release error: %s", e)
+        
+        return {'toggle_button': (toggle_key, on_press, on_release)}
+    
+    def _auto_pullout_bindings(self, script):
+        timeline = script.timeline
+        number = script.number
+        edit_key = script.trigger
+        edit_held = False
+        
+        def click_slot():
+            try:
+                self._run_timeline(timeline, number)
+            except Exception as e:
+                log.error("Slot click error: %s", e)
+        
+        def on_press():
+            nonlocal edit_held
+            try:
+                run = self.runs.get('auto_pullout')
+                if run and not run.stopped and not edit_held:
+                    edit_held = True
+                    self._set_status('auto_pullout', 'Edit held - waiting for release')
+            except Exception as e:
+                log.error("Auto pullout press error: %s", e)
+        
+        def on_release():
+            nonlocal edit_held
+            try:
+                if edit_held:
+                    edit_held = False
+                    self._record(trace.TRIGGER, edit_key, number)
+                    self._spawn(number, click_slot)
+                    self._set_status('auto_pullout', 'Ready')
+            except Exception as e:
+                log.error("Auto pullout release error: %s", e)
+        
+        return {'edit_key': (edit_key, on_press, on_release)}
+    
+    def _auto_pickup_bindings(self, script):
+        timeline = script.timeline
+        number = script.number
+        pickup_key = script.key('pickup_key')
+        trigger_key = script.trigger
+        run_timeline = self._run_timeline
+        
+        def spam_pickup(run):
+            while run.active:
+                try:
+                    run_timeline(timeline, number)
+                except Exception as e:
+                    log.error("Pickup spam error: %s", e)
+                    break
+        
+        def start_spamming():
+            try:
+                run = self.runs.get('auto_pickup')
+                if run and not run.stopped and not run.active:
+                    run.active = True
+                    self._record(trace.TRIGGER, trigger_key, number)
+                    self._set_status('auto_pickup', f'Spamming {pickup_key}')
+                    self._spawn(number, lambda: spam_pickup(run))
+            except Exception as e:
+                log.error("Pickup trigger press error: %s", e)
+        
+        def stop_spamming():
+            try:
+                run = self.runs.get('auto_pickup')
+                if run and run.active:
+                    run.active = False
+                    self._record(trace.STOP, trigger_key, number)
+                    self._set_status('auto_pickup', 'Ready')
+            except Exception as e:
+                log.error("Pickup trigger release error: %s", e)
+        
+        return {'pickup_trigger': (trigger_key, start_spamming, stop_spamming)}
+    
+    def _wall_take_bindings(self, script):
+        timeline = script.timeline
+        number = script.number
+        trigger_key = script.trigger
+        running_sequence = False
+        
+        def execute_sequence():
+            nonlocal running_sequence
+            if running_sequence:
+                return
+            
+            running_sequence = True
+            self._set_status('wall_take', 'Executing sequence...')
+            
+            try:
+                self._run_timeline(timeline, number)
+            except Exception as e:
+                log.error("Wall sequence error: %s", e)
+            finally:
+                running_sequence = False
+                self._set_status('wall_take', 'Ready')
+        
+        def on_press():
+            try:
+                run = self.runs.get('wall_take')
+                if run and not run.stopped:
+                    self._record(trace.TRIGGER, trigger_key, number)
+                    self._spawn(number, execute_sequence)
+            except Exception as e:
+                log.error("Wall take press error: %s", e)
+        
+        return {'wall_trigger': (trigger_key, on_press, lambda: None)}
+    
+    def _composite_bindings(self, script):
+        """A composite runs its parts' timelines in one worker, one run at a time, like the wall take"""
+        script_id = script.script_id
+        timeline = script.timeline
+        number = script.number
+        trigger_key = script.trigger
+        running_sequence = False
+        
+        def execute_sequence():
+            nonlocal running_sequence
+            if running_sequence:
+                return
+            
+            running_sequence = True
+            self._set_status(script_id, 'Executing sequence...')
+            
+            try:
+                self._run_timeline(timeline, number)
+            except Exception as e:
+                log.error("Composite %s error: %s", script_id, e)
+            finally:
+                running_sequence = False
+                self._set_status(script_id, 'Ready')
+        
+        def on_press():
+            try:
+                run = self.runs.get(script_id)
+                if run and not run.stopped:
+                    self._record(trace.TRIGGER, trigger_key, number)
+                    self._spawn(number, execute_sequence)
+            except Exception as e:
+                log.error("Composite %s press error: %s", script_id, e)
+        
+        return {SCRIPT_TRIGGERS[script_id]: (trigger_key, on_press, lambda: None)}
\ No newline at end of file
@@ -0,0 +1,126 @@
+import time
+import heapq
+import threading
+
+
+class RealClock:
+    """Monotonic wall-clock time used during normal operation"""
+    
+    def now(self):
+        return time.perf_counter()
+    
+    def now_ns(self):
+        return time.perf_counter_ns()
+    
+    def sleep(self, seconds):
+        time.sleep(seconds)
+    
+    def sleep_until(self, deadline):
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def spawn(self, target, name=None):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+    
+    def join(self, thread, timeout=None):
+        thread.join(timeout)
+
+
+class VirtualClock:
+    """Deterministic clock that jumps straight to the next deadline.
+    
+    The clock counts the threads it is running: the thread that created it
+    and every thread started with spawn(). Once all of them are asleep, time
+    jumps to the earliest deadline and only that sleeper is woken, so a run
+    produces the same timestamps every time no matter how long it really takes.
+    Other threads may sleep and join too; they wait their turn like the
+    counted ones but never change the count.
+    """
+    
+    def __init__(self, start=0.0):
+        self._now_ns = int(start * 1e9)
+        self._cond = threading.Condition()
+        self._running = 1
+        self._sleepers = []
+        self._seq = 0
+        # Set in the creating thread and in every spawned one
+        self._local = threading.local()
+        self._local.counted = True
+    
+    def _counted(self):
+        return getattr(self._local, 'counted', False)
+    
+    def now(self):
+        return self._now_ns / 1e9
+    
+    def now_ns(self):
+        return self._now_ns
+    
+    def sleep(self, seconds):
+        self._sleep_until_ns(self._now_ns + int(round(seconds * 1e9)))
+    
+    def sleep_until(self, deadline):
+        self._sleep_until_ns(int(round(deadline * 1e9)))
+    
+    def _sleep_until_ns(self, deadline_ns):
+        with self._cond:
+            if deadline_ns <= self._now_ns:
+                return
+            
+            self._seq += 1
+            entry = [deadline_ns, self._seq, False]
+            heapq.heappush(self._sleepers, entry)
+            counted = self._counted()
+            if counted:
+                self._running -= 1
+                self._advance()
+            
+            while not entry[2]:
+                self._cond.wait()
+            if not counted:
+                # Woken as if it were counted, which it isn't
+                self._running -= 1
+                self._advance()
+    
+    def _advance(self):
+        # Called with the lock held
+        if self._running == 0 and self._sleepers:
+            entry = heapq.heappop(self._sleepers)
+            self._now_ns = max(self._now_ns, entry[0])
+            entry[2] = True
+            self._running += 1
+            self._cond.notify_all()
+    
+    def spawn(self, target, name=None):
+        def run():
+            self._local.counted = True
+            try:
+                target()
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._advance()
+        
+        # Count the thread before it starts so time can't skip past its first step
+        with self._cond:
+            self._running += 1
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+    
+    def join(self, thread, timeout=None):
+        """Wait for a spawned thread, counting the caller as asleep so virtual time can move on"""
+        if not self._counted():
+            thread.join(timeout)
+            return
+        with self._cond:
+            self._running -= 1
+            self._advance()
+        try:
+            thread.join(timeout)
+        finally:
+            with self._cond:
+                self._running += 1
\ No newline at end of file
@@ -0,0 +1,161 @@
+from engine.settings import DEFAULT_KEYBINDS, migrate_settings, validate_settings, read_profiles
+from engine.timelines import merge_timings, compile_timeline, batch_steps, script_timings
+from engine.trace import SCRIPT_NUMBERS
+from engine.accounting import DEFAULT_CPU_BUDGET
+from engine.watchdog import DEFAULT_WINDOW
+from engine.limiter import DEFAULT_BURST, DEFAULT_MAX_DELAY
+
+
+# Keybinds each script reads, and the one that triggers it
+SCRIPT_KEYBINDS = {
+    'spam_macro': ('edit_key', 'secondary_edit_key', 'toggle_button'),
+    'auto_pullout': ('edit_key', 'weapon_slot'),
+    'auto_pickup': ('pickup_key', 'pickup_trigger'),
+    'wall_take': ('wall_button', 'wall_trigger'),
+    'wall_pullout': ('wall_button', 'weapon_slot', 'wall_pullout_trigger')
+}
+
+SCRIPT_TRIGGERS = {
+    'spam_macro': 'toggle_button',
+    'auto_pullout': 'edit_key',
+    'auto_pickup': 'pickup_trigger',
+    'wall_take': 'wall_trigger',
+    'wall_pullout': 'wall_pullout_trigger'
+}
+
+
+class Frozen:
+    """Base for immutable slotted config objects, compared by value"""
+    
+    __slots__ = ()
+    
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+    
+    def __hash__(self):
+        return hash(self._values())
+    
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class ScriptConfig(Frozen):
+    """One enabled script with its keys resolved and its timeline compiled.
+    
+    keys holds the script's other keybinds and timings its delays, both as
+    sorted (name, value) tuples; number is the script's trace number, so
+    workers can tag events without a lookup.
+    """
+    
+    __slots__ = ('script_id', 'number', 'trigger', 'keys', 'timings', 'timeline')
+    
+    def key(self, role):
+        for name, value in self.keys:
+            if name == role:
+                return value
+        raise KeyError(role)
+
+
+class ProfileConfig(Frozen):
+    __slots__ = ('name', 'hotkey', 'scripts')
+    
+    def script(self, script_id):
+        for script in self.scripts:
+            if script.script_id == script_id:
+                return script
+        return None
+
+
+class RateLimit(Frozen):
+    __slots__ = ('rate', 'burst')
+
+
+class OutputLimits(Frozen):
+    """Global output rate limit, with per-script limits as sorted (script, RateLimit) pairs"""
+    
+    __slots__ = ('rate', 'burst', 'policy', 'max_delay', 'scripts')
+    
+    @property
+    def enabled(self):
+        return bool(self.rate) or any(limit.rate for _, limit in self.scripts)
+
+
+class Config(Frozen):
+    __slots__ = ('version', 'active', 'profiles', 'cpu_budget', 'focus_window', 'backend', 'priorities',
+                 'watchdog_window', 'output_limits')
+    
+    def profile(self, name):
+        for profile in self.profiles:
+            if profile.name == name:
+                return profile
+        raise KeyError(name)
+
+
+def script_config(script_id, keybinds, timings):
+    trigger_role = SCRIPT_TRIGGERS[script_id]
+    keys = {role: keybinds[role] for role in SCRIPT_KEYBINDS[script_id] if role != trigger_role}
+    return ScriptConfig(
+        script_id=script_id,
+        number=SCRIPT_NUMBERS[script_id],
+        trigger=keybinds[trigger_role],
+        keys=tuple(sorted(keys.items())),
+        timings=tuple(sorted(script_timings(script_id, timings).items())),
+        timeline=batch_steps(compile_timeline(script_id, keys, timings))
+    )
+
+
+def profile_config(name, profile):
+    """Freeze one profile's settings, as returned by read_profiles"""
+    keybinds = {**DEFAULT_KEYBINDS, **profile.get('keybinds', {})}
+    timings = merge_timings(profile.get('timings'))
+    scripts = tuple(script_config(script_id, keybinds, timings) for script_id in SCRIPT_KEYBINDS
+                    if profile.get('script_states', {}).get(script_id))
+    return ProfileConfig(name=name, hotkey=str(profile.get('hotkey', '')).lower().strip(), scripts=scripts)
+
+
+def output_limits(settings):
+    """Freeze the output_limits section of validated settings"""
+    section = settings.get('output_limits', {})
+    
+    def rate_limit(values):
+        return RateLimit(rate=float(values.get('rate', 0)), burst=int(values.get('burst', DEFAULT_BURST)))
+    
+    return OutputLimits(
+        rate=float(section.get('rate', 0)),
+        burst=int(section.get('burst', DEFAULT_BURST)),
+        policy=section.get('policy', 'delay'),
+        max_delay=float(section.get('max_delay', DEFAULT_MAX_DELAY)),
+        scripts=tuple(sorted((script_id, rate_limit(values)) for script_id, values in section.get('scripts', {}).items()))
+    )
+
+
+def load_config(settings):
+    """Migrate, validate and freeze a settings dict; raises ValueError if it is invalid"""
+    settings = migrate_settings(settings)
+    validate_settings(settings)
+    profiles, active = read_profiles(settings)
+    return Config(
+        version=settings['version'],
+        active=active,
+        profiles=tuple(profile_config(name, profile) for name, profile in profiles.items()),
+        cpu_budget=float(settings.get('cpu_budget', DEFAULT_CPU_BUDGET)),
+        focus_window=settings.get('focus_window', '').strip(),
+        backend=settings.get('backend', 'pynput'),
+        priorities=tuple(sorted(settings.get('script_priorities', {}).items())),
+        watchdog_window=float(settings.get('watchdog_window', DEFAULT_WINDOW)),
+        output_limits=output_limits(settings)
+    )
\ No newline at end of file
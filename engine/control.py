@@ -0,0 +1,324 @@
+import os
+import json
+import time
+import stat
+import socket
+import inspect
+import logging
+import tempfile
+import threading
+
+from engine.bindings import parse_binding
+from engine.config import SCRIPT_KEYBINDS, profile_config
+from engine.settings import DEFAULT_KEYBINDS
+
+
+log = logging.getLogger(__name__)
+
+
+# Longest command line a client may send
+MAX_LINE = 4096
+
+
+def default_socket_path():
+    """Per-user socket path: in $XDG_RUNTIME_DIR when there is one, else in the temp directory"""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, 'keybind-manager.sock')
+    return os.path.join(tempfile.gettempdir(), f'keybind-manager-{os.getuid()}.sock')
+
+
+class CommandError(Exception):
+    pass
+
+
+class Controller:
+    """Runs control commands against a ScriptBot and the profiles it was applied from.
+    
+    profiles maps names to profile settings, as returned by read_profiles;
+    enable, disable and bind edit the active one in place and reapply, so
+    only the script they touch is restarted. on_change(), if given, is
+    called after every command that changed a profile or switched to one.
+    """
+    
+    def __init__(self, bot, profiles, active, on_change=None):
+        self.bot = bot
+        self.profiles = profiles
+        self.active = active
+        self.on_change = on_change
+        # Commands from several connections, and settings reloads, apply one at a time
+        self.lock = threading.Lock()
+        self.commands = {
+            'ping': self.ping,
+            'enable': self.enable,
+            'disable': self.disable,
+            'bind': self.bind,
+            'profile': self.profile,
+            'stats': self.stats
+        }
+    
+    def execute(self, line):
+        """Reply line for a command line: 'ok [result]' or 'error message'"""
+        words = line.split()
+        if not words:
+            return "error empty command"
+        command = self.commands.get(words[0].lower())
+        if command is None:
+            return f"error unknown command '{words[0]}' (choose from {', '.join(self.commands)})"
+        try:
+            inspect.signature(command).bind(*words[1:])
+        except TypeError:
+            return f"error wrong number of arguments for '{words[0]}'"
+        
+        try:
+            with self.lock:
+                result = command(*words[1:])
+        except (CommandError, ValueError) as e:
+            return f"error {e}"
+        except Exception as e:
+            log.error("Control command '%s' failed: %s", line, e)
+            return f"error {e}"
+        return f"ok {result}" if result else "ok"
+    
+    def _active(self):
+        # A profile hotkey may have switched the bot since the last command
+        name = self.bot.profile.name
+        if name in self.profiles:
+            self.active = name
+        return self.active
+    
+    def _apply(self, active=None):
+        self.active = active or self._active()
+        changes, elapsed = self.bot.apply_profiles(self.profiles, self.active)
+        if self.on_change:
+            self.on_change()
+        errors = [error for script_id, error in self.bot.binding_errors.items() if script_id in changes]
+        if errors:
+            raise CommandError('; '.join(errors))
+        return f"{elapsed * 1e6:.0f}us"
+    
+    def _edit(self, section, key, value, touched):
+        """Set profile[section][key] and apply, unless that would leave a script out.
+        
+        The edited profile is compiled first without switching to it. The edit
+        is undone and refused if a script in touched, or one that had no
+        binding error, would be left out for a conflict: conflicts are settled
+        in script order, so applying could otherwise evict a running script.
+        """
+        active = self._active()
+        entries = self.profiles[active][section]
+        missing = object()
+        old = entries.get(key, missing)
+        entries[key] = value
+        try:
+            configs = {name: profile_config(name, profile) for name, profile in self.profiles.items()}
+            hotkeys = {name: config.hotkey for name, config in configs.items()}
+            compiled = self.bot.compile_profile(configs[active], hotkeys, self.bot.profiles.get(active))
+            errors = [error for label, error in compiled.errors.items()
+                      if label in touched or label not in self.bot.binding_errors]
+            if errors:
+                raise CommandError('; '.join(errors))
+        except Exception:
+            if old is missing:
+                del entries[key]
+            else:
+                entries[key] = old
+            raise
+        return self._apply()
+    
+    def _script(self, script_id):
+        if script_id not in SCRIPT_KEYBINDS:
+            raise CommandError(f"unknown script '{script_id}'")
+        return script_id
+    
+    def ping(self):
+        return "pong"
+    
+    def enable(self, script_id):
+        return self._edit('script_states', self._script(script_id), True, {script_id})
+    
+    def disable(self, script_id):
+        self.profiles[self._active()]['script_states'][self._script(script_id)] = False
+        return self._apply()
+    
+    def bind(self, role, *binding):
+        if role not in DEFAULT_KEYBINDS:
+            raise CommandError(f"unknown keybind '{role}'")
+        value = ' '.join(binding).lower().strip()
+        parse_binding(value)
+        return self._edit('keybinds', role, value, {script_id for script_id, roles in SCRIPT_KEYBINDS.items()
+                                                    if role in roles})
+    
+    def profile(self, name):
+        if name not in self.profiles:
+            raise CommandError(f"unknown profile '{name}'")
+        # Profiles compiled by the last apply switch without recompiling
+        if name in self.bot.profiles:
+            self.bot.switch_to(name)
+            self.active = name
+            if self.on_change:
+                self.on_change()
+            return f"{self.bot.last_switch_ns / 1000:.0f}us"
+        return self._apply(name)
+    
+    def stats(self):
+        snapshot = self.bot.snapshot()
+        snapshot['conflicts'] = self.bot.arbiter.conflicts()
+        limiter = self.bot.limiter
+        snapshot['limited'] = limiter.counts() if limiter is not None else None
+        watchdog = self.bot.watchdog
+        snapshot['watchdog'] = watchdog.snapshot() if watchdog is not None else None
+        snapshot['usage'] = {script_id: {'cpu': round(cpu, 6), 'wakeups': wakeups, 'threads': threads}
+                             for script_id, (cpu, wakeups, threads) in self.bot.accounting.totals().items()}
+        return json.dumps(snapshot, separators=(',', ':'))
+
+
+class ControlServer:
+    """Serves a Controller on a Unix domain socket.
+    
+    The protocol is one command per line and one reply line per command, so
+    a client can keep a connection open and send commands back to back. The
+    socket is only accessible to the user running the engine.
+    """
+    
+    def __init__(self, path, execute):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix domain sockets are not available on this platform")
+        self.path = path
+        self.execute = execute
+        self._socket = None
+        self._thread = None
+        self._connections = set()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        self._remove_stale()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Created 0600 from the start, so no other user can connect in between
+        umask = os.umask(0o177)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        server.listen(8)
+        self._socket = server
+        self._thread = threading.Thread(target=self._accept, args=(server,), name='control-accept', daemon=True)
+        self._thread.start()
+        return self.path
+    
+    def _remove_stale(self):
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        # Only ever unlink a socket, so a mistyped path can't delete a file
+        if not stat.S_ISSOCK(mode):
+            raise RuntimeError(f"{self.path} exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+        else:
+            raise RuntimeError(f"another engine is already listening on {self.path}")
+        finally:
+            probe.close()
+    
+    def _accept(self, server):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._connections.add(conn)
+            threading.Thread(target=self._serve, args=(conn,), name='control-client', daemon=True).start()
+    
+    def _serve(self, conn):
+        buffer = b''
+        try:
+            while True:
+                data = conn.recv(MAX_LINE)
+                if not data:
+                    return
+                buffer += data
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    reply = self.execute(line.decode('utf-8', 'replace'))
+                    conn.sendall(reply.encode('utf-8') + b'\n')
+                if len(buffer) > MAX_LINE:
+                    conn.sendall(b"error command too long\n")
+                    return
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+    
+    def stop(self):
+        server, self._socket = self._socket, None
+        if server is None:
+            return
+        # shutdown wakes the accept thread; closing alone doesn't on Linux
+        try:
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._thread.join(timeout=1.0)
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class ControlClient:
+    """One connection to a ControlServer, for sending commands back to back"""
+    
+    def __init__(self, path=None, timeout=2.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path or default_socket_path())
+        self._buffer = b''
+    
+    def send(self, line):
+        """Send one command and return (ok, reply text)"""
+        self._socket.sendall(line.strip().encode('utf-8') + b'\n')
+        while b'\n' not in self._buffer:
+            data = self._socket.recv(65536)
+            if not data:
+                raise ConnectionError("the engine closed the connection")
+            self._buffer += data
+        reply, self._buffer = self._buffer.split(b'\n', 1)
+        status, _, text = reply.decode('utf-8').partition(' ')
+        return status == 'ok', text
+    
+    def close(self):
+        self._socket.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def round_trips(client, line, count):
+    """Sorted round-trip times in nanoseconds of sending line count times over one connection"""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        ok, reply = client.send(line)
+        times.append(time.perf_counter_ns() - start)
+        if not ok:
+            raise CommandError(reply)
+    times.sort()
+    return times
\ No newline at end of file
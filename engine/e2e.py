@@ -0,0 +1,265 @@
+import os
+import time
+import select
+import logging
+import threading
+import subprocess
+
+from engine.bindings import parse_binding, key_name
+from engine.config import SCRIPT_KEYBINDS, profile_config
+from engine.settings import make_profile
+from engine.timelines import TRIGGER_ROLES, first_output
+
+
+log = logging.getLogger(__name__)
+
+
+class Xvfb:
+    """A private Xvfb server for the length of a with block.
+    
+    Xvfb picks a free display number and reports it through -displayfd once
+    it accepts connections; it only listens on its Unix socket, so nothing
+    needs a network.
+    """
+    
+    def __init__(self, executable='Xvfb', timeout=10.0):
+        self.executable = executable
+        self.timeout = timeout
+        self.process = None
+        self.display = None
+    
+    def __enter__(self):
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [self.executable, '-displayfd', str(write_fd), '-nolisten', 'tcp', '-screen', '0', '640x480x24',
+                 '+extension', 'XTEST', '+extension', 'RECORD'],
+                pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            os.close(read_fd)
+            raise RuntimeError(f"'{self.executable}' not found, install Xvfb (e.g. the xvfb package)")
+        finally:
+            os.close(write_fd)
+        
+        output = b''
+        try:
+            deadline = time.monotonic() + self.timeout
+            while not output.endswith(b'\n'):
+                ready, _, _ = select.select([read_fd], [], [], max(0.0, deadline - time.monotonic()))
+                chunk = os.read(read_fd, 16) if ready else b''
+                if not chunk:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError("Xvfb did not start")
+                output += chunk
+        finally:
+            os.close(read_fd)
+        
+        self.display = f":{int(output)}"
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+
+class EventTap:
+    """Timestamps every key and button event the X server processes, through XRecord.
+    
+    Triggers injected by the harness and the macro's output go through the
+    same server and the same tap, so their difference is the end-to-end
+    latency without any bias from the clock or the record connection.
+    """
+    
+    def __init__(self, display_name):
+        from Xlib import X, display
+        from Xlib.ext import record
+        from Xlib.protocol import rq
+        
+        self._record = record
+        self._field = rq.EventField(None)
+        self._control = display.Display(display_name)
+        if not self._control.has_extension('RECORD'):
+            self._control.close()
+            raise RuntimeError("the X server has no RECORD extension")
+        self._data = display.Display(display_name)
+        
+        # KeyPress through ButtonRelease: device events without pointer motion
+        self._context = self._control.record_create_context(0, [record.AllClients], [{
+            'core_requests': (0, 0), 'core_replies': (0, 0),
+            'ext_requests': (0, 0, 0, 0), 'ext_replies': (0, 0, 0, 0),
+            'delivered_events': (0, 0), 'device_events': (X.KeyPress, X.ButtonRelease),
+            'errors': (0, 0), 'client_started': False, 'client_died': False
+        }])
+        self._events = []
+        self._cond = threading.Condition()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._data.record_enable_context, args=(self._context, self._on_reply),
+                                        name='e2e-tap', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._control.record_disable_context(self._context)
+        self._control.flush()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._control.record_free_context(self._context)
+        self._control.close()
+        self._data.close()
+    
+    def _on_reply(self, reply):
+        now = time.perf_counter_ns()
+        if reply.category != self._record.FromServer or reply.client_swapped:
+            return
+        
+        events = []
+        data = reply.data
+        while data:
+            event, data = self._field.parse_binary_value(data, self._data.display, None, None)
+            events.append((now, event.type, event.detail))
+        with self._cond:
+            self._events.extend(events)
+            self._cond.notify_all()
+    
+    def mark(self):
+        with self._cond:
+            return len(self._events)
+    
+    def wait_for(self, event_type, detail, since, timeout):
+        """(index, timestamp) of the first matching event at or after index since, or None"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for index in range(since, len(self._events)):
+                    t_ns, seen_type, seen_detail = self._events[index]
+                    if seen_type == event_type and seen_detail == detail:
+                        return index, t_ns
+                since = len(self._events)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    return None
+
+
+def measure_script(bot, tap, injector, profile, script_id, iterations, timeout=1.0):
+    """End-to-end latencies in nanoseconds from each injected trigger to the macro's first output.
+    
+    Returns (latencies, timeouts, scheduled delay in seconds).
+    """
+    profile = make_profile({**profile, 'script_states': {script_id: True}})
+    script = profile_config('e2e', profile).script(script_id)
+    steps, _ = parse_binding(script.trigger)
+    if len(steps) > 1:
+        raise ValueError(f"sequence trigger '{script.trigger}' is not supported")
+    trigger, held = steps[0]
+    held = [key_name(code) for code in sorted(held)]
+    trigger = key_name(trigger)
+    on_release = script_id in TRIGGER_ROLES
+    
+    op, output, delay = first_output(script.timeline)
+    output_type, output_detail = injector.x_event(op, output)
+    trigger_type, trigger_detail = injector.x_event('release' if on_release else 'press', trigger)
+    
+    bot.apply_profiles({'e2e': profile}, 'e2e')
+    time.sleep(0.3)
+    
+    latencies = []
+    timeouts = 0
+    for _ in range(iterations):
+        since = tap.mark()
+        injector.send([('press', key) for key in held + [trigger]])
+        if on_release:
+            injector.release(trigger)
+        
+        seen = tap.wait_for(trigger_type, trigger_detail, since, timeout)
+        output_seen = seen and tap.wait_for(output_type, output_detail, seen[0] + 1, timeout + delay)
+        if output_seen:
+            latencies.append(output_seen[1] - seen[1])
+        else:
+            timeouts += 1
+        
+        releases = held[::-1] if on_release else [trigger] + held[::-1]
+        injector.send([('release', key) for key in releases])
+        # Let the macro run out before the next trigger
+        deadline = time.monotonic() + timeout + sum(value for op, value in script.timeline if op == 'wait')
+        while bot.accounting.totals()[script_id][2] and time.monotonic() < deadline:
+            time.sleep(0.005)
+        time.sleep(0.02)
+    
+    if timeouts:
+        log.warning("%s: %d of %d triggers got no output within %.2f s", script_id, timeouts, iterations, timeout + delay)
+    return latencies, timeouts, delay
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def format_latencies(results):
+    """Table of {script: (latencies, timeouts, delay)} in milliseconds"""
+    lines = [f"{'Script':14} {'Runs':>6} {'Lost':>5} {'Delay':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8}"]
+    for script_id, (latencies, timeouts, delay) in results.items():
+        values = sorted(latencies)
+        if values:
+            stats = ' '.join(f"{percentile(values, q) / 1e6:8.3f}" for q in (50, 90, 99)) + f" {values[-1] / 1e6:8.3f}"
+        else:
+            stats = ' '.join(f"{'-':>8}" for _ in range(4))
+        lines.append(f"{script_id:14} {len(values):6} {timeouts:5} {delay * 1000:8.1f} {stats}")
+    return "\n".join(lines)
+
+
+def run_e2e(profile, scripts=None, iterations=100, backend='pynput', display=None, xvfb='Xvfb', timeout=1.0):
+    """Run each macro under a real X server and return {script: (latencies, timeouts, delay)}.
+    
+    Starts a private Xvfb unless display names one. Triggers are injected
+    through XTest, and both triggers and output are timestamped by XRecord.
+    """
+    scripts = scripts or list(SCRIPT_KEYBINDS)
+    server = Xvfb(xvfb) if display is None else None
+    if server is not None:
+        display = server.__enter__().display
+    
+    # pynput connects to $DISPLAY, so point it at the test server before it is imported
+    previous_display = os.environ.get('DISPLAY')
+    os.environ['DISPLAY'] = display
+    tap = None
+    bot = None
+    try:
+        from engine.bot import ScriptBot
+        from engine.backends import XTestBackend, make_backend
+        
+        tap = EventTap(display)
+        tap.start()
+        injector = XTestBackend(display)
+        bot = ScriptBot(make_backend(backend))
+        bot.set_focus_window('')
+        
+        results = {}
+        for script_id in scripts:
+            log.info("Measuring %s (%d runs)", script_id, iterations)
+            try:
+                results[script_id] = measure_script(bot, tap, injector, profile, script_id, iterations, timeout)
+            except ValueError as e:
+                log.warning("Skipping %s: %s", script_id, e)
+        return results
+    finally:
+        if bot is not None:
+            bot.stop_all_scripts()
+            bot.apply_profiles({'e2e': make_profile()}, 'e2e')
+        if tap is not None:
+            tap.stop()
+        if previous_display is None:
+            os.environ.pop('DISPLAY', None)
+        else:
+            os.environ['DISPLAY'] = previous_display
+        if server is not None:
+            server.__exit__(None, None, None)
\ No newline at end of file
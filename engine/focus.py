@@ -0,0 +1,133 @@
+import os
+import select
+import threading
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+class FocusGate:
+    """Tracks whether the focused X11 window matches a window class or title.
+    
+    The root window's _NET_ACTIVE_WINDOW property is watched through
+    PropertyNotify events, and so is the active window's title, so nothing
+    polls. focused is a plain attribute the dispatcher reads on every press.
+    """
+    
+    def __init__(self, match, on_change=None, display_name=None):
+        self.match = match.lower().strip()
+        self.on_change = on_change
+        self.display_name = display_name
+        self.focused = True
+        self.window = ''
+        self._display = None
+        self._active_id = None
+        self._thread = None
+        self._wake = None
+    
+    def start(self):
+        """Start following focus; returns False where python-xlib or an X11 display is missing"""
+        try:
+            from Xlib import X, Xatom, display, error
+            self._display = display.Display(self.display_name)
+        except Exception as e:
+            log.warning("Focus gating needs python-xlib and an X11 display (%s), macros stay armed in every window", e)
+            return False
+        
+        self._X = X
+        self._xerrors = (error.BadWindow, error.BadMatch, error.BadValue)
+        # Windows can vanish between an event and our requests about them
+        self._display.set_error_handler(lambda *args: None)
+        self._root = self._display.screen().root
+        self._net_active_window = self._display.intern_atom('_NET_ACTIVE_WINDOW')
+        self._net_wm_name = self._display.intern_atom('_NET_WM_NAME')
+        self._utf8_string = self._display.intern_atom('UTF8_STRING')
+        self._name_atoms = (self._net_active_window, self._net_wm_name, Xatom.WM_NAME)
+        
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._update()
+        
+        self._wake = os.pipe()
+        self._thread = threading.Thread(target=self._run, name='focus-gate', daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        wake = self._wake
+        if wake:
+            try:
+                os.write(wake[1], b'\0')
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def _describe(self, window):
+        """WM_CLASS instance and class plus the title, as one lowercase string to match against"""
+        parts = []
+        try:
+            parts.extend(window.get_wm_class() or ())
+            title = window.get_full_property(self._net_wm_name, self._utf8_string)
+            if title:
+                value = title.value
+                parts.append(value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value))
+            else:
+                parts.append(window.get_wm_name() or '')
+        except self._xerrors:
+            pass
+        return ' '.join(str(part) for part in parts).lower()
+    
+    def _update(self):
+        X = self._X
+        prop = self._root.get_full_property(self._net_active_window, X.AnyPropertyType)
+        window_id = int(prop.value[0]) if prop is not None and len(prop.value) else 0
+        
+        if window_id != self._active_id:
+            try:
+                # Follow the title of the active window only, e.g. for browser tabs
+                if self._active_id:
+                    self._display.create_resource_object('window', self._active_id).change_attributes(
+                        event_mask=X.NoEventMask)
+                if window_id:
+                    self._display.create_resource_object('window', window_id).change_attributes(
+                        event_mask=X.PropertyChangeMask)
+            except self._xerrors:
+                pass
+            self._active_id = window_id
+        
+        self.window = self._describe(self._display.create_resource_object('window', window_id)) if window_id else ''
+        focused = bool(self.window) and self.match in self.window
+        self._display.flush()
+        
+        if focused != self.focused:
+            self.focused = focused
+            if self.on_change:
+                self.on_change(focused)
+    
+    def _run(self):
+        display = self._display
+        wake_fd = self._wake[0]
+        try:
+            while True:
+                # Replies to our own requests can bring events along, so drain the queue before blocking
+                changed = False
+                while display.pending_events():
+                    event = display.next_event()
+                    if event.type == self._X.PropertyNotify and event.atom in self._name_atoms:
+                        changed = True
+                if changed:
+                    self._update()
+                    continue
+                
+                ready, _, _ = select.select([display.fileno(), wake_fd], [], [])
+                if wake_fd in ready:
+                    break
+        except Exception as e:
+            log.error("Focus gate error: %s", e)
+        finally:
+            display.close()
+            for fd in self._wake:
+                os.close(fd)
+            self._wake = None
\ No newline at end of file
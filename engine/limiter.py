@@ -0,0 +1,104 @@
+import threading
+
+from engine.trace import SCRIPTS
+
+
+POLICIES = ('delay', 'drop')
+
+# Defaults for settings that leave them out; a rate of 0 means no limit
+DEFAULT_BURST = 20
+DEFAULT_MAX_DELAY = 0.05
+
+
+class TokenBucket:
+    """rate tokens per second, up to burst saved up; taking more than there are goes into debt"""
+    
+    __slots__ = ('rate', 'burst', 'tokens', 'last')
+    
+    def __init__(self, rate, burst, now):
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self.tokens = self.burst
+        self.last = now
+    
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+    
+    def wait(self, count):
+        """Seconds until count tokens are there, after refill()"""
+        return max(0.0, (count - self.tokens) / self.rate)
+
+
+class OutputLimiter:
+    """Token buckets in front of the output path: one global, and one per limited script.
+    
+    Limits count key and button presses; releases always pass, so nothing is
+    left held down. A press over a limit waits for its tokens under the
+    'delay' policy, unless that would take longer than max_delay, and is
+    dropped under 'drop' (a dropped press's release is dropped by the
+    arbiter, which never saw it go down). The global bucket holds back
+    every script alike, one-shot macros included.
+    """
+    
+    def __init__(self, clock, limits):
+        self.clock = clock
+        self.policy = limits.policy
+        self.max_delay = limits.max_delay
+        now = clock.now()
+        self._global = TokenBucket(limits.rate, limits.burst, now) if limits.rate else None
+        self._scripts = [None] * len(SCRIPTS)
+        for script_id, limit in limits.scripts:
+            if limit.rate and script_id in SCRIPTS:
+                self._scripts[SCRIPTS.index(script_id)] = TokenBucket(limit.rate, limit.burst, now)
+        self._lock = threading.Lock()
+        # Per script number: presses delayed, presses dropped, seconds waited
+        self._delayed = [0] * len(SCRIPTS)
+        self._dropped = [0] * len(SCRIPTS)
+        self._waited = [0.0] * len(SCRIPTS)
+    
+    def admit(self, number, count=1):
+        """Seconds script number must wait before injecting count presses, or None to drop them.
+        
+        The caller does the waiting, so it can tell the watchdog a throttled
+        worker isn't stuck.
+        """
+        now = self.clock.now()
+        with self._lock:
+            wait = 0.0
+            script_bucket = self._scripts[number]
+            if script_bucket is not None:
+                script_bucket.refill(now)
+                wait = script_bucket.wait(count)
+            global_bucket = self._global
+            if global_bucket is not None:
+                global_bucket.refill(now)
+                wait = max(wait, global_bucket.wait(count))
+            
+            if wait > 0 and (self.policy == 'drop' or wait > self.max_delay):
+                self._dropped[number] += count
+                return None
+            # Tokens are taken now, so presses that come in while this one waits queue up behind it
+            if script_bucket is not None:
+                script_bucket.tokens -= count
+            if global_bucket is not None:
+                global_bucket.tokens -= count
+            if wait > 0:
+                self._delayed[number] += count
+                self._waited[number] += wait
+        return wait
+    
+    def counts(self):
+        """{script: {'delayed', 'dropped', 'waited'}} for every script that was limited"""
+        with self._lock:
+            return {script_id: {'delayed': self._delayed[n], 'dropped': self._dropped[n],
+                                'waited': round(self._waited[n], 6)}
+                    for n, script_id in enumerate(SCRIPTS)
+                    if script_id and (self._delayed[n] or self._dropped[n])}
+
+
+def format_limited(counts):
+    lines = [f"{'Script':14} {'Delayed':>8} {'Dropped':>8} {'Waited s':>9}"]
+    for script_id, entry in counts.items():
+        lines.append(f"{script_id:14} {entry['delayed']:8} {entry['dropped']:8} {entry['waited']:9.3f}")
+    return "\n".join(lines)
\ No newline at end of file
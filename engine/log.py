@@ -0,0 +1,107 @@
+import sys
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Identical messages within this many seconds are counted instead of written
+DEFAULT_REPEAT_INTERVAL = 5.0
+# Messages remembered before the ones whose interval is over and that have no repeats are forgotten
+MAX_TRACKED = 1024
+
+_listener = None
+_handler = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Passes the first of a run of repeated messages per interval and counts the rest.
+    
+    Messages repeat when they come from the same logger at the same level and
+    read the same once formatted, so an error raised on every iteration of a
+    spam loop is written once every interval with the number of repeats it
+    stands for, while messages that only share a format string, such as the
+    same warning for two scripts, are all written. Debug records are never
+    limited.
+    """
+    
+    def __init__(self, interval=DEFAULT_REPEAT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()
+        # (logger, level, message) -> [time last written, repeats since]
+        self._seen = {}
+    
+    def filter(self, record):
+        if record.levelno <= logging.DEBUG:
+            return True
+        
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and record.created - entry[0] < self.interval:
+                entry[1] += 1
+                return False
+            repeats = entry[1] if entry is not None else 0
+            if entry is None and len(self._seen) >= MAX_TRACKED:
+                self._forget(record.created)
+            self._seen[key] = [record.created, 0]
+        
+        if repeats:
+            record.msg = f"{message} (repeated {repeats} more times)"
+            record.args = None
+        return True
+    
+    def _forget(self, now):
+        for key, (written, repeats) in list(self._seen.items()):
+            if not repeats and now - written >= self.interval:
+                del self._seen[key]
+    
+    def pending(self):
+        """[(level, message, repeats)] of messages whose repeats were not reported yet"""
+        with self._lock:
+            return [(level, message, entry[1]) for (_, level, message), entry in self._seen.items() if entry[1]]
+
+
+def setup_logging(level=logging.INFO, stream=None, interval=DEFAULT_REPEAT_INTERVAL):
+    """Send every log record through a queue to a writer thread.
+    
+    Callers, including OS hook callbacks and script workers, only format and
+    enqueue records; the console write happens on the writer thread.
+    """
+    global _listener, _handler
+    stop_logging()
+    
+    output = logging.StreamHandler(stream or sys.stdout)
+    if level <= logging.DEBUG:
+        output.setFormatter(logging.Formatter('%(relativeCreated)10.3f %(threadName)-14s %(name)s: %(message)s'))
+    else:
+        output.setFormatter(logging.Formatter('%(message)s'))
+    
+    records = queue.SimpleQueue()
+    _handler = QueueHandler(records)
+    _handler.addFilter(RateLimitFilter(interval))
+    _listener = QueueListener(records, output)
+    _listener.start()
+    
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+
+def stop_logging():
+    """Report repeats that were still being counted, write what is queued and stop the writer"""
+    global _listener, _handler
+    if _handler is None:
+        return
+    
+    for log_filter in _handler.filters:
+        for level, msg, repeats in log_filter.pending():
+            _handler.handle(logging.makeLogRecord(
+                {'name': 'log', 'levelno': level, 'levelname': logging.getLevelName(level),
+                 'msg': f"Last message repeated {repeats} more times: {msg}"}))
+    
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _listener = _handler = None
\ No newline at end of file
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import itertools
+import threading
+from array import array
+
+
+HOOK = 0
+DISPATCH = 1
+SCHEDULE = 2
+EMIT = 3
+
+SPAN_NAMES = ('hook', 'dispatch', 'schedule', 'emit')
+
+
+class Profiler:
+    """Preallocated ring of hot path spans.
+    
+    Callers keep a reference that is None while profiling is off, so the
+    disabled cost is a single `is not None` check per instrumented point.
+    """
+    
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.clock_ns = time.perf_counter_ns
+        self._names = array('B', bytes(capacity))
+        self._tags = array('B', bytes(capacity))
+        self._starts = array('q', bytes(8 * capacity))
+        self._durations = array('q', bytes(8 * capacity))
+        self._threads = array('q', bytes(8 * capacity))
+        self._counter = itertools.count()
+        self._recorded = 0
+    
+    def span(self, name, start_ns, tag=0):
+        end_ns = time.perf_counter_ns()
+        # next() on itertools.count is atomic under the GIL, so threads never share a slot
+        n = next(self._counter)
+        i = n % self.capacity
+        self._names[i] = name
+        self._tags[i] = tag
+        self._starts[i] = start_ns
+        self._durations[i] = end_ns - start_ns
+        self._threads[i] = threading.get_native_id()
+        self._recorded = n + 1
+    
+    def spans(self):
+        """Recorded spans, oldest first, as (name, tag, start_ns, duration_ns, thread id)"""
+        count = min(self._recorded, self.capacity)
+        first = self._recorded - count
+        result = []
+        for n in range(first, self._recorded):
+            i = n % self.capacity
+            result.append((SPAN_NAMES[self._names[i]], self._tags[i], self._starts[i],
+                           self._durations[i], self._threads[i]))
+        return result
+    
+    def summary(self):
+        """{span name: (count, mean us, max us)} over the spans in the ring"""
+        totals = {}
+        for name, _, _, duration, _ in self.spans():
+            count, total, longest = totals.get(name, (0, 0, 0))
+            totals[name] = (count + 1, total + duration, max(longest, duration))
+        return {name: (count, total / count / 1000.0, longest / 1000.0)
+                for name, (count, total, longest) in totals.items()}
+    
+    def chrome_trace(self, tag_names=()):
+        pid = os.getpid()
+        events = []
+        for name, tag, start, duration, tid in self.spans():
+            event = {'name': name, 'cat': 'engine', 'ph': 'X', 'ts': start / 1000.0,
+                     'dur': duration / 1000.0, 'pid': pid, 'tid': tid}
+            if tag and tag < len(tag_names):
+                event['args'] = {'script': tag_names[tag]}
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ns'}
+    
+    def perfetto_trace(self, tag_names=()):
+        """Spans encoded as a Perfetto protobuf trace (one track per thread)"""
+        pid = os.getpid()
+        spans = self.spans()
+        out = bytearray()
+        
+        for tid in sorted({span[4] for span in spans}):
+            thread = _field(1, _varint(pid)) + _field(2, _varint(tid))
+            descriptor = _field(1, _varint(tid)) + _bytes_field(4, thread)
+            out += _bytes_field(1, _bytes_field(60, descriptor) + _field(10, _varint(1)))
+        
+        # Slices on a track must be emitted in timestamp order with nested
+        # slices closing before their parents
+        edges = []
+        for name, tag, start, duration, tid in spans:
+            label = name if not tag or tag >= len(tag_names) else f"{name} {tag_names[tag]}"
+            edges.append((start, 1, -duration, 1, label, tid))
+            edges.append((start + duration, 0, -start, 2, label, tid))
+        edges.sort()
+        
+        for ts, _, _, kind, label, tid in edges:
+            event = _field(9, _varint(kind)) + _field(11, _varint(tid))
+            if kind == 1:
+                event += _bytes_field(23, label.encode('utf-8'))
+            packet = _field(8, _varint(ts)) + _bytes_field(11, event) + _field(10, _varint(1))
+            out += _bytes_field(1, packet)
+        
+        return bytes(out)
+    
+    def dump(self, path, tag_names=()):
+        """Write the ring to path: Perfetto protobuf for .pftrace/.perfetto-trace, else Chrome JSON"""
+        if str(path).endswith(('.pftrace', '.perfetto-trace')):
+            with open(path, 'wb') as f:
+                f.write(self.perfetto_trace(tag_names))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(tag_names), f)
+        return min(self._recorded, self.capacity)
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number, encoded_varint):
+    return _varint(number << 3) + encoded_varint
+
+
+def _bytes_field(number, data):
+    return _varint(number << 3 | 2) + _varint(len(data)) + data
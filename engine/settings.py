@@ -0,0 +1,249 @@
+import copy
+import json
+import hashlib
+from pathlib import Path
+
+from engine.bindings import parse_binding
+from engine.backends import BACKENDS
+from engine.limiter import POLICIES
+from engine.timelines import DEFAULT_TIMINGS
+from engine.watchdog import check_window
+
+
+SETTINGS_FILE = Path('keybind_manager_settings.json')
+
+DEFAULT_KEYBINDS = {
+    'edit_key': 'g',
+    'secondary_edit_key': 'v',
+    'toggle_button': 't',
+    'weapon_slot': '2',
+    'pickup_key': 'e',
+    'pickup_trigger': 'f',
+    'wall_button': 'p',
+    'wall_trigger': 'r',
+    'wall_pullout_trigger': 'h'
+}
+
+DEFAULT_SCRIPT_STATES = {
+    'spam_macro': False,
+    'auto_pullout': False,
+    'auto_pickup': False,
+    'wall_take': False,
+    'wall_pullout': False
+}
+
+DEFAULT_PROFILE = 'Default'
+
+SETTINGS_VERSION = '3.0.0'
+
+
+# Digest of the last content this process wrote to each settings file, so a
+# file watcher can tell its own writes from external edits
+_written = {}
+
+
+def settings_digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def was_written_here(path, text):
+    return _written.get(str(Path(path).resolve())) == settings_digest(text)
+
+
+def read_settings(path=SETTINGS_FILE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_settings(settings, path=SETTINGS_FILE):
+    """Write settings unless the file already holds exactly this content"""
+    path = Path(path)
+    text = json.dumps(settings, indent=2, ensure_ascii=False)
+    _written[str(path.resolve())] = settings_digest(text)
+    
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+
+def _validate_rate_limit(values, where):
+    if not isinstance(values, dict):
+        raise ValueError(f"{where} must be an object")
+    for name in ('rate', 'burst'):
+        value = values.get(name, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"{where}: '{name}' must be a non-negative number")
+
+
+def _validate_output_limits(limits):
+    _validate_rate_limit(limits, "'output_limits'")
+    if limits.get('policy', 'delay') not in POLICIES:
+        raise ValueError(f"'output_limits': 'policy' must be one of {', '.join(POLICIES)}")
+    max_delay = limits.get('max_delay', 0)
+    if isinstance(max_delay, bool) or not isinstance(max_delay, (int, float)) or max_delay < 0:
+        raise ValueError("'output_limits': 'max_delay' must be a non-negative number of seconds")
+    scripts = limits.get('scripts', {})
+    if not isinstance(scripts, dict):
+        raise ValueError("'output_limits': 'scripts' must map scripts to limits")
+    for script_id, values in scripts.items():
+        if script_id not in DEFAULT_SCRIPT_STATES:
+            raise ValueError(f"'output_limits': unknown script '{script_id}'")
+        _validate_rate_limit(values, f"'output_limits' for {script_id}")
+
+
+def validate_settings(settings):
+    """Check migrated settings before applying them; raises ValueError"""
+    if not isinstance(settings, dict):
+        raise ValueError("settings must be a JSON object")
+    
+    budget = settings.get('cpu_budget', 0)
+    if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget < 0:
+        raise ValueError("'cpu_budget' must be a non-negative number")
+    window = settings.get('watchdog_window', 0)
+    if isinstance(window, bool) or not isinstance(window, (int, float)):
+        raise ValueError("'watchdog_window' must be a number of seconds (0 turns the watchdog off)")
+    try:
+        check_window(window)
+    except ValueError as e:
+        raise ValueError(f"'watchdog_window' {e}")
+    if not isinstance(settings.get('focus_window', ''), str):
+        raise ValueError("'focus_window' must be a window class or title")
+    if not isinstance(settings.get('minimize_to_tray', True), bool):
+        raise ValueError("'minimize_to_tray' must be true or false")
+    if settings.get('backend', 'pynput') not in BACKENDS:
+        raise ValueError(f"'backend' must be one of {', '.join(BACKENDS)}")
+    priorities = settings.get('script_priorities', {})
+    if not isinstance(priorities, dict) or not all(
+            script_id in DEFAULT_SCRIPT_STATES and isinstance(value, int) and not isinstance(value, bool)
+            for script_id, value in priorities.items()):
+        raise ValueError("'script_priorities' must map known scripts to whole numbers")
+    if not isinstance(settings.get('control_socket', False), bool):
+        raise ValueError("'control_socket' must be true or false")
+    _validate_output_limits(settings.get('output_limits', {}))
+    
+    profiles = settings.get('profiles')
+    if not isinstance(profiles, dict) or not all(isinstance(p, dict) for p in profiles.values()):
+        raise ValueError("'profiles' must map profile names to objects")
+    
+    for name, profile in profiles.items():
+        where = f"profile '{name}': "
+        sections = {}
+        for section in ('keybinds', 'script_states', 'timings'):
+            # A section set to null is left out
+            value = profile.get(section)
+            value = {} if value is None else value
+            if not isinstance(value, dict):
+                raise ValueError(f"{where}'{section}' must be an object")
+            sections[section] = value
+        
+        for key, value in sections['keybinds'].items():
+            if key not in DEFAULT_KEYBINDS:
+                raise ValueError(f"{where}unknown keybind '{key}'")
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"{where}keybind '{key}' must be a key name")
+            parse_binding(value)
+        
+        for script_id, enabled in sections['script_states'].items():
+            if script_id not in DEFAULT_SCRIPT_STATES or not isinstance(enabled, bool):
+                raise ValueError(f"{where}script state '{script_id}' must be a known script set to true or false")
+        
+        for script_id, params in sections['timings'].items():
+            if script_id not in DEFAULT_TIMINGS or not isinstance(params, dict):
+                raise ValueError(f"{where}timings for '{script_id}' must be a known script mapped to delays")
+            for param, value in params.items():
+                if param not in DEFAULT_TIMINGS[script_id]:
+                    raise ValueError(f"{where}unknown timing '{script_id}.{param}'")
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                    raise ValueError(f"{where}timing '{script_id}.{param}' must be a non-negative number of seconds")
+        
+        hotkey = profile.get('hotkey', '')
+        if not isinstance(hotkey, str):
+            raise ValueError(f"{where}'hotkey' must be a string")
+        if hotkey.strip():
+            parse_binding(hotkey)
+
+
+def make_profile(data=None):
+    """A profile with every keybind and script state filled in"""
+    data = data or {}
+    return {
+        'keybinds': {**DEFAULT_KEYBINDS, **(data.get('keybinds') or {})},
+        'script_states': {**DEFAULT_SCRIPT_STATES, **(data.get('script_states') or {})},
+        'timings': data.get('timings'),
+        'hotkey': data.get('hotkey', '')
+    }
+
+
+def _add_profiles(settings):
+    """2.x kept a single set of keybinds; 3.0 keeps named profiles"""
+    if not settings.get('profiles'):
+        profile = {section: settings[section] for section in ('keybinds', 'script_states', 'timings')
+                   if section in settings}
+        settings['profiles'] = {DEFAULT_PROFILE: profile}
+        settings['active_profile'] = DEFAULT_PROFILE
+
+
+# (version, migration) pairs, applied in order to settings older than version
+MIGRATIONS = (
+    ('3.0.0', _add_profiles),
+)
+
+
+def _version_tuple(version):
+    try:
+        return tuple(int(part) for part in str(version).split('.'))
+    except ValueError:
+        return (0,)
+
+
+def migrate_settings(settings):
+    """A copy of settings brought up to SETTINGS_VERSION"""
+    settings = copy.deepcopy(settings)
+    if not isinstance(settings, dict):
+        return settings
+    
+    version = _version_tuple(settings.get('version', '2.0.0'))
+    for target, migrate in MIGRATIONS:
+        if version < _version_tuple(target):
+            migrate(settings)
+            settings['version'] = target
+            version = _version_tuple(target)
+    return settings
+
+
+def read_profiles(settings):
+    """Named profiles and the active profile name from a settings dict.
+    
+    Settings saved before profiles existed become a single default profile.
+    """
+    settings = migrate_settings(settings)
+    profiles = {name: make_profile(data) for name, data in settings.get('profiles', {}).items()}
+    if not profiles:
+        profiles[DEFAULT_PROFILE] = make_profile()
+    
+    active = settings.get('active_profile')
+    if active not in profiles:
+        active = next(iter(profiles))
+    return profiles, active
+
+
+def store_profiles(settings, profiles, active):
+    """Write profiles into a settings dict, mirroring the active one at the top level"""
+    settings['version'] = SETTINGS_VERSION
+    settings['profiles'] = profiles
+    settings['active_profile'] = active
+    settings['keybinds'] = profiles[active]['keybinds']
+    settings['script_states'] = profiles[active]['script_states']
+    if profiles[active].get('timings') is not None:
+        settings['timings'] = profiles[active]['timings']
+    return settings
\ No newline at end of file
@@ -0,0 +1,125 @@
+import copy
+import math
+import random
+import logging
+
+from engine.timelines import TIMELINES, LOOPING, TRIGGER_ROLES
+
+
+log = logging.getLogger(__name__)
+
+
+# How the game consumes injected input. The game samples the key state once
+# per tick; an action registers when a tick sees its key held. After an action
+# registers the game needs a settle time (mean, sd) before it accepts the next.
+RESPONSE_MODEL = {
+    'tick_rate': 60.0,
+    'input_latency': 0.004,
+    'input_jitter': 0.002,
+    'min_hold': {},
+    'settle': {
+        'edit_key': (0.06, 0.01),
+        'mouse_left': (0.03, 0.008),
+        'wall_button': (0.03, 0.008)
+    }
+}
+
+
+def merge_model(overrides):
+    model = copy.deepcopy(RESPONSE_MODEL)
+    
+    for name, value in (overrides or {}).items():
+        if name in ('min_hold', 'settle'):
+            model[name].update(value)
+        elif name in model:
+            model[name] = float(value)
+        else:
+            log.warning("Ignoring unknown response model field: %s", name)
+    
+    return model
+
+
+class GameSimulator:
+    """Simulated game consumer that reports which injected actions register"""
+    
+    def __init__(self, model=None, seed=0):
+        self.model = model or RESPONSE_MODEL
+        self.seed = seed
+        self.period = 1.0 / self.model['tick_rate']
+    
+    def _delay(self, rng):
+        return max(0.0, rng.gauss(self.model['input_latency'], self.model['input_jitter']))
+    
+    def _settle(self, rng, role):
+        mean, sd = self.model['settle'].get(role, (0.0, 0.0))
+        return max(0.0, rng.gauss(mean, sd)) if sd else mean
+    
+    def _first_tick(self, phase, t):
+        return phase + math.ceil((t - phase) / self.period) * self.period
+    
+    def _actions(self, script_id, timings, cycles):
+        """Expand a timeline into (role, press time, release time) tuples"""
+        params = timings[script_id]
+        actions = []
+        pressed = {}
+        t = 0.0
+        
+        for _ in range(cycles):
+            for op, arg in TIMELINES[script_id]:
+                if op == 'wait':
+                    t += params[arg]
+                elif op == 'press':
+                    pressed[arg] = t
+                else:
+                    actions.append((arg, pressed.pop(arg), t))
+        
+        return actions
+    
+    def run(self, script_id, timings, rng, cycles=1):
+        """Return (registered, total) actions for one run of the timeline"""
+        phase = rng.random() * self.period
+        ready_at = 0.0
+        released = {}
+        registered = 0
+        
+        trigger_role = TRIGGER_ROLES.get(script_id)
+        if trigger_role:
+            seen = self._first_tick(phase, self._delay(rng))
+            ready_at = seen + self._settle(rng, trigger_role)
+        
+        actions = self._actions(script_id, timings, cycles)
+        for role, press_t, release_t in actions:
+            press_t += self._delay(rng)
+            release_t = max(press_t, release_t + self._delay(rng))
+            
+            # A repeated key only registers again once a tick has seen it released
+            if role in released and self._first_tick(phase, released[role]) >= press_t:
+                released[role] = release_t
+                continue
+            released[role] = release_t
+            
+            start = max(press_t, ready_at) + self.model['min_hold'].get(role, 0.0)
+            tick = self._first_tick(phase, start)
+            if tick < release_t:
+                registered += 1
+                ready_at = tick + self._settle(rng, role)
+        
+        return registered, len(actions)
+    
+    def success_rate(self, script_id, timings, trials=400, cycles=20):
+        """Fraction of runs that fully register, or of registered actions for looping timelines"""
+        rng = random.Random(self.seed)
+        
+        if script_id in LOOPING:
+            registered = total = 0
+            for _ in range(trials):
+                ok, count = self.run(script_id, timings, rng, cycles)
+                registered += ok
+                total += count
+            return registered / total if total else 0.0
+        
+        successes = 0
+        for _ in range(trials):
+            ok, count = self.run(script_id, timings, rng)
+            successes += ok == count
+        return successes / trials
\ No newline at end of file
@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+import threading
+
+from engine.backends import NullBackend
+from engine.config import SCRIPT_KEYBINDS, SCRIPT_TRIGGERS
+from engine.settings import DEFAULT_KEYBINDS, make_profile
+from engine.timelines import DEFAULT_TIMINGS
+
+
+log = logging.getLogger(__name__)
+
+
+class _Listener(threading.Thread):
+    """Stands in for an OS hook: a thread that lives until stop(), like pynput's listeners"""
+    
+    def __init__(self):
+        super().__init__(name='soak-listener', daemon=True)
+        self._stopped = threading.Event()
+        self.running = False
+    
+    def run(self):
+        self.running = True
+        self._stopped.wait()
+        self.running = False
+    
+    def stop(self):
+        self._stopped.set()
+
+
+class SoakBackend(NullBackend):
+    """NullBackend whose hooks are real threads, so the listener lifecycle is exercised too"""
+    
+    def keyboard_listener(self, on_key):
+        listener = _Listener()
+        listener.start()
+        return listener
+    
+    def mouse_listener(self, on_button, buttons_only=True):
+        listener = _Listener()
+        listener.start()
+        return listener
+
+
+def rss_bytes():
+    """Resident set size of this process; Linux reads the current value, elsewhere the peak"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def soak_profiles(keybinds=None, delay=0.0001):
+    """One profile with every script enabled and every delay short.
+    
+    Workers still sleep, so looping scripts give up the GIL between steps, but
+    none of them lingers long enough to pile up.
+    """
+    timings = {script_id: {name: delay for name in params} for script_id, params in DEFAULT_TIMINGS.items()}
+    profile = make_profile({'keybinds': keybinds or {}, 'script_states': {s: True for s in SCRIPT_KEYBINDS},
+                            'timings': timings})
+    return {'soak': profile}
+
+
+def trigger_events(keybinds=None):
+    """(key, pressed) pairs that fire every script once"""
+    keybinds = {**DEFAULT_KEYBINDS, **(keybinds or {})}
+    events = []
+    for script_id, role in SCRIPT_TRIGGERS.items():
+        key = keybinds[role]
+        events.append((key, True))
+        events.append((key, False))
+    return events
+
+
+class Soak:
+    """Cycles apply/stop and drives synthetic triggers through a ScriptBot, sampling what it owns.
+    
+    A sample is taken every tenth of each phase. The engine is expected to
+    give back every worker and listener whenever it is stopped. Live threads
+    must stay within slack of the baseline at all times, and RSS must not grow
+    by more than max_rss_growth bytes past the warmup.
+    """
+    
+    def __init__(self, bot=None, thread_slack=32, max_rss_growth=32 * 1024 * 1024):
+        if bot is None:
+            from engine.bot import ScriptBot
+            bot = ScriptBot(SoakBackend())
+        self.bot = bot
+        self.thread_slack = thread_slack
+        self.max_rss_growth = max_rss_growth
+        self.profiles = soak_profiles()
+        self.samples = []
+        self.failures = []
+        self._baseline = None
+    
+    def sample(self, label):
+        counts = self.bot.resource_counts()
+        counts['rss'] = rss_bytes()
+        counts['label'] = label
+        self.samples.append(counts)
+        log.info("  %-24s threads %4d  workers %4d  listeners %2d  rss %7.1f MB",
+                 label, counts['threads'], counts['workers'], counts['listeners'], counts['rss'] / 1048576)
+        
+        if self._baseline is not None:
+            if counts['threads'] > self._baseline['threads'] + self.thread_slack:
+                self.failures.append(f"{label}: {counts['threads']} threads, "
+                                     f"baseline {self._baseline['threads']} + {self.thread_slack}")
+            if counts['rss'] - self._baseline['rss'] > self.max_rss_growth:
+                self.failures.append(f"{label}: RSS grew by {(counts['rss'] - self._baseline['rss']) / 1048576:.1f} MB")
+        return counts
+    
+    def expect_stopped(self, label):
+        counts = self.bot.resource_counts()
+        for resource in ('workers', 'listeners'):
+            if counts[resource]:
+                self.failures.append(f"{label}: {counts[resource]} {resource} left after stopping")
+    
+    def warm_up(self, cycles=100):
+        self.cycle(cycles, report=False)
+        self._baseline = self.sample("baseline")
+    
+    def cycle(self, cycles, report=True):
+        """Apply every script and stop them all, cycles times"""
+        bot = self.bot
+        every = max(1, cycles // 10)
+        for i in range(1, cycles + 1):
+            bot.apply_profiles(self.profiles, 'soak')
+            bot.stop_all_scripts()
+            self.expect_stopped(f"apply/stop {i}")
+            if report and i % every == 0:
+                self.sample(f"apply/stop {i}")
+    
+    def drive(self, events):
+        """Feed events synthetic trigger presses and releases to every script, then stop"""
+        bot = self.bot
+        bot.apply_profiles(self.profiles, 'soak')
+        pattern = trigger_events()
+        every = max(1, events // 10)
+        dispatch_key = bot.dispatch_key
+        
+        sent = 0
+        while sent < events:
+            for key, pressed in pattern:
+                dispatch_key(key, pressed)
+            sent += len(pattern)
+            if sent // every != (sent - len(pattern)) // every:
+                self.sample(f"{sent} events")
+        
+        bot.stop_all_scripts()
+        self.expect_stopped("after events")
+        self.sample("stopped")
+
+
+def run_soak(cycles=10000, events=2000000, thread_slack=32, max_rss_growth=32 * 1024 * 1024):
+    """Run a full soak and return the failures, an empty list when everything stayed bounded"""
+    soak = Soak(thread_slack=thread_slack, max_rss_growth=max_rss_growth)
+    start = time.perf_counter()
+    soak.warm_up()
+    log.info("Apply/stop cycles: %d", cycles)
+    soak.cycle(cycles)
+    log.info("Trigger events: %d", events)
+    soak.drive(events)
+    log.info("Soak finished in %.1f s", time.perf_counter() - start)
+    return soak.failures
\ No newline at end of file
@@ -0,0 +1,210 @@
+import time
+import random
+import bisect
+import string
+
+from engine.backends import NullBackend
+from engine.config import SCRIPT_KEYBINDS, SCRIPT_TRIGGERS, profile_config
+from engine.e2e import percentile
+from engine.settings import DEFAULT_KEYBINDS, make_profile
+from engine.timelines import DEFAULT_TIMINGS, TRIGGER_ROLES, first_output
+
+
+# Events later than this behind their schedule count as queued, as they would in the OS hook queue
+QUEUED_NS = 1000000
+
+
+class StressBackend(NullBackend):
+    """Keeps a timestamp for every injected event, so macro latency can be measured"""
+    
+    def __init__(self):
+        super().__init__()
+        self.injected = []
+    
+    def press(self, key):
+        self.injected.append((time.perf_counter_ns(), 'press', key))
+    
+    def release(self, key):
+        self.injected.append((time.perf_counter_ns(), 'release', key))
+    
+    def send(self, events):
+        now = time.perf_counter_ns()
+        self.injected.extend((now, op, key) for op, key in events)
+
+
+def typing_events(rng, keys):
+    """Words typed key by key, each followed by a space"""
+    while True:
+        for _ in range(rng.randint(3, 10)):
+            key = rng.choice(keys)
+            yield False, key, True
+            yield False, key, False
+        yield False, 'space', True
+        yield False, 'space', False
+
+
+def repeat_events(rng, keys):
+    """Auto-repeat storms: a key, sometimes a modifier, held for hundreds of repeated presses"""
+    while True:
+        key = rng.choice(keys + ['shift', 'ctrl', 'backspace'])
+        for _ in range(rng.randint(100, 400)):
+            yield False, key, True
+        yield False, key, False
+
+
+def mouse_events(rng, keys):
+    """Rapid clicks of the buttons no script is bound to"""
+    while True:
+        button = rng.choice(('right', 'middle', 'x1', 'x2'))
+        yield True, button, True
+        yield True, button, False
+
+
+SCENARIOS = {
+    'typing': typing_events,
+    'repeat': repeat_events,
+    'mouse': mouse_events
+}
+
+
+def stress_profile(delay=0.001):
+    """Every script armed with short delays, so a probe's macro is done before the next probe"""
+    timings = {script_id: {name: delay for name in params} for script_id, params in DEFAULT_TIMINGS.items()}
+    return make_profile({'script_states': {script_id: True for script_id in SCRIPT_KEYBINDS}, 'timings': timings})
+
+
+def run_scenario(name, rate=50000, duration=2.0, probe_interval=0.02, seed=1):
+    """Push one scenario's events through a fully armed ScriptBot's hook callbacks at rate events/s.
+    
+    Background events never touch a trigger. Every probe_interval one
+    script's trigger is pressed (released on the next probe), and the time
+    from the trigger to the macro's first injected event, minus the macro's
+    own delay, is its latency under load. Returns a dict of results.
+    """
+    from engine.bot import ScriptBot
+    
+    backend = StressBackend()
+    bot = ScriptBot(backend)
+    profile = stress_profile()
+    bot.apply_profiles({'stress': profile}, 'stress')
+    config = profile_config('stress', profile)
+    
+    triggers = {DEFAULT_KEYBINDS[role] for role in SCRIPT_TRIGGERS.values()}
+    keys = [key for key in string.ascii_lowercase + string.digits if key not in triggers]
+    events = SCENARIOS[name](random.Random(seed), keys)
+    probes = [(script.script_id, script.trigger, script.script_id in TRIGGER_ROLES) for script in config.scripts]
+    
+    on_key = bot._on_raw_key
+    on_button = bot._on_raw_button
+    clock_ns = time.perf_counter_ns
+    interval_ns = 1e9 / rate
+    probe_ns = int(probe_interval * 1e9)
+    callbacks = []
+    trigger_callbacks = []
+    triggered = []
+    queued = 0
+    max_lag = 0
+    held = None
+    probe = 0
+    
+    start = clock_ns()
+    end = start + int(duration * 1e9)
+    next_probe = start
+    count = 0
+    while True:
+        now = clock_ns()
+        if now >= end:
+            break
+        
+        if now >= next_probe:
+            # Release the last probe's trigger, then press the next one
+            if held is not None:
+                script_id, key, on_release = held
+                t0 = clock_ns()
+                on_key(key, False)
+                trigger_callbacks.append(clock_ns() - t0)
+                if on_release:
+                    triggered.append((script_id, t0))
+            held = probes[probe % len(probes)]
+            probe += 1
+            script_id, key, on_release = held
+            t0 = clock_ns()
+            on_key(key, True)
+            trigger_callbacks.append(clock_ns() - t0)
+            if not on_release:
+                triggered.append((script_id, t0))
+            next_probe += probe_ns
+        
+        due = start + int(count * interval_ns)
+        if now < due:
+            # Ahead of schedule: give up the GIL like an idle hook thread would, without sleeping past the slot
+            time.sleep((due - now) / 1e9 if due - now > 200000 else 0)
+            continue
+        lag = now - due
+        if lag > QUEUED_NS:
+            queued += 1
+        if lag > max_lag:
+            max_lag = lag
+        
+        is_button, key, pressed = next(events)
+        t0 = clock_ns()
+        if is_button:
+            on_button(key, pressed)
+        else:
+            on_key(key, pressed)
+        callbacks.append(clock_ns() - t0)
+        count += 1
+    
+    elapsed = (clock_ns() - start) / 1e9
+    if held is not None:
+        on_key(held[1], False)
+    time.sleep(0.05)
+    bot.stop_all_scripts()
+    
+    # Latency of each probe: first matching injected event after its trigger
+    injected = sorted(backend.injected)
+    times = [event[0] for event in injected]
+    latencies = []
+    lost = 0
+    for script_id, t_ns in triggered:
+        op, key, delay = first_output(config.script(script_id).timeline)
+        index = bisect.bisect_left(times, t_ns)
+        for t_out, out_op, out_key in injected[index:]:
+            if t_out - t_ns > 0.1e9 + delay * 1e9:
+                lost += 1
+                break
+            if out_op == op and out_key == key:
+                latencies.append(max(0, t_out - t_ns - int(delay * 1e9)))
+                break
+        else:
+            lost += 1
+    
+    callbacks.sort()
+    trigger_callbacks.sort()
+    latencies.sort()
+    return {
+        'scenario': name,
+        'events': count,
+        'rate': count / elapsed,
+        'callback': [percentile(callbacks, q) for q in (50, 99)] + [callbacks[-1]] if callbacks else [0, 0, 0],
+        'trigger_callback': [percentile(trigger_callbacks, 50), trigger_callbacks[-1]] if trigger_callbacks else [0, 0],
+        'queued': queued,
+        'max_lag': max_lag,
+        'probes': len(triggered),
+        'lost': lost,
+        'latency': [percentile(latencies, q) for q in (50, 99)] + [latencies[-1]] if latencies else None
+    }
+
+
+def format_results(results):
+    lines = [f"{'Scenario':8} {'Target/s':>9} {'Events/s':>9} {'Callback us p50/p99/max':>24} "
+             f"{'Trigger us p50/max':>19} {'Queued':>7} {'Lag ms':>7} {'Probes':>6} {'Lost':>5} "
+             f"{'Macro ms p50/p99/max':>21}"]
+    for target, result in results:
+        callback = '/'.join(f"{value / 1000:.1f}" for value in result['callback'])
+        trigger = '/'.join(f"{value / 1000:.1f}" for value in result['trigger_callback'])
+        latency = '/'.join(f"{value / 1e6:.2f}" for value in result['latency']) if result['latency'] else '-'
+        lines.append(f"{result['scenario']:8} {target:9} {result['rate']:9.0f} {callback:>24} {trigger:>19} "
+                     f"{result['queued']:7} {result['max_lag'] / 1e6:7.1f} {result['probes']:6} {result['lost']:5} "
+                     f"{latency:>21}")
+    return "\n".join(lines)
\ No newline at end of file
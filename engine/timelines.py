@@ -0,0 +1,170 @@
+import copy
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+MOUSE_LEFT = 'mouse_left'
+
+DEFAULT_TIMINGS = {
+    'spam_macro': {
+        'key_hold': 0.01,
+        'cycle_gap': 0.001
+    },
+    'auto_pullout': {
+        'release_delay': 0.1,
+        'key_hold': 0.01
+    },
+    'auto_pickup': {
+        'key_hold': 0.005,
+        'repeat_gap': 0.01
+    },
+    'wall_take': {
+        'first_click_hold': 0.20,
+        'wall_key_hold': 0.05,
+        'second_click_hold': 0.10
+    }
+}
+
+# Steps are ('press' | 'release', role) or ('wait', timing parameter).
+# Roles are keybind names from the settings file, or MOUSE_LEFT.
+TIMELINES = {
+    'spam_macro': (
+        ('press', 'edit_key'),
+        ('wait', 'key_hold'),
+        ('release', 'edit_key'),
+        ('press', 'secondary_edit_key'),
+        ('wait', 'key_hold'),
+        ('release', 'secondary_edit_key'),
+        ('wait', 'cycle_gap')
+    ),
+    'auto_pullout': (
+        ('wait', 'release_delay'),
+        ('press', 'weapon_slot'),
+        ('wait', 'key_hold'),
+        ('release', 'weapon_slot')
+    ),
+    'auto_pickup': (
+        ('press', 'pickup_key'),
+        ('wait', 'key_hold'),
+        ('release', 'pickup_key'),
+        ('wait', 'repeat_gap')
+    ),
+    'wall_take': (
+        ('press', MOUSE_LEFT),
+        ('wait', 'first_click_hold'),
+        ('release', MOUSE_LEFT),
+        ('press', 'wall_button'),
+        ('wait', 'wall_key_hold'),
+        ('release', 'wall_button'),
+        ('press', MOUSE_LEFT),
+        ('wait', 'second_click_hold'),
+        ('release', MOUSE_LEFT)
+    )
+}
+
+# Composite macros: other scripts' timelines run back to back by one worker, as one unit
+COMPOSITES = {
+    'wall_pullout': ('wall_take', 'auto_pullout')
+}
+
+# Timelines that repeat for as long as their trigger is held
+LOOPING = {'spam_macro', 'auto_pickup'}
+
+# Role whose release starts the timeline, for timelines fired on a release
+TRIGGER_ROLES = {'auto_pullout': 'edit_key'}
+
+
+def merge_timings(overrides):
+    """Return the default timings updated with valid values from overrides"""
+    timings = copy.deepcopy(DEFAULT_TIMINGS)
+    
+    for script_id, params in (overrides or {}).items():
+        if script_id not in timings or not isinstance(params, dict):
+            log.warning("Ignoring timings for unknown script: %s", script_id)
+            continue
+        
+        for name, value in params.items():
+            if name not in timings[script_id]:
+                log.warning("Ignoring unknown timing %s.%s", script_id, name)
+                continue
+            
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                log.warning("Ignoring invalid timing %s.%s: %r", script_id, name, value)
+                continue
+            
+            if value < 0:
+                log.warning("Ignoring negative timing %s.%s: %s", script_id, name, value)
+                continue
+            
+            timings[script_id][name] = value
+    
+    return timings
+
+
+def compile_timeline(script_id, keybinds, timings):
+    """Resolve a timeline's roles to keys and its waits to seconds.
+    
+    A composite compiles to its parts' timelines in order, each with its own timings.
+    """
+    if script_id in COMPOSITES:
+        return tuple(step for part in COMPOSITES[script_id] for step in compile_timeline(part, keybinds, timings))
+    
+    params = timings[script_id]
+    steps = []
+    
+    for op, arg in TIMELINES[script_id]:
+        if op == 'wait':
+            steps.append((op, float(params[arg])))
+        else:
+            steps.append((op, keybinds.get(arg, arg)))
+    
+    return tuple(steps)
+
+
+def script_timings(script_id, timings):
+    """A script's delays; a composite's are its parts', named part.parameter"""
+    if script_id in COMPOSITES:
+        return {f"{part}.{name}": value for part in COMPOSITES[script_id] for name, value in timings[part].items()}
+    return timings[script_id]
+
+
+def first_output(timeline):
+    """(op, key, seconds waited before it) of the first event a compiled timeline injects"""
+    delay = 0.0
+    for op, value in timeline:
+        if op == 'wait':
+            delay += value
+        elif op == 'send':
+            return value[0] + (delay,)
+        else:
+            return op, value, delay
+    raise ValueError("timeline injects nothing")
+
+
+def batch_steps(steps):
+    """Merge presses and releases with no wait between them into ('send', events) steps.
+    
+    Zero waits are dropped, so a backend that can inject several events at
+    once sends each group with a single flush.
+    """
+    batched = []
+    group = []
+    
+    for op, value in steps:
+        if op == 'wait':
+            if not value:
+                continue
+            if group:
+                batched.append(('send', tuple(group)) if len(group) > 1 else group[0])
+                group = []
+            batched.append((op, value))
+        else:
+            group.append((op, value))
+    
+    if group:
+        batched.append(('send', tuple(group)) if len(group) > 1 else group[0])
+    return tuple(batched)
\ No newline at end of file
@@ -0,0 +1,186 @@
+import time
+import struct
+import threading
+import logging
+from collections import deque
+
+from engine.timelines import TIMELINES, COMPOSITES
+
+
+log = logging.getLogger(__name__)
+
+
+MAGIC = b'VMTRACE\0'
+VERSION = 1
+
+# magic, version, record size, reserved, origin (perf_counter_ns), wall clock (time_ns)
+HEADER = struct.Struct('<8sHHIqq')
+# timestamp ns, kind, script, flags, key name (utf-8, zero padded)
+RECORD = struct.Struct('<qBBH20s')
+
+KEY_DOWN = 1
+KEY_UP = 2
+BUTTON_DOWN = 3
+BUTTON_UP = 4
+INJECT_DOWN = 5
+INJECT_UP = 6
+TRIGGER = 7
+STOP = 8
+# Start of a session appended to an existing trace
+SESSION = 9
+
+KIND_NAMES = {
+    KEY_DOWN: 'key_down',
+    KEY_UP: 'key_up',
+    BUTTON_DOWN: 'button_down',
+    BUTTON_UP: 'button_up',
+    INJECT_DOWN: 'inject_down',
+    INJECT_UP: 'inject_up',
+    TRIGGER: 'trigger',
+    STOP: 'stop',
+    SESSION: 'session'
+}
+
+# Script numbers stored in records; 0 is raw input that no script produced.
+# Composites come last so the numbers in older traces keep their meaning.
+SCRIPTS = ('',) + tuple(TIMELINES) + tuple(COMPOSITES)
+SCRIPT_NUMBERS = {name: number for number, name in enumerate(SCRIPTS)}
+
+
+class TraceWriter:
+    """Append-only trace file fed from the hot path and written by a background thread.
+    
+    Timestamps are relative to the origin in the file's header. A session
+    appended to an existing trace has its clock rebased onto that origin
+    through the wall clock, and starts with a SESSION record so replay can
+    skip the gap between sessions.
+    """
+    
+    def __init__(self, path, clock_ns=time.perf_counter_ns, buffer_size=1 << 20, flush_interval=0.05):
+        self.path = path
+        self.clock_ns = clock_ns
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self._queue = deque()
+        self._stop = threading.Event()
+        
+        self._file = open(path, 'ab', buffering=buffer_size)
+        # Added to every timestamp when it is written, so the hot path stays a bare clock read
+        self._offset_ns = 0
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, clock_ns(), time.time_ns()))
+        else:
+            try:
+                header = read_header(path)
+            except Exception:
+                self._file.close()
+                raise
+            # This process's clock has another base: map it to the header's through the wall clock
+            self._offset_ns = header['origin_ns'] + (time.time_ns() - header['wall_ns']) - clock_ns()
+            self.record(SESSION)
+        
+        self._thread = threading.Thread(target=self._run, name='trace-writer', daemon=True)
+        self._thread.start()
+    
+    def record(self, kind, key='', script=0, flags=0):
+        # deque.append is atomic, so hooks and workers never wait on the writer
+        self._queue.append((self.clock_ns(), kind, script, flags, key))
+    
+    def _drain(self):
+        batch = bytearray()
+        pack = RECORD.pack
+        queue = self._queue
+        offset_ns = self._offset_ns
+        
+        while queue:
+            t_ns, kind, script, flags, key = queue.popleft()
+            batch += pack(t_ns + offset_ns, kind, script, flags, key.encode('utf-8')[:20])
+            self.records_written += 1
+            if len(batch) >= self.buffer_size:
+                self._file.write(batch)
+                batch = bytearray()
+        
+        if batch:
+            self._file.write(batch)
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self._drain()
+            except Exception as e:
+                log.error("Trace write error: %s", e)
+    
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._drain()
+        self._file.close()
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER.size)
+    
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a trace file")
+    
+    magic, version, record_size, _, origin_ns, wall_ns = HEADER.unpack(data)
+    if magic != MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a trace file")
+    if version != VERSION:
+        raise ValueError(f"{path} has unsupported trace version {version}")
+    
+    return {'version': version, 'origin_ns': origin_ns, 'wall_ns': wall_ns}
+
+
+def read_trace(path, chunk_records=65536):
+    """Yield (t_ns, kind, script, flags, key) tuples from a trace file"""
+    read_header(path)
+    
+    with open(path, 'rb') as f:
+        f.seek(HEADER.size)
+        while True:
+            data = f.read(RECORD.size * chunk_records)
+            if not data:
+                break
+            
+            usable = len(data) - len(data) % RECORD.size
+            for t_ns, kind, script, flags, key in RECORD.iter_unpack(data[:usable]):
+                yield t_ns, kind, script, flags, key.rstrip(b'\0').decode('utf-8', 'replace')
+
+
+def replay_trace(path, bot, realtime=True, speed=1.0):
+    """Feed the raw input events of a trace back through a bot's dispatcher.
+    
+    With realtime the original gaps between events are reproduced (scaled by
+    speed) on the bot's clock, so a bot running on a VirtualClock replays in
+    virtual time. Otherwise events are dispatched back to back. Appended
+    sessions are replayed one after another, without the time between them.
+    """
+    clock = bot.clock
+    start = clock.now()
+    first_ns = None
+    count = 0
+    
+    for t_ns, kind, _, _, key in read_trace(path):
+        if kind == SESSION:
+            first_ns = None
+            start = clock.now()
+            continue
+        if kind not in (KEY_DOWN, KEY_UP, BUTTON_DOWN, BUTTON_UP):
+            continue
+        
+        if first_ns is None:
+            first_ns = t_ns
+        
+        if realtime:
+            clock.sleep_until(start + (t_ns - first_ns) / 1e9 / speed)
+        
+        if kind in (KEY_DOWN, KEY_UP):
+            bot.dispatch_key(key, kind == KEY_DOWN)
+        else:
+            bot.dispatch_button(key, kind == BUTTON_DOWN)
+        count += 1
+    
+    return count
\ No newline at end of file
@@ -0,0 +1,107 @@
+import copy
+
+from engine.timelines import TIMELINES, DEFAULT_TIMINGS
+from engine.simulator import GameSimulator
+
+
+def timing_params(script_id):
+    """Wait parameters of a timeline in the order they first appear"""
+    names = []
+    for op, arg in TIMELINES[script_id]:
+        if op == 'wait' and arg not in names:
+            names.append(arg)
+    return names
+
+
+def _sweep(script_id, timings, rate, target, step, max_delay, passes):
+    params = timings[script_id]
+    
+    for _ in range(passes):
+        changed = False
+        
+        for name in timing_params(script_id):
+            current = params[name]
+            upper = max(current, max_delay)
+            grid = [round(i * step, 6) for i in range(int(round(upper / step)) + 1)]
+            
+            # Success rate rises with each wait, so bisect for the first passing value
+            lo, hi = 0, len(grid) - 1
+            params[name] = grid[hi]
+            if rate() < target:
+                params[name] = current
+                continue
+            
+            while lo < hi:
+                mid = (lo + hi) // 2
+                params[name] = grid[mid]
+                if rate() >= target:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            
+            params[name] = grid[lo]
+            changed |= params[name] != current
+        
+        if not changed:
+            break
+
+
+def tune_script(script_id, timings, simulator, target=0.99, step=0.001, trials=400, max_delay=0.5, passes=3):
+    """Find the shortest waits that keep the simulated success rate at or above target.
+    
+    Each parameter is searched on a grid of `step` seconds up to max_delay
+    (or its current value if larger), with the other parameters held at their
+    current values. Passes repeat until nothing changes, since shortening one
+    wait can lengthen another. If no single wait can reach the target, the
+    search is repeated starting with every wait at max_delay.
+    """
+    timings = copy.deepcopy(timings)
+    params = timings[script_id]
+    original = dict(params)
+    
+    def rate():
+        return simulator.success_rate(script_id, timings, trials=trials)
+    
+    _sweep(script_id, timings, rate, target, step, max_delay, passes)
+    if rate() < target:
+        params.update({name: max(value, max_delay) for name, value in original.items()})
+        if rate() < target:
+            params.update(original)
+        else:
+            _sweep(script_id, timings, rate, target, step, max_delay, passes)
+    
+    return params, rate()
+
+
+def tune_all(script_ids, timings, model=None, target=0.99, step=0.001, trials=400, max_delay=0.5,
+             margin=0.0, seed=0):
+    """Tune each script and return (timings, {script_id: success rate})"""
+    simulator = GameSimulator(model, seed=seed)
+    timings = copy.deepcopy(timings)
+    rates = {}
+    
+    for script_id in script_ids:
+        params, rates[script_id] = tune_script(script_id, timings, simulator, target, step, trials, max_delay)
+        if margin:
+            params = {name: round(value * (1.0 + margin), 6) for name, value in params.items()}
+            rates[script_id] = simulator.success_rate(script_id, {**timings, script_id: params}, trials=trials)
+        timings[script_id] = params
+    
+    return timings, rates
+
+
+def timing_overrides(tuned, script_ids, overrides=None):
+    """Profile timings with the tuned scripts' values, keeping only those that differ from the defaults.
+    
+    Timings left at their default aren't written, so later changes to the
+    defaults still reach them; overrides for scripts not tuned are kept.
+    """
+    overrides = copy.deepcopy(overrides or {})
+    for script_id in script_ids:
+        defaults = DEFAULT_TIMINGS[script_id]
+        changed = {name: value for name, value in tuned[script_id].items() if value != defaults[name]}
+        if changed:
+            overrides[script_id] = changed
+        else:
+            overrides.pop(script_id, None)
+    return overrides
\ No newline at end of file
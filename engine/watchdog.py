@@ -0,0 +1,144 @@
+import time
+import logging
+import threading
+
+from engine.arbiter import DEFER_TIMEOUT
+from engine.trace import SCRIPTS
+
+
+log = logging.getLogger(__name__)
+
+
+# Seconds a hook callback or an injection may take before it counts as stalled.
+# Longer than the arbiter's defer timeout, so a deferred press isn't a stall.
+DEFAULT_WINDOW = 1.0
+
+HOOKS = ('keyboard', 'mouse')
+
+
+def check_window(window):
+    """Raise ValueError for a window a healthy script can stay busy for; 0 turns the watchdog off"""
+    if window < 0 or 0 < window <= DEFER_TIMEOUT:
+        raise ValueError(f"must be 0 (off) or longer than the {DEFER_TIMEOUT:g} s a deferred press may wait")
+
+
+class Watchdog:
+    """Watches the engine's hooks and workers and restarts the ones that stop.
+    
+    Hook callbacks and worker injections mark when they start and clear the
+    mark when they return, so anything still marked after window seconds is
+    stuck, and a listener thread that ended while armed has died. Only the
+    affected component is restarted: a fresh listener for a hook, fresh
+    handlers and run state for a script (a stuck thread can't be killed, so
+    it is left behind and ignored if it ever returns). A stall's duration
+    is the time from the stuck call to its restart.
+    
+    The watchdog checks four times per window while the engine is armed and
+    sleeps without waking while it is idle.
+    """
+    
+    def __init__(self, bot, window=DEFAULT_WINDOW):
+        check_window(window)
+        self.bot = bot
+        self.window = window
+        self._cond = threading.Condition()
+        self._idle = bot.idle
+        self._stopped = False
+        self._thread = None
+        # component -> {'stalls', 'deaths', 'total', 'max'}, durations up to the restart
+        self.stats = {}
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='watchdog', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+    
+    def set_idle(self, idle):
+        with self._cond:
+            self._idle = idle
+            self._cond.notify_all()
+    
+    def _run(self):
+        interval = self.window / 4
+        while True:
+            with self._cond:
+                while self._idle and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                self._cond.wait(interval)
+                if self._stopped:
+                    return
+            try:
+                self.check()
+            except Exception as e:
+                log.error("Watchdog check failed: %s", e)
+    
+    def _record(self, component, kind, duration=0.0):
+        with self._cond:
+            entry = self.stats.get(component)
+            if entry is None:
+                entry = self.stats[component] = {'stalls': 0, 'deaths': 0, 'total': 0.0, 'max': 0.0}
+            entry[kind] += 1
+            entry['total'] += duration
+            entry['max'] = max(entry['max'], duration)
+    
+    def check(self, now=None):
+        """Look at every hook and worker once; returns the components restarted"""
+        now = time.perf_counter() if now is None else now
+        bot = self.bot
+        restarted = []
+        
+        for index, hook in enumerate(HOOKS):
+            listener = bot.hook_listener(hook)
+            if listener is None:
+                continue
+            busy = bot.hook_busy[index]
+            stalled = bool(busy) and now - busy > self.window
+            if not stalled and not (hasattr(listener, 'is_alive') and not listener.is_alive()):
+                continue
+            # Not restarted while an apply or switch holds the engine, or once one has replaced
+            # the listener; tried again on the next check
+            if not bot.restart_hook(hook, listener):
+                continue
+            if stalled:
+                self._record(f"{hook} hook", 'stalls', now - busy)
+                log.warning("%s hook stuck in a callback for %.2f s, restarted it", hook.capitalize(), now - busy)
+            else:
+                self._record(f"{hook} hook", 'deaths')
+                log.warning("%s hook thread died, restarted it", hook.capitalize())
+            restarted.append(f"{hook} hook")
+        
+        for counter in bot.accounting.live():
+            busy = counter.busy
+            if counter.stalled or not busy or now - busy <= self.window:
+                continue
+            script_id = SCRIPTS[counter.number]
+            if not bot.restart_script(script_id, now - busy):
+                continue
+            # The stuck thread keeps its counter; flag it so it is only restarted once
+            counter.stalled = True
+            self._record(script_id, 'stalls', now - busy)
+            log.warning("%s worker stuck injecting for %.2f s, restarted the script", script_id, now - busy)
+            restarted.append(script_id)
+        
+        return restarted
+    
+    def snapshot(self):
+        with self._cond:
+            return {component: dict(entry) for component, entry in self.stats.items()}
+
+
+def format_watchdog(stats):
+    lines = [f"{'Component':14} {'Stalls':>7} {'Deaths':>7} {'Stalled s':>10} {'Longest s':>10}"]
+    for component, entry in stats.items():
+        lines.append(f"{component:14} {entry['stalls']:7} {entry['deaths']:7} "
+                     f"{entry['total']:10.2f} {entry['max']:10.2f}")
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+import logging
+from pathlib import Path
+
+from engine.settings import settings_digest, was_written_here, migrate_settings, validate_settings
+
+
+log = logging.getLogger(__name__)
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# wd, mask, cookie, name length; the name follows, zero padded
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _libc():
+    """libc with inotify, or None where it isn't available"""
+    if not sys.platform.startswith('linux'):
+        return None
+    
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class SettingsWatcher:
+    """Reports edits of a settings file made by other programs.
+    
+    The file's directory is watched with inotify where available, since
+    editors often replace the file instead of writing it in place, and the
+    file is polled otherwise. Content this process wrote itself is ignored,
+    and edits that don't validate are reported to on_error instead.
+    """
+    
+    def __init__(self, path, on_change, on_error=None, poll_interval=1.0, settle=0.05):
+        self.path = Path(path).resolve()
+        self.on_change = on_change
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.mode = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._wake = None
+        self._digest = None
+        
+        text = self._read()
+        if text is not None:
+            self._digest = settings_digest(text)
+    
+    def start(self, use_inotify=True):
+        fd = self._open_inotify() if use_inotify else None
+        if fd is not None:
+            self.mode = 'inotify'
+            # stop() writes to this pipe, so the loop can block without a timeout
+            self._wake = os.pipe()
+            target, args = self._run_inotify, (fd, self._wake[0])
+        else:
+            self.mode = 'polling'
+            target, args = self._run_polling, ()
+        
+        self._thread = threading.Thread(target=target, args=args, name='settings-watcher', daemon=True)
+        self._thread.start()
+        return self.mode
+    
+    def stop(self):
+        self._stop.set()
+        wake = self._wake
+        if wake:
+            try:
+                os.write(wake[1], b'\0')
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def _read(self):
+        try:
+            return self.path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return None
+    
+    def check(self):
+        """Look at the file now and report an external change; returns True if there was one"""
+        with self._lock:
+            text = self._read()
+            if text is None:
+                return False
+            
+            digest = settings_digest(text)
+            if digest == self._digest:
+                return False
+            self._digest = digest
+            
+            if was_written_here(self.path, text):
+                return False
+            
+            try:
+                settings = migrate_settings(json.loads(text))
+                validate_settings(settings)
+            except ValueError as e:
+                log.warning("Ignoring invalid settings file: %s", e)
+                if self.on_error:
+                    self.on_error(str(e))
+                return False
+        
+        self.on_change(settings)
+        return True
+    
+    def _safe_check(self):
+        try:
+            self.check()
+        except Exception as e:
+            log.error("Settings reload error: %s", e)
+    
+    def _open_inotify(self):
+        libc = _libc()
+        if libc is None:
+            return None
+        
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(fd, str(self.path.parent).encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    
+    def _run_inotify(self, fd, wake_fd):
+        name = self.path.name.encode()
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd, wake_fd], [], [])
+                if wake_fd in ready:
+                    break
+                
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                
+                hit = False
+                offset = 0
+                while offset + INOTIFY_EVENT.size <= len(data):
+                    _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                    start = offset + INOTIFY_EVENT.size
+                    hit = hit or data[start:start + length].rstrip(b'\0') == name
+                    offset = start + length
+                
+                if hit:
+                    # Let a burst of writes from the other program finish first
+                    self._stop.wait(self.settle)
+                    self._safe_check()
+        finally:
+            os.close(fd)
+            for pipe_fd in self._wake:
+                os.close(pipe_fd)
+            self._wake = None
+    
+    def _stat(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def _run_polling(self):
+        last = self._stat()
+        while not self._stop.wait(self.poll_interval):
+            current = self._stat()
+            if current != last:
+                last = current
+                self._safe_check()
\ No newline at end of file
@@ -1,35 +1,48 @@
 import sys
-import time
-import threading
-import json
-from pathlib import Path
+import logging
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
-from pynput import keyboard, mouse
-from pynput.keyboard import Listener as KeyboardListener
-from pynput.mouse import Listener as MouseListener
+from engine.bot import ScriptBot
+from engine.backends import make_backend
+from engine.bindings import key_code, key_name
+from engine.settings import (SETTINGS_FILE, SETTINGS_VERSION, DEFAULT_KEYBINDS, read_settings, write_settings,
+                             make_profile, migrate_settings, validate_settings, read_profiles, store_profiles)
+from engine.timelines import MOUSE_LEFT, merge_timings
+from engine.trace import SCRIPTS
+from engine.watcher import SettingsWatcher
+from engine.accounting import DEFAULT_CPU_BUDGET, format_rates
+from engine.arbiter import format_conflicts
+from engine.control import Controller, ControlServer, default_socket_path
+from engine.watchdog import DEFAULT_WINDOW, format_watchdog
+from engine.limiter import format_limited
+from engine.config import output_limits
+from engine.log import setup_logging, stop_logging
+
+
+log = logging.getLogger(__name__)
 
 
 class KeyCaptureDialog(QDialog):
-    """Dialog for capturing key presses"""
+    """Dialog for capturing key presses and mouse buttons through the engine's hooks"""
     
-    key_captured = Signal(str)
+    key_captured = Signal(int)
     
-    def __init__(self, parent=None):
+    def __init__(self, script_bot, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Press a key...")
         self.setModal(True)
         self.setFixedSize(300, 150)
+        self.script_bot = script_bot
         self.captured_key = None
-        self.listener = None
+        self.captured_code = None
         self.setup_ui()
-        QTimer.singleShot(100, self.setup_listener)
+        self.setup_listener()
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
         
-        self.label = QLabel("Press any key to bind...")
+        self.label = QLabel("Press any key or mouse button to bind...")
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setStyleSheet("font-size: 16px; color: #ffffff; margin: 20px;")
         
@@ -53,32 +66,25 @@ class KeyCaptureDialog(QDialog):
         self.key_captured.connect(self.on_key_captured)
     
     def setup_listener(self):
-        def on_press(key):
-            try:
-                if hasattr(key, 'char') and key.char:
-                    key_str = key.char
-                else:
-                    key_str = str(key).replace('Key.', '').lower()
-                
-                self.key_captured.emit(key_str)
-                return False
-                
-            except Exception as e:
-                print(f"Key capture error: {e}")
-                return True
+        def on_capture(code):
+            # The left button is left to the dialog itself, so Cancel can be clicked
+            if code == key_code(MOUSE_LEFT):
+                self.script_bot.begin_capture(on_capture)
+                return
+            self.key_captured.emit(code)
         
         try:
-            self.listener = KeyboardListener(on_press=on_press)
-            self.listener.start()
+            self.script_bot.begin_capture(on_capture)
         except Exception as e:
-            print(f"Failed to start listener: {e}")
-            self.reject()
+            log.error("Failed to start key capture: %s", e)
+            QTimer.singleShot(0, self.reject)
     
-    @Slot(str)
-    def on_key_captured(self, key_str):
-        self.captured_key = key_str
-        self.label.setText(f"Captured: {key_str}")
-        QTimer.singleShot(200, self.accept)
+    @Slot(int)
+    def on_key_captured(self, code):
+        self.captured_code = code
+        self.captured_key = key_name(code)
+        self.label.setText(f"Captured: {self.captured_key}")
+        self.accept()
     
     def reject(self):
         self.cleanup_listener()
@@ -89,328 +95,13 @@ class KeyCaptureDialog(QDialog):
         super().accept()
     
     def cleanup_listener(self):
-        if self.listener and self.listener.running:
-            try:
-                self.listener.stop()
-            except:
-                pass
-            self.listener = None
+        self.script_bot.end_capture()
     
     def closeEvent(self, event):
         self.cleanup_listener()
         event.accept()
 
 
-class ScriptBot(QObject):
-    status_changed = Signal(str, str)
-    
-    def __init__(self):
-        super().__init__()
-        self.keyboard_controller = keyboard.Controller()
-        self.mouse_controller = mouse.Controller()
-        self.listeners = []
-        self.active_scripts = {}
-        self.running_threads = {}
-        self._thread_stop_events = {}
-        
-    def stop_all_scripts(self):
-        for script_name in list(self.active_scripts.keys()):
-            self.stop_script(script_name)
-        
-        for listener in self.listeners[:]:
-            try:
-                if hasattr(listener, 'running') and listener.running:
-                    listener.stop()
-                self.listeners.remove(listener)
-            except:
-                pass
-        
-        for event in self._thread_stop_events.values():
-            event.set()
-        self._thread_stop_events.clear()
-        self.running_threads.clear()
-    
-    def stop_script(self, script_name):
-        if script_name in self.active_scripts:
-            self.active_scripts[script_name] = False
-            
-        if script_name in self._thread_stop_events:
-            self._thread_stop_events[script_name].set()
-            
-        self.status_changed.emit(script_name, "Stopped")
-    
-    def _normalize_key(self, key_input):
-        if not key_input:
-            return ""
-        
-        key_str = str(key_input).lower().strip()
-        key_mappings = {
-            'space': 'space',
-            'enter': 'enter',
-            'tab': 'tab',
-            'shift': 'shift',
-            'ctrl': 'ctrl',
-            'alt': 'alt',
-            'escape': 'esc',
-            'backspace': 'backspace',
-            'delete': 'delete'
-        }
-        
-        return key_mappings.get(key_str, key_str)
-    
-    def start_spam_macro(self, edit_key, secondary_key, toggle_key):
-        self.stop_all_scripts()
-        self.active_scripts['spam_macro'] = False
-        stop_event = threading.Event()
-        self._thread_stop_events['spam_macro'] = stop_event
-        
-        edit_key = self._normalize_key(edit_key)
-        secondary_key = self._normalize_key(secondary_key)
-        toggle_key = self._normalize_key(toggle_key)
-        
-        def execute_sequence():
-            try:
-                if edit_key == 'space':
-                    self.keyboard_controller.press(keyboard.Key.space)
-                    time.sleep(0.01)
-                    self.keyboard_controller.release(keyboard.Key.space)
-                else:
-                    self.keyboard_controller.press(edit_key)
-                    time.sleep(0.01)
-                    self.keyboard_controller.release(edit_key)
-                
-                if secondary_key == 'space':
-                    self.keyboard_controller.press(keyboard.Key.space)
-                    time.sleep(0.01)
-                    self.keyboard_controller.release(keyboard.Key.space)
-                else:
-                    self.keyboard_controller.press(secondary_key)
-                    time.sleep(0.01)
-                    self.keyboard_controller.release(secondary_key)
-            except Exception as e:
-                print(f"Sequence execution error: {e}")
-        
-        def sequence_loop():
-            while self.active_scripts.get('spam_macro', False) and not stop_event.is_set():
-                execute_sequence()
-                time.sleep(0.001)
-        
-        def on_press(key):
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == toggle_key and not self.active_scripts.get('spam_macro', False):
-                    self.active_scripts['spam_macro'] = True
-                    self.status_changed.emit('spam_macro', f'Running (Hold {toggle_key})')
-                    thread = threading.Thread(target=sequence_loop, daemon=True)
-                    thread.start()
-                    self.running_threads['spam_macro'] = thread
-            except Exception as e:
-                print(f"Key press error: {e}")
-        
-        def on_release(key):
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == toggle_key and self.active_scripts.get('spam_macro', False):
-                    self.active_scripts['spam_macro'] = False
-                    self.status_changed.emit('spam_macro', 'Ready')
-            except Exception as e:
-                print(f"Key release error: {e}")
-        
-        try:
-            listener = KeyboardListener(on_press=on_press, on_release=on_release)
-            listener.start()
-            self.listeners.append(listener)
-            self.status_changed.emit('spam_macro', 'Ready')
-        except Exception as e:
-            print(f"Listener start error: {e}")
-            self.status_changed.emit('spam_macro', 'Error')
-    
-    def start_auto_pullout(self, edit_key, slot_number):
-        self.stop_all_scripts()
-        self.active_scripts['auto_pullout'] = True
-        edit_held = False
-        
-        edit_key = self._normalize_key(edit_key)
-        slot_number = self._normalize_key(slot_number)
-        
-        def click_slot():
-            try:
-                time.sleep(0.1)
-                self.keyboard_controller.press(slot_number)
-                time.sleep(0.01)
-                self.keyboard_controller.release(slot_number)
-            except Exception as e:
-                print(f"Slot click error: {e}")
-        
-        def on_press(key):
-            nonlocal edit_held
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == edit_key and not edit_held:
-                    edit_held = True
-                    self.status_changed.emit('auto_pullout', 'Edit held - waiting for release')
-            except Exception as e:
-                print(f"Auto pullout press error: {e}")
-        
-        def on_release(key):
-            nonlocal edit_held
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == edit_key and edit_held:
-                    edit_held = False
-                    threading.Thread(target=click_slot, daemon=True).start()
-                    self.status_changed.emit('auto_pullout', 'Ready')
-            except Exception as e:
-                print(f"Auto pullout release error: {e}")
-        
-        try:
-            listener = KeyboardListener(on_press=on_press, on_release=on_release)
-            listener.start()
-            self.listeners.append(listener)
-            self.status_changed.emit('auto_pullout', 'Ready')
-        except Exception as e:
-            print(f"Auto pullout listener error: {e}")
-            self.status_changed.emit('auto_pullout', 'Error')
-    
-    def start_auto_pickup(self, pickup_key, trigger_key):
-        self.stop_all_scripts()
-        self.active_scripts['auto_pickup'] = False
-        stop_event = threading.Event()
-        self._thread_stop_events['auto_pickup'] = stop_event
-        
-        pickup_key = self._normalize_key(pickup_key)
-        trigger_key = self._normalize_key(trigger_key)
-        
-        def spam_pickup():
-            while self.active_scripts.get('auto_pickup', False) and not stop_event.is_set():
-                try:
-                    self.keyboard_controller.press(pickup_key)
-                    time.sleep(0.005)
-                    self.keyboard_controller.release(pickup_key)
-                    time.sleep(0.01)
-                except Exception as e:
-                    print(f"Pickup spam error: {e}")
-                    break
-        
-        def start_spamming():
-            if not self.active_scripts.get('auto_pickup', False):
-                self.active_scripts['auto_pickup'] = True
-                self.status_changed.emit('auto_pickup', f'Spamming {pickup_key}')
-                thread = threading.Thread(target=spam_pickup, daemon=True)
-                thread.start()
-                self.running_threads['auto_pickup'] = thread
-        
-        def stop_spamming():
-            if self.active_scripts.get('auto_pickup', False):
-                self.active_scripts['auto_pickup'] = False
-                self.status_changed.emit('auto_pickup', 'Ready')
-        
-        def on_key_press(key):
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == trigger_key:
-                    start_spamming()
-            except Exception as e:
-                print(f"Pickup key press error: {e}")
-        
-        def on_key_release(key):
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == trigger_key:
-                    stop_spamming()
-            except Exception as e:
-                print(f"Pickup key release error: {e}")
-        
-        def on_mouse_click(x, y, button, pressed):
-            try:
-                button_str = str(button).lower().replace('button.', '')
-                if button_str == trigger_key:
-                    if pressed:
-                        start_spamming()
-                    else:
-                        stop_spamming()
-            except Exception as e:
-                print(f"Mouse click error: {e}")
-        
-        try:
-            keyboard_listener = KeyboardListener(on_press=on_key_press, on_release=on_key_release)
-            mouse_listener = MouseListener(on_click=on_mouse_click)
-            
-            keyboard_listener.start()
-            mouse_listener.start()
-            self.listeners.extend([keyboard_listener, mouse_listener])
-            self.status_changed.emit('auto_pickup', 'Ready')
-        except Exception as e:
-            print(f"Auto pickup listener error: {e}")
-            self.status_changed.emit('auto_pickup', 'Error')
-    
-    def start_wall_take(self, wall_button, trigger_key):
-        self.stop_all_scripts()
-        self.active_scripts['wall_take'] = True
-        running_sequence = False
-        
-        wall_button = self._normalize_key(wall_button)
-        trigger_key = self._normalize_key(trigger_key)
-        
-        def execute_sequence():
-            nonlocal running_sequence
-            if running_sequence:
-                return
-            
-            running_sequence = True
-            self.status_changed.emit('wall_take', 'Executing sequence...')
-            
-            try:
-                self.mouse_controller.press(mouse.Button.left)
-                time.sleep(0.20)
-                self.mouse_controller.release(mouse.Button.left)
-                
-                self.keyboard_controller.press(wall_button)
-                time.sleep(0.05)
-                self.keyboard_controller.release(wall_button)
-                
-                self.mouse_controller.press(mouse.Button.left)
-                time.sleep(0.10)
-                self.mouse_controller.release(mouse.Button.left)
-                
-            except Exception as e:
-                print(f"Wall sequence error: {e}")
-            finally:
-                running_sequence = False
-                self.status_changed.emit('wall_take', 'Ready')
-        
-        def on_press(key):
-            try:
-                key_char = getattr(key, 'char', None) or str(key).replace('Key.', '').lower()
-                key_char = self._normalize_key(key_char)
-                
-                if key_char == trigger_key:
-                    threading.Thread(target=execute_sequence, daemon=True).start()
-            except Exception as e:
-                print(f"Wall take press error: {e}")
-        
-        try:
-            listener = KeyboardListener(on_press=on_press, on_release=lambda key: None)
-            listener.start()
-            self.listeners.append(listener)
-            self.status_changed.emit('wall_take', 'Ready')
-        except Exception as e:
-            print(f"Wall take listener error: {e}")
-            self.status_changed.emit('wall_take', 'Error')
-
-
 class ClickableLineEdit(QLineEdit):
     clicked = Signal()
     
@@ -421,40 +112,64 @@ class ClickableLineEdit(QLineEdit):
 
 
 class FortniteScriptGUI(QMainWindow):
-    def __init__(self):
+    settings_reloaded = Signal(dict)
+    control_requested = Signal(object)
+    
+    def __init__(self, backend=None):
         super().__init__()
         self.setWindowTitle("Professional Keybind Manager")
         self.setGeometry(100, 100, 1000, 700)
         self.setMinimumSize(900, 600)
         
-        self.script_bot = ScriptBot()
+        # The injection backend is chosen once at startup, before anything is hooked
+        try:
+            self.backend = read_settings().get('backend', 'pynput')
+        except Exception as e:
+            log.error("Error reading backend setting: %s", e)
+            self.backend = 'pynput'
+        self.script_bot = ScriptBot(backend or make_backend(self.backend))
         self.script_bot.status_changed.connect(self.update_script_status)
-        
-        self.keybinds = {
-            'edit_key': 'g',
-            'secondary_edit_key': 'v', 
-            'toggle_button': 't',
-            'weapon_slot': '2',
-            'pickup_key': 'e',
-            'pickup_trigger': 'f',
-            'wall_button': 'p',
-            'wall_trigger': 'r'
-        }
-        
-        self.script_states = {
-            'spam_macro': False,
-            'auto_pullout': False, 
-            'auto_pickup': False,
-            'wall_take': False
-        }
+        self.script_bot.profile_changed.connect(self.on_profile_switched)
+        self.in_tray = False
+        
+        self.profiles, self.active_profile = read_profiles({})
+        self.use_profile(self.active_profile)
+        self.cpu_budget = DEFAULT_CPU_BUDGET
+        self.focus_window = ''
+        self.minimize_to_tray = True
+        self.script_priorities = {}
+        self.control_socket = False
+        self.watchdog_window = DEFAULT_WINDOW
+        self.output_limits = {}
         
         self.load_settings()
+        self.script_bot.accounting.cpu_budget = self.cpu_budget
+        self.script_bot.start_watchdog(self.watchdog_window)
+        self.script_bot.arbiter.set_priorities(self.script_priorities)
+        self.script_bot.set_output_limits(output_limits({'output_limits': self.output_limits}))
         self.setup_style()
         self.setup_ui()
         
+        # Edits are saved shortly after they are made, so nothing wakes up while nothing changes
         self.auto_save_timer = QTimer()
+        self.auto_save_timer.setSingleShot(True)
+        self.auto_save_timer.setInterval(5000)
         self.auto_save_timer.timeout.connect(self.save_settings)
-        self.auto_save_timer.start(5000)
+        
+        # Resource usage is only sampled while some script is armed
+        self.usage_timer = QTimer()
+        self.usage_timer.setInterval(1000)
+        self.usage_timer.timeout.connect(self.update_resource_usage)
+        self.script_bot.idle_changed.connect(self.on_idle_changed)
+        self.script_bot.focus_changed.connect(self.on_focus_changed)
+        self.update_resource_usage()
+        self.setup_tray()
+        
+        # External edits arrive on the watcher thread and are applied on the GUI thread
+        self.settings_reloaded.connect(self.apply_external_settings)
+        self.settings_watcher = SettingsWatcher(SETTINGS_FILE, self.settings_reloaded.emit)
+        log.info("Watching %s (%s)", SETTINGS_FILE, self.settings_watcher.start())
+        self.start_control_server(self.control_socket or '--control' in sys.argv)
     
     def setup_style(self):
         self.setStyleSheet("""
@@ -657,6 +372,60 @@ class FortniteScriptGUI(QMainWindow):
         header_layout.addWidget(status_indicator)
         layout.addLayout(header_layout)
         
+        profile_layout = QHBoxLayout()
+        profile_layout.setSpacing(10)
+        
+        profile_label = QLabel("Profile:")
+        profile_label.setStyleSheet("font-weight: bold; color: white; font-size: 14px;")
+        
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(180)
+        self.profile_combo.addItems(list(self.profiles))
+        self.profile_combo.setCurrentText(self.active_profile)
+        self.profile_combo.currentTextChanged.connect(self.change_profile)
+        
+        self.profile_hotkey_input = QLineEdit(self.profiles[self.active_profile]['hotkey'])
+        self.profile_hotkey_input.setPlaceholderText("Switch hotkey")
+        self.profile_hotkey_input.setMaximumWidth(150)
+        self.profile_hotkey_input.textChanged.connect(self.update_profile_hotkey)
+        
+        new_profile_btn = QPushButton("New")
+        new_profile_btn.clicked.connect(self.new_profile)
+        
+        delete_profile_btn = QPushButton("Delete")
+        delete_profile_btn.clicked.connect(self.delete_profile)
+        
+        profile_layout.addWidget(profile_label)
+        profile_layout.addWidget(self.profile_combo)
+        profile_layout.addWidget(self.profile_hotkey_input)
+        profile_layout.addWidget(new_profile_btn)
+        profile_layout.addWidget(delete_profile_btn)
+        profile_layout.addStretch()
+        layout.addLayout(profile_layout)
+        
+        focus_layout = QHBoxLayout()
+        focus_layout.setSpacing(10)
+        
+        focus_label = QLabel("Target window:")
+        focus_label.setStyleSheet("font-weight: bold; color: white; font-size: 14px;")
+        
+        self.focus_window_input = QLineEdit(self.focus_window)
+        self.focus_window_input.setPlaceholderText("Any window (class or title, X11 only)")
+        self.focus_window_input.setMinimumWidth(250)
+        self.focus_window_input.textChanged.connect(self.update_focus_window)
+        
+        self.tray_checkbox = QCheckBox("Minimize to tray")
+        self.tray_checkbox.setToolTip("While minimized the window stops updating; the scripts keep running")
+        self.tray_checkbox.setChecked(self.minimize_to_tray)
+        self.tray_checkbox.toggled.connect(self.update_minimize_to_tray)
+        
+        focus_layout.addWidget(focus_label)
+        focus_layout.addWidget(self.focus_window_input)
+        focus_layout.addSpacing(20)
+        focus_layout.addWidget(self.tray_checkbox)
+        focus_layout.addStretch()
+        layout.addLayout(focus_layout)
+        
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll_content = QWidget()
@@ -672,7 +441,9 @@ class FortniteScriptGUI(QMainWindow):
             ('auto_pickup', 'Auto Pickup', 
              'Continuously spam pickup key while holding the trigger key'),
             ('wall_take', 'Fast Wall Take', 
-             'Execute optimized wall replacement sequence on trigger key press')
+             'Execute optimized wall replacement sequence on trigger key press'),
+            ('wall_pullout', 'Wall Take + Pull Out',
+             'Wall take sequence followed by the weapon pullout, run as one macro on trigger key press')
         ]
         
         for script_id, name, description in scripts:
@@ -746,7 +517,7 @@ class FortniteScriptGUI(QMainWindow):
         desc_label.setWordWrap(True)
         
         status_label = QLabel("Inactive")
-        status_label.setStyleSheet("color: #ff6b6b; font-weight: bold; font-size: 12px; margin-top: 5px;")
+        status_label.setStyleSheet("color: #ffc107; font-weight: bold; font-size: 12px; margin-top: 5px;")
         
         content_layout.addWidget(title_label)
         content_layout.addWidget(desc_label)
@@ -797,7 +568,8 @@ class FortniteScriptGUI(QMainWindow):
             ]),
             ("Building Controls", [
                 ('wall_button', 'Wall Placement Key', 'Secondary wall placement button'),
-                ('wall_trigger', 'Wall Take Trigger', 'Key to trigger wall take sequence')
+                ('wall_trigger', 'Wall Take Trigger', 'Key to trigger wall take sequence'),
+                ('wall_pullout_trigger', 'Wall + Pull Out Trigger', 'Key to trigger wall take followed by pullout')
             ])
         ]
         
@@ -946,7 +718,7 @@ class FortniteScriptGUI(QMainWindow):
         Python Version: {sys.version.split()[0]}
         PySide6 Version: Available
         Pynput Version: Available
-        Auto-Save: Enabled (5s interval)
+        Auto-Save: Enabled (5s after changes)
         """)
         system_info.setStyleSheet("color: #cccccc; font-family: monospace; line-height: 1.6;")
         system_layout.addWidget(system_info)
@@ -970,6 +742,73 @@ class FortniteScriptGUI(QMainWindow):
         
         scroll_layout.addWidget(scripts_frame)
         
+        profiling_frame = QFrame()
+        profiling_frame.setStyleSheet("QFrame { padding: 20px; }")
+        profiling_layout = QVBoxLayout(profiling_frame)
+        
+        profiling_title = QLabel("Profiling")
+        profiling_title.setStyleSheet("font-size: 18px; font-weight: bold; color: white; margin-bottom: 10px;")
+        profiling_layout.addWidget(profiling_title)
+        
+        profiling_controls = QHBoxLayout()
+        self.profiling_checkbox = QCheckBox("Record hot path timings")
+        self.profiling_checkbox.stateChanged.connect(lambda state: self.toggle_profiling(state == 2))
+        export_profile_btn = QPushButton("Export Profile")
+        export_profile_btn.clicked.connect(self.export_profile)
+        profiling_controls.addWidget(self.profiling_checkbox)
+        profiling_controls.addStretch()
+        profiling_controls.addWidget(export_profile_btn)
+        profiling_layout.addLayout(profiling_controls)
+        
+        self.profile_summary = QLabel("Profiling is off")
+        self.profile_summary.setStyleSheet("color: #cccccc; font-family: monospace; line-height: 1.6;")
+        profiling_layout.addWidget(self.profile_summary)
+        
+        scroll_layout.addWidget(profiling_frame)
+        
+        usage_frame = QFrame()
+        usage_frame.setStyleSheet("QFrame { padding: 20px; }")
+        usage_layout = QVBoxLayout(usage_frame)
+        
+        usage_title = QLabel("Resource Usage")
+        usage_title.setStyleSheet("font-size: 18px; font-weight: bold; color: white; margin-bottom: 10px;")
+        usage_layout.addWidget(usage_title)
+        
+        budget_controls = QHBoxLayout()
+        budget_controls.addWidget(QLabel("CPU budget per script (% of one core):"))
+        self.cpu_budget_input = QDoubleSpinBox()
+        self.cpu_budget_input.setRange(0.1, 100.0)
+        self.cpu_budget_input.setSingleStep(0.5)
+        self.cpu_budget_input.setValue(self.cpu_budget)
+        self.cpu_budget_input.valueChanged.connect(self.update_cpu_budget)
+        budget_controls.addWidget(self.cpu_budget_input)
+        budget_controls.addStretch()
+        usage_layout.addLayout(budget_controls)
+        
+        self.usage_summary = QLabel()
+        self.usage_summary.setStyleSheet("color: #cccccc; font-family: monospace; line-height: 1.6;")
+        usage_layout.addWidget(self.usage_summary)
+        
+        self.usage_warning = QLabel()
+        self.usage_warning.setStyleSheet("color: #dc3545; font-weight: bold;")
+        usage_layout.addWidget(self.usage_warning)
+        
+        scroll_layout.addWidget(usage_frame)
+        
+        watchdog_frame = QFrame()
+        watchdog_frame.setStyleSheet("QFrame { padding: 20px; }")
+        watchdog_layout = QVBoxLayout(watchdog_frame)
+        
+        watchdog_title = QLabel("Watchdog")
+        watchdog_title.setStyleSheet("font-size: 18px; font-weight: bold; color: white; margin-bottom: 10px;")
+        watchdog_layout.addWidget(watchdog_title)
+        
+        self.watchdog_summary = QLabel()
+        self.watchdog_summary.setStyleSheet("color: #cccccc; font-family: monospace; line-height: 1.6;")
+        watchdog_layout.addWidget(self.watchdog_summary)
+        
+        scroll_layout.addWidget(watchdog_frame)
+        
         keybind_frame = QFrame()
         keybind_frame.setStyleSheet("QFrame { padding: 20px; }")
         keybind_layout = QVBoxLayout(keybind_frame)
@@ -999,15 +838,99 @@ class FortniteScriptGUI(QMainWindow):
         layout.addLayout(button_layout)
         self.content_stack.addWidget(status_page)
     
+    def toggle_profiling(self, enabled):
+        if enabled:
+            self.script_bot.start_profiling()
+        else:
+            self.last_profile = self.script_bot.stop_profiling()
+        self.update_profile_summary()
+    
+    def update_profile_summary(self):
+        profiler = self.script_bot.profiler or getattr(self, 'last_profile', None)
+        if profiler is None:
+            self.profile_summary.setText("Profiling is off")
+            return
+        
+        summary = profiler.summary()
+        if not summary:
+            self.profile_summary.setText("No spans recorded yet")
+            return
+        
+        lines = [f"{'Span':10} {'Count':>8} {'Mean us':>10} {'Max us':>10}"]
+        for name, (count, mean_us, max_us) in summary.items():
+            lines.append(f"{name:10} {count:8} {mean_us:10.1f} {max_us:10.1f}")
+        self.profile_summary.setText("\n".join(lines))
+    
+    def update_cpu_budget(self, value):
+        self.cpu_budget = value
+        self.script_bot.accounting.cpu_budget = value
+        self.schedule_save()
+    
+    def on_idle_changed(self, idle):
+        if idle:
+            self.usage_timer.stop()
+            self.update_resource_usage()
+        else:
+            self.usage_timer.start()
+    
+    def update_resource_usage(self):
+        accounting = self.script_bot.accounting
+        rates = accounting.sample()
+        summary = format_rates(rates, accounting.cpu_budget)
+        conflicts = self.script_bot.arbiter.conflicts()
+        if conflicts:
+            summary += "\n\nKey conflicts\n" + format_conflicts(conflicts)
+        limiter = self.script_bot.limiter
+        limited = limiter.counts() if limiter is not None else None
+        if limited:
+            summary += "\n\nHeld back by output limits\n" + format_limited(limited)
+        self.usage_summary.setText(summary)
+        
+        watchdog = self.script_bot.watchdog
+        stalls = watchdog.snapshot() if watchdog else None
+        if watchdog is None:
+            self.watchdog_summary.setText("Off")
+        elif stalls:
+            self.watchdog_summary.setText(format_watchdog(stalls))
+        else:
+            self.watchdog_summary.setText(f"No stalls (restarts anything stuck for over {watchdog.window:g} s)")
+        
+        over = accounting.over_budget(rates)
+        warning = ", ".join(f"{script_id} {rates[script_id][0]:.1f}%" for script_id in over)
+        self.usage_warning.setText(f"Over the CPU budget: {warning}" if warning else "")
+        # Print once when a script goes over, not on every refresh
+        if over and over != getattr(self, 'last_over_budget', []):
+            log.warning("Warning: over the %g%% CPU budget: %s", accounting.cpu_budget, warning)
+        self.last_over_budget = over
+    
+    def export_profile(self):
+        profiler = self.script_bot.profiler or getattr(self, 'last_profile', None)
+        if profiler is None:
+            QMessageBox.information(self, "Profiling", "Enable profiling first to record hot path timings.")
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "profile.json",
+                                              "Chrome trace (*.json);;Perfetto trace (*.pftrace)")
+        if not path:
+            return
+        
+        try:
+            count = profiler.dump(path, SCRIPTS)
+            self.update_profile_summary()
+            QMessageBox.information(self, "Profiling", f"{count} spans written to {path}")
+        except Exception as e:
+            log.error("Error exporting profile: %s", e)
+            QMessageBox.warning(self, "Export Error", f"Failed to export profile:\n{str(e)}")
+    
     def capture_key(self, key_name, input_widget):
         try:
-            dialog = KeyCaptureDialog(self)
+            dialog = KeyCaptureDialog(self.script_bot, self)
             if dialog.exec() == QDialog.Accepted and dialog.captured_key:
                 input_widget.setText(dialog.captured_key)
                 self.update_keybind(key_name, dialog.captured_key)
                 self.save_settings()
         except Exception as e:
-            print(f"Key capture error: {e}")
+            log.error("Key capture error: %s", e)
             QMessageBox.warning(self, "Error", f"Failed to capture key: {str(e)}")
     
     def reset_keybinds(self):
@@ -1016,18 +939,7 @@ class FortniteScriptGUI(QMainWindow):
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            default_keybinds = {
-                'edit_key': 'g',
-                'secondary_edit_key': 'v', 
-                'toggle_button': 't',
-                'weapon_slot': '2',
-                'pickup_key': 'e',
-                'pickup_trigger': 'f',
-                'wall_button': 'p',
-                'wall_trigger': 'r'
-            }
-            
-            self.keybinds = default_keybinds.copy()
+            self.keybinds.update(DEFAULT_KEYBINDS)
             
             for key, input_widget in self.keybind_inputs.items():
                 input_widget.setText(self.keybinds[key])
@@ -1043,6 +955,7 @@ class FortniteScriptGUI(QMainWindow):
     
     def toggle_script(self, script_id, enabled):
         self.script_states[script_id] = enabled
+        self.schedule_save()
         if not enabled and script_id in self.script_bot.active_scripts:
             self.script_bot.stop_script(script_id)
             self.update_script_status(script_id, "Inactive")
@@ -1050,6 +963,7 @@ class FortniteScriptGUI(QMainWindow):
     def update_keybind(self, key, value):
         self.keybinds[key] = value.lower().strip()
         self.update_keybind_summary()
+        self.schedule_save()
     
     def stop_all_scripts(self):
         self.script_bot.stop_all_scripts()
@@ -1063,53 +977,275 @@ class FortniteScriptGUI(QMainWindow):
         
         QMessageBox.information(self, "Scripts Stopped", "All scripts have been stopped successfully.")
     
+    def use_profile(self, name):
+        profile = self.profiles[name]
+        self.active_profile = name
+        self.keybinds = profile['keybinds']
+        self.script_states = profile['script_states']
+        self.timings = merge_timings(profile['timings'])
+        profile['timings'] = self.timings
+    
+    def show_profile(self, name):
+        """Point the editors at another profile without touching the running scripts"""
+        self.use_profile(name)
+        
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.setCurrentText(name)
+        self.profile_combo.blockSignals(False)
+        
+        self.profile_hotkey_input.blockSignals(True)
+        self.profile_hotkey_input.setText(self.profiles[name]['hotkey'])
+        self.profile_hotkey_input.blockSignals(False)
+        
+        for key, input_widget in self.keybind_inputs.items():
+            input_widget.setText(self.keybinds[key])
+        
+        for script_id, card in self.script_cards.items():
+            card['checkbox'].blockSignals(True)
+            card['checkbox'].setChecked(self.script_states[script_id])
+            card['checkbox'].blockSignals(False)
+        
+        self.update_keybind_summary()
+    
+    def change_profile(self, name):
+        if not name or name not in self.profiles or name == self.active_profile:
+            return
+        
+        self.show_profile(name)
+        
+        # Profiles compiled by the last Apply switch instantly, with the hooks left running
+        if name in self.script_bot.profiles:
+            self.script_bot.switch_to(name)
+        self.save_settings()
+    
+    def on_profile_switched(self, name):
+        if name in self.profiles and name != self.active_profile:
+            self.show_profile(name)
+            self.save_settings()
+        
+        self.status_indicator.setText(f"{name} ({self.script_bot.last_switch_ns / 1000:.0f} us)")
+    
+    def update_focus_window(self, text):
+        self.focus_window = text.strip()
+        self.schedule_save()
+    
+    def on_focus_changed(self, focused):
+        if focused:
+            self.status_indicator.setText(f"Active ({len(self.script_bot.profile.scripts)})")
+            self.status_indicator.setStyleSheet("font-size: 16px; color: #28a745; font-weight: bold;")
+        else:
+            self.status_indicator.setText("Paused (target window not focused)")
+            self.status_indicator.setStyleSheet("font-size: 16px; color: #ffc107; font-weight: bold;")
+    
+    def update_minimize_to_tray(self, enabled):
+        self.minimize_to_tray = enabled
+        self.schedule_save()
+    
+    def setup_tray(self):
+        self.tray_icon = None
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+        
+        self.tray_icon = QSystemTrayIcon(self.style().standardIcon(QStyle.SP_ComputerIcon), self)
+        self.tray_icon.setToolTip("Professional Keybind Manager")
+        self.tray_icon.activated.connect(self.on_tray_activated)
+        
+        menu = QMenu(self)
+        menu.addAction("Show", self.leave_tray)
+        menu.addAction("Stop All Scripts", self.script_bot.stop_all_scripts)
+        menu.addSeparator()
+        menu.addAction("Quit", self.quit_from_tray)
+        self.tray_icon.setContextMenu(menu)
+    
+    def on_tray_activated(self, reason):
+        if reason in (QSystemTrayIcon.Trigger, QSystemTrayIcon.DoubleClick):
+            self.leave_tray()
+    
+    def quit_from_tray(self):
+        self.close()
+        QApplication.quit()
+    
+    def follow_engine(self, follow):
+        """Connect or disconnect every engine signal that only updates widgets"""
+        bot = self.script_bot
+        connections = ((bot.status_changed, self.update_script_status),
+                       (bot.profile_changed, self.on_profile_switched),
+                       (bot.idle_changed, self.on_idle_changed),
+                       (bot.focus_changed, self.on_focus_changed))
+        for signal, slot in connections:
+            if follow:
+                signal.connect(slot)
+            else:
+                signal.disconnect(slot)
+    
+    def enter_tray(self):
+        """Stop rendering, widget updates and timers while minimized; the engine keeps running"""
+        if self.in_tray:
+            return
+        
+        self.in_tray = True
+        if self.auto_save_timer.isActive():
+            self.save_settings()
+        self.usage_timer.stop()
+        self.follow_engine(False)
+        self.setUpdatesEnabled(False)
+        
+        if self.tray_icon is not None:
+            self.tray_icon.show()
+            self.hide()
+    
+    def leave_tray(self):
+        if not self.in_tray:
+            return
+        
+        self.in_tray = False
+        # Follow the signals again before reading the snapshot, so nothing falls in between
+        self.follow_engine(True)
+        self.setUpdatesEnabled(True)
+        self.sync_with_engine()
+        
+        if self.tray_icon is not None:
+            self.tray_icon.hide()
+        self.showNormal()
+        self.activateWindow()
+    
+    def sync_with_engine(self):
+        """Rebuild everything the engine signals would have updated from its latest snapshot"""
+        snapshot = self.script_bot.snapshot()
+        
+        if snapshot['profile'] in self.profiles and snapshot['profile'] != self.active_profile:
+            self.show_profile(snapshot['profile'])
+            self.save_settings()
+        
+        for script_id, status in snapshot['statuses'].items():
+            self.update_script_status(script_id, status)
+        
+        if snapshot['scripts'] and not snapshot['focused']:
+            self.on_focus_changed(False)
+        elif snapshot['scripts']:
+            self.status_indicator.setText(f"Active ({len(snapshot['scripts'])})")
+            self.status_indicator.setStyleSheet("font-size: 16px; color: #28a745; font-weight: bold;")
+        else:
+            self.status_indicator.setText("Ready")
+            self.status_indicator.setStyleSheet("font-size: 16px; color: #007acc; font-weight: bold;")
+        
+        self.on_idle_changed(snapshot['idle'])
+    
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized() and self.minimize_to_tray and not self.in_tray:
+                # Hiding from inside the state change confuses some window managers
+                QTimer.singleShot(0, self.enter_tray)
+            elif not self.isMinimized() and self.in_tray and self.tray_icon is None:
+                self.leave_tray()
+        super().changeEvent(event)
+    
+    def start_control_server(self, enabled):
+        """Accept control commands on a Unix domain socket, run on the GUI thread like clicks"""
+        self.control_server = None
+        if not enabled:
+            return
+        self.controller = Controller(self.script_bot, self.profiles, self.active_profile, self.on_control_change)
+        # Connection threads wait for the reply, so commands see and update the same state as the window
+        self.control_requested.connect(self.run_control_command, Qt.BlockingQueuedConnection)
+        
+        def execute(line):
+            request = [line, "error not handled"]
+            self.control_requested.emit(request)
+            return request[1]
+        
+        try:
+            server = ControlServer(default_socket_path(), execute)
+            log.info("Control socket: %s", server.start())
+            self.control_server = server
+        except (OSError, RuntimeError) as e:
+            log.error("Control socket unavailable: %s", e)
+    
+    def run_control_command(self, request):
+        controller = self.controller
+        controller.profiles = self.profiles
+        controller.active = self.active_profile
+        if not self.script_bot.profiles:
+            self.script_bot.set_focus_window(self.focus_window)
+        request[1] = controller.execute(request[0])
+    
+    def on_control_change(self):
+        self.show_profile(self.controller.active)
+        self.schedule_save()
+    
+    def update_profile_hotkey(self, text):
+        self.profiles[self.active_profile]['hotkey'] = text.lower().strip()
+        self.schedule_save()
+    
+    def new_profile(self):
+        name, ok = QInputDialog.getText(self, "New Profile", "Profile name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        
+        if name in self.profiles:
+            QMessageBox.warning(self, "New Profile", f"A profile named '{name}' already exists.")
+            return
+        
+        self.profiles[name] = make_profile({
+            'keybinds': dict(self.keybinds),
+            'script_states': dict(self.script_states),
+            'timings': self.timings
+        })
+        self.profile_combo.addItem(name)
+        self.profile_combo.setCurrentText(name)
+    
+    def delete_profile(self):
+        if len(self.profiles) < 2:
+            QMessageBox.warning(self, "Delete Profile", "The last profile can't be deleted.")
+            return
+        
+        name = self.active_profile
+        reply = QMessageBox.question(self, 'Delete Profile', f"Delete the profile '{name}'?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        
+        del self.profiles[name]
+        self.script_bot.profiles.pop(name, None)
+        self.profile_combo.removeItem(self.profile_combo.findText(name))
+        self.change_profile(self.profile_combo.currentText())
+    
     def apply_scripts(self):
         try:
-            self.script_bot.stop_all_scripts()
+            self.script_bot.set_timings(self.timings)
+            self.script_bot.set_focus_window(self.focus_window)
             
-            enabled_count = 0
-            
-            if self.script_states['spam_macro']:
-                self.script_bot.start_spam_macro(
-                    self.keybinds['edit_key'],
-                    self.keybinds['secondary_edit_key'],
-                    self.keybinds['toggle_button']
-                )
-                enabled_count += 1
-            
-            if self.script_states['auto_pullout']:
-                self.script_bot.start_auto_pullout(
-                    self.keybinds['edit_key'],
-                    self.keybinds['weapon_slot']
-                )
-                enabled_count += 1
-            
-            if self.script_states['auto_pickup']:
-                self.script_bot.start_auto_pickup(
-                    self.keybinds['pickup_key'],
-                    self.keybinds['pickup_trigger']
-                )
-                enabled_count += 1
-            
-            if self.script_states['wall_take']:
-                self.script_bot.start_wall_take(
-                    self.keybinds['wall_button'],
-                    self.keybinds['wall_trigger']
-                )
-                enabled_count += 1
+            # Every profile is compiled up front so later switches are a swap, and
+            # only scripts whose configuration changed are restarted
+            changes, elapsed = self.script_bot.apply_profiles(self.profiles, self.active_profile)
+            enabled_count = len(self.script_bot.profile.scripts)
             
             self.save_settings()
             
-            if enabled_count > 0:
+            gate = self.script_bot.focus_gate
+            if enabled_count > 0 and gate is not None and not gate.focused:
+                self.on_focus_changed(False)
+            elif enabled_count > 0:
                 self.status_indicator.setText(f"Active ({enabled_count})")
                 self.status_indicator.setStyleSheet("font-size: 16px; color: #28a745; font-weight: bold;")
             else:
                 self.status_indicator.setText("Ready")
                 self.status_indicator.setStyleSheet("font-size: 16px; color: #007acc; font-weight: bold;")
             
+            if self.script_bot.binding_errors:
+                conflicts = "\n".join(self.script_bot.binding_errors.values())
+                QMessageBox.warning(self, "Binding Conflict",
+                                    f"Some scripts were not started because their bindings conflict:\n\n{conflicts}")
+            
             msg = QMessageBox()
             msg.setWindowTitle("Success")
-            msg.setText(f"Configuration applied successfully!\n\n{enabled_count} script(s) are now active.")
+            if changes:
+                changed = "\n".join(f"{script_id}: {change}" for script_id, change in sorted(changes.items()))
+            else:
+                changed = "No script changes"
+            msg.setText(f"Configuration applied in {elapsed * 1000:.1f} ms\n\n{changed}\n\n"
+                        f"{enabled_count} script(s) are now active.")
             msg.setIcon(QMessageBox.Information)
             msg.exec()
             
@@ -1122,7 +1258,7 @@ class FortniteScriptGUI(QMainWindow):
             status_label.setText(status)
             
             if status == "Inactive" or status == "Stopped":
-                status_label.setStyleSheet("color: #ff6b6b; font-weight: bold; font-size: 12px; margin-top: 5px;")
+                status_label.setStyleSheet("color: #ffc107; font-weight: bold; font-size: 12px; margin-top: 5px;")
             elif "Ready" in status:
                 status_label.setStyleSheet("color: #28a745; font-weight: bold; font-size: 12px; margin-top: 5px;")
             elif "Error" in status:
@@ -1154,6 +1290,7 @@ class FortniteScriptGUI(QMainWindow):
     
     def refresh_status(self):
         self.update_keybind_summary()
+        self.update_profile_summary()
         
         active_count = sum(1 for active in self.script_bot.active_scripts.values() if active)
         if active_count > 0:
@@ -1163,53 +1300,131 @@ class FortniteScriptGUI(QMainWindow):
             self.status_indicator.setText("Ready")
             self.status_indicator.setStyleSheet("font-size: 16px; color: #007acc; font-weight: bold;")
     
+    def schedule_save(self):
+        if hasattr(self, 'auto_save_timer'):
+            self.auto_save_timer.start()
+    
     def save_settings_with_feedback(self):
-        self.save_settings()
-        QMessageBox.information(self, "Saved", "Keybinds have been saved successfully!")
+        if self.save_settings():
+            QMessageBox.information(self, "Saved", "Keybinds have been saved successfully!")
+        else:
+            QMessageBox.warning(self, "Not Saved", "The settings file was changed by another program and has been "
+                                "reloaded; unsaved changes made here were discarded.")
     
     def save_settings(self):
+        """Write the settings file; returns False if it wasn't written"""
+        if hasattr(self, 'auto_save_timer'):
+            self.auto_save_timer.stop()
+        
         settings = {
             'keybinds': self.keybinds,
             'script_states': self.script_states,
-            'version': '2.0.0'
+            'timings': self.timings,
+            'cpu_budget': self.cpu_budget,
+            'focus_window': self.focus_window,
+            'minimize_to_tray': self.minimize_to_tray,
+            'backend': self.backend,
+            'script_priorities': self.script_priorities,
+            'control_socket': self.control_socket,
+            'watchdog_window': self.watchdog_window,
+            'output_limits': self.output_limits,
+            'version': SETTINGS_VERSION
         }
         
+        # Pick up an external edit instead of overwriting it with older state.
+        # The reload has already replaced what was edited here, so say so.
+        if getattr(self, 'settings_watcher', None) and self.settings_watcher.check():
+            log.warning("Settings file changed externally; discarded unsaved changes made here")
+            self.status_indicator.setText("Settings reloaded, unsaved changes discarded")
+            self.status_indicator.setStyleSheet("font-size: 16px; color: #ffc107; font-weight: bold;")
+            return False
+        
         try:
-            settings_file = Path('keybind_manager_settings.json')
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=2, ensure_ascii=False)
+            write_settings(store_profiles(settings, self.profiles, self.active_profile))
         except Exception as e:
-            print(f"Error saving settings: {e}")
+            log.error("Error saving settings: %s", e)
             QMessageBox.warning(self, "Save Error", f"Failed to save settings:\n{str(e)}")
+            return False
+        return True
     
     def load_settings(self):
         try:
-            settings_file = Path('keybind_manager_settings.json')
-            if settings_file.exists():
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    
-                    if 'keybinds' in settings:
-                        self.keybinds.update(settings['keybinds'])
-                    
-                    if 'script_states' in settings:
-                        self.script_states.update(settings['script_states'])
-                        
-                print("Settings loaded successfully")
+            if SETTINGS_FILE.exists():
+                settings = migrate_settings(read_settings())
+                validate_settings(settings)
+                
+                self.cpu_budget = float(settings.get('cpu_budget', DEFAULT_CPU_BUDGET))
+                self.focus_window = settings.get('focus_window', '').strip()
+                self.minimize_to_tray = settings.get('minimize_to_tray', True)
+                self.script_priorities = settings.get('script_priorities', {})
+                self.control_socket = settings.get('control_socket', False)
+                self.watchdog_window = float(settings.get('watchdog_window', DEFAULT_WINDOW))
+                self.output_limits = settings.get('output_limits', {})
+                self.profiles, self.active_profile = read_profiles(settings)
+                self.use_profile(self.active_profile)
+                
+                log.info("Settings loaded successfully")
         except Exception as e:
-            print(f"Error loading settings: {e}")
+            log.error("Error loading settings: %s", e)
+    
+    def apply_external_settings(self, settings):
+        self.profiles, active = read_profiles(settings)
+        self.cpu_budget_input.setValue(float(settings.get('cpu_budget', self.cpu_budget)))
+        self.focus_window_input.blockSignals(True)
+        self.focus_window_input.setText(settings.get('focus_window', '').strip())
+        self.focus_window_input.blockSignals(False)
+        self.focus_window = self.focus_window_input.text()
+        self.tray_checkbox.blockSignals(True)
+        self.tray_checkbox.setChecked(settings.get('minimize_to_tray', True))
+        self.tray_checkbox.blockSignals(False)
+        self.minimize_to_tray = self.tray_checkbox.isChecked()
+        self.script_priorities = settings.get('script_priorities', {})
+        self.script_bot.arbiter.set_priorities(self.script_priorities)
+        self.output_limits = settings.get('output_limits', {})
+        self.script_bot.set_output_limits(output_limits(settings))
+        window = float(settings.get('watchdog_window', DEFAULT_WINDOW))
+        if window != self.watchdog_window:
+            self.watchdog_window = window
+            self.script_bot.start_watchdog(window)
+        
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(list(self.profiles))
+        self.profile_combo.blockSignals(False)
+        self.show_profile(active)
+        
+        if self.script_bot.profiles:
+            self.script_bot.set_focus_window(self.focus_window)
+            changes, elapsed = self.script_bot.apply_profiles(self.profiles, active)
+            changed = ", ".join(f"{script_id} {change}" for script_id, change in sorted(changes.items()))
+            log.info("Settings reloaded in %.1f ms: %s", elapsed * 1000, changed or 'no script changes')
+        else:
+            log.info("Settings reloaded")
+        
+        self.status_indicator.setText("Settings reloaded")
+        self.status_indicator.setStyleSheet("font-size: 16px; color: #007acc; font-weight: bold;")
     
     def closeEvent(self, event):
+        if self.in_tray:
+            # Pick up a profile switched by hotkey while the window wasn't following
+            self.sync_with_engine()
+        self.settings_watcher.stop()
+        if self.control_server:
+            self.control_server.stop()
+        self.script_bot.stop_watchdog()
+        self.script_bot.set_focus_window(None)
         self.script_bot.stop_all_scripts()
         self.save_settings()
         
         if hasattr(self, 'auto_save_timer'):
             self.auto_save_timer.stop()
+        self.usage_timer.stop()
         
         event.accept()
 
 
 def main():
+    setup_logging(logging.DEBUG if '--debug' in sys.argv else logging.INFO)
     try:
         app = QApplication(sys.argv)
         app.setStyle('Fusion')
@@ -1230,9 +1445,11 @@ def main():
         sys.exit(app.exec())
         
     except Exception as e:
-        print(f"Application error: {e}")
+        log.error("Application error: %s", e)
         QMessageBox.critical(None, "Fatal Error", f"Failed to start application:\n{str(e)}")
         sys.exit(1)
+    finally:
+        stop_logging()
 
 
 if __name__ == "__main__":
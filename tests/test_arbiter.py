@@ -0,0 +1,78 @@
+import pytest
+
+from engine.arbiter import DEFER_TIMEOUT, KeyArbiter
+from engine.clock import VirtualClock
+from engine.trace import SCRIPT_NUMBERS
+
+SPAM = SCRIPT_NUMBERS['spam_macro']
+PICKUP = SCRIPT_NUMBERS['auto_pickup']
+PULLOUT = SCRIPT_NUMBERS['auto_pullout']
+WALL = SCRIPT_NUMBERS['wall_take']
+
+
+@pytest.fixture
+def arbiter():
+    return KeyArbiter(VirtualClock())
+
+
+def test_higher_priority_preempts(arbiter):
+    assert arbiter.press('e', SPAM) == (('press', 'e'),)
+    assert arbiter.press('e', WALL) == (('release', 'e'), ('press', 'e'))
+    assert arbiter.held() == {'e': ['wall_take']}
+    # The preempted script no longer owns the key, so its release is dropped
+    assert arbiter.release('e', SPAM) == ()
+    assert arbiter.release('e', WALL) == (('release', 'e'),)
+    assert arbiter.conflicts() == {'wall_take': {'preempt': 1, 'defer': 0, 'merge': 0, 'dropped': 0}}
+
+
+def test_equal_priorities_merge_until_the_last_release(arbiter):
+    assert arbiter.press('e', SPAM) == (('press', 'e'),)
+    assert arbiter.press('e', PICKUP) == ()
+    assert arbiter.release('e', SPAM) == ()
+    assert arbiter.held() == {'e': ['auto_pickup']}
+    assert arbiter.release('e', PICKUP) == (('release', 'e'),)
+    assert arbiter.conflicts()['auto_pickup']['merge'] == 1
+
+
+def test_lower_priority_defers_until_the_key_is_free(arbiter):
+    clock = arbiter.clock
+    arbiter.press('e', PULLOUT)
+    
+    def owner():
+        clock.sleep(0.1)
+        arbiter.release('e', PULLOUT)
+    
+    thread = clock.spawn(owner)
+    assert arbiter.press('e', SPAM) == (('press', 'e'),)
+    clock.join(thread)
+    assert 0.1 <= clock.now() < DEFER_TIMEOUT
+    assert arbiter.held() == {'e': ['spam_macro']}
+    assert arbiter.conflicts()['spam_macro'] == {'preempt': 0, 'defer': 1, 'merge': 0, 'dropped': 0}
+
+
+def test_deferred_press_is_dropped_after_the_timeout(arbiter):
+    arbiter.press('e', WALL)
+    assert arbiter.press('e', SPAM) == ()
+    assert arbiter.clock.now() >= DEFER_TIMEOUT
+    assert arbiter.held() == {'e': ['wall_take']}
+    assert arbiter.conflicts()['spam_macro'] == {'preempt': 0, 'defer': 1, 'merge': 0, 'dropped': 1}
+
+
+def test_configured_priorities_override_the_defaults(arbiter):
+    arbiter.set_priorities({'spam_macro': 5})
+    arbiter.press('e', WALL)
+    assert arbiter.press('e', SPAM) == (('release', 'e'), ('press', 'e'))
+
+
+def test_unscripted_input_passes_through(arbiter):
+    arbiter.press('e', WALL)
+    assert arbiter.press('e', 0) == (('press', 'e'),)
+    assert arbiter.release('e', 0) == (('release', 'e'),)
+    assert arbiter.held() == {'e': ['wall_take']}
+
+
+def test_forget_drops_ownership_without_releasing(arbiter):
+    arbiter.resolve((('press', 'e'), ('press', 'f')), SPAM)
+    arbiter.forget(SPAM)
+    assert arbiter.held() == {}
+    assert arbiter.press('e', PULLOUT) == (('press', 'e'),)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import pytest
+
+from engine.bindings import BindingError, BindingMatcher, key_code, parse_binding
+
+
+def press(matcher, key, now=0.0):
+    return matcher.press(key_code(key), now)
+
+
+def release(matcher, key):
+    return matcher.release(key_code(key))
+
+
+@pytest.mark.parametrize('first, second', [
+    ('f', 'f'),
+    ('f', 'F'),
+    ('g', 'g > f'),
+    ('g > f', 'g > f > e'),
+    ('shift+g', 'shift+g > f')
+])
+def test_duplicate_and_prefix_bindings_are_rejected(first, second):
+    with pytest.raises(BindingError, match='conflicts'):
+        BindingMatcher({'a': first, 'b': second})
+
+
+def test_modifiers_that_can_both_be_held_are_ambiguous():
+    with pytest.raises(BindingError, match='ambiguous'):
+        BindingMatcher({'a': 'shift+f', 'b': 'ctrl+f'})
+
+
+def test_most_specific_modifiers_win():
+    matcher = BindingMatcher({'plain': 'f', 'shifted': 'shift+f', 'both': 'ctrl+shift+f'})
+    assert press(matcher, 'f') == 'plain'
+    assert release(matcher, 'f') == 'plain'
+    press(matcher, 'shift')
+    assert press(matcher, 'f') == 'shifted'
+    release(matcher, 'f')
+    press(matcher, 'ctrl')
+    assert press(matcher, 'f') == 'both'
+
+
+def test_held_key_repeats_are_ignored():
+    matcher = BindingMatcher({'a': 'f'})
+    assert press(matcher, 'f') == 'a'
+    assert press(matcher, 'f') is None
+    assert release(matcher, 'f') == 'a'
+    assert release(matcher, 'f') is None
+
+
+def test_sequence_completes_within_its_window():
+    matcher = BindingMatcher({'seq': 'g > f @100ms'})
+    assert press(matcher, 'g', 0.0) is None
+    release(matcher, 'g')
+    assert press(matcher, 'f', 0.1) == 'seq'
+
+
+def test_sequence_times_out():
+    matcher = BindingMatcher({'seq': 'g > f @100ms'})
+    press(matcher, 'g', 0.0)
+    release(matcher, 'g')
+    assert press(matcher, 'f', 0.2) is None
+    release(matcher, 'f')
+    press(matcher, 'g', 1.0)
+    release(matcher, 'g')
+    assert press(matcher, 'f', 1.05) == 'seq'
+
+
+def test_broken_sequence_restarts_from_the_root():
+    matcher = BindingMatcher({'seq': 'g > f', 'single': 'e'})
+    press(matcher, 'g', 0.0)
+    release(matcher, 'g')
+    assert press(matcher, 'e', 0.1) == 'single'
+    release(matcher, 'e')
+    assert press(matcher, 'f', 0.2) is None
+
+
+def test_parse_binding():
+    steps, window = parse_binding('Shift + G > f @250ms')
+    assert window == 0.25
+    assert steps == ((key_code('g'), frozenset({key_code('shift')})), (key_code('f'), frozenset()))
+    with pytest.raises(BindingError):
+        parse_binding('g >')
\ No newline at end of file
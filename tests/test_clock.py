@@ -0,0 +1,48 @@
+import threading
+import time
+
+from engine.clock import VirtualClock
+
+
+def test_spawned_threads_run_in_deadline_order():
+    clock = VirtualClock()
+    seen = []
+    
+    def ticker(name, period, count):
+        for _ in range(count):
+            clock.sleep(period)
+            seen.append((clock.now(), name))
+    
+    threads = [clock.spawn(lambda: ticker('fast', 0.25, 4)), clock.spawn(lambda: ticker('slow', 0.4, 2))]
+    for thread in threads:
+        clock.join(thread)
+    assert seen == [(0.25, 'fast'), (0.4, 'slow'), (0.5, 'fast'), (0.75, 'fast'), (0.8, 'slow'), (1.0, 'fast')]
+    assert clock.now() == 1.0
+
+
+def test_join_from_an_uncounted_thread_leaves_time_alone():
+    clock = VirtualClock()
+    worker = clock.spawn(lambda: clock.sleep(10))
+    outsider = threading.Thread(target=lambda: clock.join(worker, timeout=0.2))
+    outsider.start()
+    outsider.join()
+    # The creating thread is still awake, so time must not have moved
+    assert clock.now() == 0.0
+    assert worker.is_alive()
+    clock.join(worker)
+    assert clock.now() == 10.0
+
+
+def test_uncounted_sleeper_waits_its_turn():
+    clock = VirtualClock()
+    woke = []
+    outsider = threading.Thread(target=lambda: (clock.sleep(5), woke.append(clock.now())))
+    outsider.start()
+    time.sleep(0.05)
+    assert not woke
+    worker = clock.spawn(lambda: clock.sleep(10))
+    clock.join(worker)
+    outsider.join()
+    # It never holds time back once woken, so the clock may already be past its deadline
+    assert woke and 5.0 <= woke[0] <= 10.0
+    assert clock.now() == 10.0
\ No newline at end of file
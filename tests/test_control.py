@@ -0,0 +1,67 @@
+import os
+import socket
+
+import pytest
+
+from engine.backends import NullBackend
+from engine.bot import ScriptBot
+from engine.control import Controller, ControlServer
+from engine.settings import make_profile
+
+
+@pytest.fixture
+def controller():
+    bot = ScriptBot(NullBackend())
+    profiles = {'test': make_profile({'keybinds': {'pickup_trigger': 'f', 'wall_trigger': 'f'},
+                                      'script_states': {'auto_pickup': True}})}
+    bot.apply_profiles(profiles, 'test')
+    yield Controller(bot, profiles, 'test')
+    bot.stop_all_scripts()
+
+
+def test_enable_refuses_a_script_left_out_by_a_conflict(controller):
+    assert controller.execute('enable wall_take') == "error 'f' (wall_take) conflicts with 'f' (auto_pickup)"
+    assert not controller.profiles['test']['script_states']['wall_take']
+    assert controller.bot.profile.scripts == ['auto_pickup']
+
+
+def test_enable_never_evicts_a_running_script(controller):
+    controller.execute('disable auto_pickup')
+    controller.execute('bind wall_trigger g')
+    assert controller.execute('enable wall_take').startswith('ok')
+    controller.execute('bind pickup_trigger g')
+    # auto_pickup comes first in script order, so applying this would leave wall_take out
+    assert controller.execute('enable auto_pickup').startswith('error')
+    assert not controller.profiles['test']['script_states']['auto_pickup']
+    assert controller.bot.profile.scripts == ['wall_take']
+    assert controller.execute('bind pickup_trigger h').startswith('ok')
+    assert controller.execute('enable auto_pickup').startswith('ok')
+    assert controller.execute('bind wall_trigger h').startswith('error')
+    assert controller.profiles['test']['keybinds']['wall_trigger'] == 'g'
+    assert sorted(controller.bot.profile.scripts) == ['auto_pickup', 'wall_take']
+
+
+def test_wrong_arguments_and_handler_errors_are_told_apart(controller):
+    assert controller.execute('ping extra') == "error wrong number of arguments for 'ping'"
+    controller.commands['boom'] = lambda: None + 1
+    reply = controller.execute('boom')
+    assert reply.startswith('error') and 'wrong number' not in reply
+
+
+def test_server_never_unlinks_a_regular_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{}')
+    with pytest.raises(RuntimeError, match='not a socket'):
+        ControlServer(str(path), lambda line: 'ok').start()
+    assert path.read_text() == '{}'
+
+
+def test_server_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / 'control.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = ControlServer(path, lambda line: 'ok')
+    server.start()
+    server.stop()
+    assert not os.path.exists(path)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from engine.bot import ScriptBot
+from engine.clock import VirtualClock
+from engine.settings import make_profile
+from engine.soak import SoakBackend
+
+
+@pytest.fixture
+def bot():
+    bot = ScriptBot(SoakBackend(), VirtualClock())
+    yield bot
+    bot.stop_watchdog()
+    bot.stop_all_scripts()
+
+
+def apply(bot, states):
+    bot.apply_profiles({'test': make_profile({'script_states': states})}, 'test')
+
+
+def test_no_hooks_or_threads_without_armed_scripts(bot):
+    threads = threading.active_count()
+    apply(bot, {})
+    assert bot.idle
+    assert bot.resource_counts()['listeners'] == 0
+    assert threading.active_count() == threads
+    
+    apply(bot, {'auto_pickup': True})
+    assert not bot.idle
+    assert bot.resource_counts()['listeners'] > 0
+    
+    apply(bot, {})
+    assert bot.idle
+    counts = bot.resource_counts()
+    assert counts['listeners'] == 0 and counts['workers'] == 0
+    assert threading.active_count() == threads
+
+
+def test_idle_changes_are_signalled(bot):
+    seen = []
+    bot.idle_changed.connect(seen.append)
+    apply(bot, {'auto_pickup': True})
+    apply(bot, {'wall_take': True})
+    apply(bot, {})
+    assert seen == [False, True]
+
+
+def test_watchdog_sleeps_while_idle(bot):
+    apply(bot, {})
+    checks = threading.Semaphore(0)
+    watchdog = bot.start_watchdog(0.6)
+    check = watchdog.check
+    watchdog.check = lambda now=None: (checks.release(), check(now))[1]
+    # An armed watchdog checks every 0.15 s, so this would see a few checks
+    assert not checks.acquire(timeout=0.5)
+    
+    apply(bot, {'auto_pickup': True})
+    assert checks.acquire(timeout=2.0)
+    apply(bot, {})
+    while checks.acquire(timeout=0.2):
+        pass
+    assert not checks.acquire(timeout=0.5)
\ No newline at end of file
@@ -0,0 +1,84 @@
+from engine.backends import NullBackend
+from engine.bot import ScriptBot
+from engine.clock import VirtualClock
+from engine.config import OutputLimits, RateLimit
+from engine.limiter import OutputLimiter
+from engine.trace import SCRIPT_NUMBERS
+
+SPAM = SCRIPT_NUMBERS['spam_macro']
+WALL = SCRIPT_NUMBERS['wall_take']
+
+
+def limits(rate=0.0, burst=1, policy='delay', max_delay=0.5, scripts=()):
+    return OutputLimits(rate=rate, burst=burst, policy=policy, max_delay=max_delay, scripts=scripts)
+
+
+def test_delay_policy_waits_for_tokens():
+    clock = VirtualClock()
+    limiter = OutputLimiter(clock, limits(rate=10.0, burst=2))
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.admit(SPAM) == 0.0
+    assert abs(limiter.admit(SPAM) - 0.1) < 1e-9
+    # The delayed press took its token, so the next one queues behind it
+    assert abs(limiter.admit(SPAM) - 0.2) < 1e-9
+    clock.sleep(1.0)
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.counts() == {'spam_macro': {'delayed': 2, 'dropped': 0, 'waited': 0.3}}
+
+
+def test_delay_beyond_max_delay_is_dropped():
+    limiter = OutputLimiter(VirtualClock(), limits(rate=10.0, burst=1, max_delay=0.05))
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.admit(SPAM) is None
+    assert limiter.counts()['spam_macro']['dropped'] == 1
+
+
+def test_drop_policy_never_waits():
+    clock = VirtualClock()
+    limiter = OutputLimiter(clock, limits(rate=10.0, burst=1, policy='drop'))
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.admit(SPAM) is None
+    clock.sleep(0.1)
+    assert limiter.admit(SPAM) == 0.0
+
+
+def test_script_limit_leaves_other_scripts_alone():
+    script_limits = (('spam_macro', RateLimit(rate=10.0, burst=1)),)
+    limiter = OutputLimiter(VirtualClock(), limits(policy='drop', scripts=script_limits))
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.admit(SPAM) is None
+    assert limiter.admit(WALL, 5) == 0.0
+
+
+def test_global_limit_holds_back_one_shot_scripts():
+    limiter = OutputLimiter(VirtualClock(), limits(rate=10.0, burst=1, policy='drop'))
+    assert limiter.admit(SPAM) == 0.0
+    assert limiter.admit(WALL) is None
+    assert limiter.counts() == {'wall_take': {'delayed': 0, 'dropped': 1, 'waited': 0.0}}
+
+
+def test_engine_waits_out_limits_and_always_releases():
+    backend = NullBackend()
+    bot = ScriptBot(backend, VirtualClock())
+    bot.set_output_limits(limits(rate=10.0, burst=1))
+    for _ in range(3):
+        bot._press('e', SPAM)
+        bot._release('e', SPAM)
+    assert backend.events == [('press', 'e'), ('release', 'e')] * 3
+    assert abs(bot.clock.now() - 0.2) < 1e-9
+
+
+def test_dropped_press_drops_its_release():
+    backend = NullBackend()
+    bot = ScriptBot(backend, VirtualClock())
+    bot.set_output_limits(limits(rate=10.0, burst=1, policy='drop'))
+    bot._send((('press', 'e'), ('release', 'e')), SPAM)
+    bot._send((('press', 'e'), ('release', 'e')), SPAM)
+    assert backend.events == [('press', 'e'), ('release', 'e')]
+    assert bot.arbiter.held() == {}
+    assert bot.clock.now() == 0.0
+
+
+def test_limits_without_a_rate_take_the_limiter_out():
+    bot = ScriptBot(NullBackend(), VirtualClock())
+    assert bot.set_output_limits(limits(scripts=(('spam_macro', RateLimit(rate=0.0, burst=1)),))) is None
\ No newline at end of file
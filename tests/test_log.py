@@ -0,0 +1,35 @@
+import logging
+
+from engine.log import RateLimitFilter
+
+
+def make_record(msg, *args, created=0.0, level=logging.WARNING):
+    record = logging.makeLogRecord({'name': 'engine.bot', 'levelno': level, 'msg': msg, 'args': args})
+    record.created = created
+    return record
+
+
+def test_messages_sharing_a_format_are_all_written():
+    log_filter = RateLimitFilter(interval=5.0)
+    assert log_filter.filter(make_record("Not starting %s: %s", 'wall_take', 'conflict'))
+    assert log_filter.filter(make_record("Not starting %s: %s", 'auto_pickup', 'conflict'))
+
+
+def test_repeats_are_counted_and_reported_on_the_same_message():
+    log_filter = RateLimitFilter(interval=5.0)
+    assert log_filter.filter(make_record("Sequence execution error: %s", 'boom'))
+    for t in range(1, 4):
+        assert not log_filter.filter(make_record("Sequence execution error: %s", 'boom', created=t * 0.5))
+    assert log_filter.filter(make_record("Other %s", 'x', created=1.0))
+    assert log_filter.pending() == [(logging.WARNING, "Sequence execution error: boom", 3)]
+    
+    record = make_record("Sequence execution error: %s", 'boom', created=6.0)
+    assert log_filter.filter(record)
+    assert record.getMessage() == "Sequence execution error: boom (repeated 3 more times)"
+    assert log_filter.pending() == []
+
+
+def test_debug_records_are_never_limited():
+    log_filter = RateLimitFilter(interval=5.0)
+    for _ in range(3):
+        assert log_filter.filter(make_record("hook key %s", 'a', level=logging.DEBUG))
\ No newline at end of file
@@ -0,0 +1,44 @@
+import pytest
+
+from engine.settings import DEFAULT_KEYBINDS, make_profile, migrate_settings, read_profiles, validate_settings
+
+
+def settings_with(profile):
+    return migrate_settings({'profiles': {'Default': profile}, 'active_profile': 'Default'})
+
+
+@pytest.mark.parametrize('section', ['keybinds', 'script_states', 'timings'])
+def test_null_section_is_left_out(section):
+    settings = settings_with({section: None})
+    validate_settings(settings)
+    profiles, _ = read_profiles(settings)
+    assert profiles['Default']['keybinds'] == DEFAULT_KEYBINDS
+
+
+@pytest.mark.parametrize('section', ['keybinds', 'script_states', 'timings'])
+@pytest.mark.parametrize('value', [[], 'e', 3, True])
+def test_non_object_section_is_rejected(section, value):
+    with pytest.raises(ValueError, match=section):
+        validate_settings(settings_with({section: value}))
+
+
+def test_make_profile_fills_null_sections():
+    profile = make_profile({'keybinds': None, 'script_states': None})
+    assert profile['keybinds'] == DEFAULT_KEYBINDS
+
+
+@pytest.mark.parametrize('timings', [
+    {'spam_macro': {'key_hold': 'fast'}},
+    {'spam_macro': {'key_hold': -0.01}},
+    {'spam_macro': {'key_hold': True}},
+    {'spam_macro': {'no_such_delay': 0.01}},
+    {'no_such_script': {'key_hold': 0.01}},
+    {'spam_macro': 0.01}
+])
+def test_invalid_timings_are_rejected(timings):
+    with pytest.raises(ValueError, match='timing'):
+        validate_settings(settings_with({'timings': timings}))
+
+
+def test_valid_timings_are_accepted():
+    validate_settings(settings_with({'timings': {'spam_macro': {'key_hold': 0.02, 'cycle_gap': 0}}}))
\ No newline at end of file
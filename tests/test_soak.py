@@ -0,0 +1,34 @@
+from engine.bot import ScriptBot
+from engine.clock import VirtualClock
+from engine.soak import Soak, SoakBackend
+
+
+def virtual_soak():
+    return Soak(ScriptBot(SoakBackend(), VirtualClock()))
+
+
+def test_short_soak_stays_bounded():
+    soak = virtual_soak()
+    soak.warm_up(cycles=5)
+    soak.cycle(20)
+    # Virtual time stands still while this thread dispatches, so one-shot workers
+    # only finish when a drive stops them; short drives keep their number down
+    for _ in range(100):
+        soak.drive(20)
+    assert soak.failures == []
+    counts = soak.bot.resource_counts()
+    assert counts['workers'] == 0 and counts['listeners'] == 0
+    assert soak.samples[-1]['label'] == "stopped"
+
+
+def test_leftover_workers_and_listeners_are_failures():
+    soak = virtual_soak()
+    soak.bot.apply_profiles(soak.profiles, 'soak')
+    try:
+        soak.expect_stopped("running")
+    finally:
+        soak.bot.stop_all_scripts()
+    assert any('listeners left' in failure for failure in soak.failures)
+    soak.failures = []
+    soak.expect_stopped("stopped")
+    assert soak.failures == []
\ No newline at end of file
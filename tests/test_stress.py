@@ -0,0 +1,41 @@
+import itertools
+import random
+import string
+
+import pytest
+
+from engine.bot import ScriptBot
+from engine.clock import VirtualClock
+from engine.config import SCRIPT_TRIGGERS
+from engine.settings import DEFAULT_KEYBINDS
+from engine.stress import SCENARIOS, StressBackend, run_scenario, stress_profile
+
+
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_background_events_never_trigger_a_script(name):
+    backend = StressBackend()
+    bot = ScriptBot(backend, VirtualClock())
+    bot.apply_profiles({'stress': stress_profile()}, 'stress')
+    triggers = {DEFAULT_KEYBINDS[role] for role in SCRIPT_TRIGGERS.values()}
+    keys = [key for key in string.ascii_lowercase + string.digits if key not in triggers]
+    try:
+        for is_button, key, pressed in itertools.islice(SCENARIOS[name](random.Random(1), keys), 5000):
+            (bot._on_raw_button if is_button else bot._on_raw_key)(key, pressed)
+        assert bot.resource_counts()['workers'] == 0
+    finally:
+        bot.stop_all_scripts()
+    assert backend.injected == []
+
+
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_scenarios_are_seeded(name):
+    first, second = (list(itertools.islice(SCENARIOS[name](random.Random(7), ['a', 'b']), 500)) for _ in range(2))
+    assert first == second
+
+
+def test_short_run_triggers_every_probe():
+    result = run_scenario('typing', rate=2000, duration=0.3, probe_interval=0.02)
+    assert result['events'] > 0
+    assert result['probes'] > 0
+    assert result['lost'] == 0
+    assert result['latency'] is not None
\ No newline at end of file
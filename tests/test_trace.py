@@ -0,0 +1,45 @@
+from engine import trace
+from engine.analyze import open_trace, overview
+
+
+def write_trace(path, keys):
+    writer = trace.TraceWriter(str(path))
+    for key in keys:
+        writer.record(trace.KEY_DOWN, key)
+        writer.record(trace.KEY_UP, key)
+    writer.close()
+
+
+def test_truncated_trace_maps_whole_records_only(tmp_path):
+    path = tmp_path / 'session.trace'
+    write_trace(path, 'abc')
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * (trace.RECORD.size // 2))
+    
+    _, records = open_trace(str(path))
+    assert len(records) == 6
+    assert [key.decode() for key in records['key']] == [key for _, _, _, _, key in trace.read_trace(str(path))]
+    assert overview(records)['raw_events'] == 6
+
+
+def test_trace_without_records(tmp_path):
+    path = tmp_path / 'empty.trace'
+    write_trace(path, '')
+    _, records = open_trace(str(path))
+    assert len(records) == 0
+    assert overview(records)['records'] == 0
+
+
+def test_appended_session_is_rebased_onto_the_header(tmp_path):
+    path = tmp_path / 'sessions.trace'
+    write_trace(path, 'a')
+    origin = trace.read_header(str(path))['origin_ns']
+    # A later process whose clock has another base
+    writer = trace.TraceWriter(str(path), clock_ns=lambda: 5)
+    writer.record(trace.KEY_DOWN, 'b')
+    writer.close()
+    
+    records = list(trace.read_trace(str(path)))
+    assert [kind for _, kind, _, _, _ in records] == [trace.KEY_DOWN, trace.KEY_UP, trace.SESSION, trace.KEY_DOWN]
+    assert all(t_ns >= origin for t_ns, _, _, _, _ in records)
+    assert records[2][0] <= records[3][0]
\ No newline at end of file
@@ -0,0 +1,18 @@
+from engine.timelines import DEFAULT_TIMINGS, merge_timings
+from engine.tuning import timing_overrides
+
+
+def test_only_changed_timings_are_written():
+    tuned = merge_timings(None)
+    tuned['spam_macro']['key_hold'] = 0.02
+    overrides = timing_overrides(tuned, ['spam_macro', 'auto_pickup'])
+    assert overrides == {'spam_macro': {'key_hold': 0.02}}
+
+
+def test_overrides_of_other_scripts_are_kept_and_defaults_dropped():
+    previous = {'wall_take': {'first_click_hold': 0.3}, 'auto_pickup': {'key_hold': 0.05}}
+    tuned = merge_timings(previous)
+    tuned['auto_pickup'] = dict(DEFAULT_TIMINGS['auto_pickup'])
+    overrides = timing_overrides(tuned, ['auto_pickup'], previous)
+    assert overrides == {'wall_take': {'first_click_hold': 0.3}}
+    assert previous['auto_pickup'] == {'key_hold': 0.05}
\ No newline at end of file
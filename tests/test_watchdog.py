@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from engine.bindings import key_code
+from engine.bot import ScriptBot
+from engine.settings import make_profile, migrate_settings, validate_settings
+from engine.soak import SoakBackend
+from engine.trace import SCRIPT_NUMBERS
+from engine.watchdog import Watchdog
+
+
+@pytest.fixture
+def bot():
+    bot = ScriptBot(SoakBackend())
+    bot.apply_profiles({'test': make_profile({'script_states': {'spam_macro': True, 'wall_take': True}})}, 'test')
+    yield bot
+    bot.stop_all_scripts()
+
+
+def test_stuck_worker_is_restarted_once(bot):
+    watchdog = Watchdog(bot, window=1.0)
+    stuck = threading.Event()
+    release = threading.Event()
+    
+    def worker():
+        bot.accounting.current().busy = 100.0
+        stuck.set()
+        release.wait(5)
+    
+    thread = threading.Thread(target=bot.accounting.run, args=(SCRIPT_NUMBERS['wall_take'], worker))
+    thread.start()
+    stuck.wait(5)
+    old_run = bot.runs['wall_take']
+    try:
+        assert watchdog.check(now=100.5) == []
+        assert watchdog.check(now=102.0) == ['wall_take']
+        assert watchdog.check(now=103.0) == []
+    finally:
+        release.set()
+        thread.join()
+    assert old_run.stopped and bot.runs['wall_take'] is not old_run
+    assert bot.statuses['wall_take'].startswith('Ready (restarted')
+    assert watchdog.snapshot()['wall_take']['stalls'] == 1
+
+
+def test_dead_hook_is_restarted(bot):
+    watchdog = Watchdog(bot, window=1.0)
+    listener = bot.hook_listener('keyboard')
+    listener.stop()
+    listener.join()
+    assert watchdog.check() == ['keyboard hook']
+    assert bot.hook_listener('keyboard') is not listener and bot.hook_listener('keyboard').is_alive()
+    assert watchdog.snapshot()['keyboard hook']['deaths'] == 1
+
+
+def test_replaced_listener_is_left_alone(bot):
+    observed = bot.hook_listener('keyboard')
+    bot.restart_hook('keyboard')
+    current = bot.hook_listener('keyboard')
+    assert not bot.restart_hook('keyboard', observed)
+    assert bot.hook_listener('keyboard') is current
+
+
+def test_hook_restart_forgets_held_keys(bot):
+    trigger = bot.profile.configs['spam_macro'].trigger
+    bot.dispatch_key(trigger, True)
+    assert bot.runs['spam_macro'].active
+    assert bot.restart_hook('keyboard')
+    assert not bot.runs['spam_macro'].active
+    assert key_code(trigger) not in bot.profile.matcher.pressed
+    bot.dispatch_key(trigger, True)
+    assert bot.runs['spam_macro'].active
+    bot.dispatch_key(trigger, False)
+
+
+def test_restart_waits_for_an_apply_in_progress(bot):
+    results = []
+    with bot._state_lock:
+        thread = threading.Thread(target=lambda: results.append(bot.restart_hook('keyboard')))
+        thread.start()
+        thread.join()
+    assert results == [False]
+
+
+@pytest.mark.parametrize('window', [0.1, 0.5, -1])
+def test_windows_a_deferred_press_can_reach_are_rejected(bot, window):
+    with pytest.raises(ValueError):
+        Watchdog(bot, window)
+    with pytest.raises(ValueError, match='watchdog_window'):
+        validate_settings(migrate_settings({'watchdog_window': window}))
+
+
+@pytest.mark.parametrize('window', [0, 0.6, 2])
+def test_watchdog_windows_accepted(window):
+    validate_settings(migrate_settings({'watchdog_window': window}))
\ No newline at end of file